@@ -0,0 +1,280 @@
+import multiprocessing
+import threading
+import numpy as np
+from shared_channel import SimulationChannel
+
+
+class LatestValueMailbox:
+    """Boîte aux lettres à une seule place : une nouvelle valeur écrase l'ancienne
+
+    Le consommateur reçoit toujours la valeur la plus récente. Chaque valeur
+    écrasée avant d'avoir été lue est comptée comme une trame perdue.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._value = None
+        self._has_value = False
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, value):
+        """Dépose une valeur, en écrasant celle qui n'a pas encore été lue"""
+        with self._condition:
+            if self._has_value:
+                self.dropped += 1
+            self._value = value
+            self._has_value = True
+            self._condition.notify()
+
+    def get(self):
+        """Attend et retourne la valeur la plus récente (None si la boîte est fermée)"""
+        with self._condition:
+            while not self._has_value and not self._closed:
+                self._condition.wait()
+            if not self._has_value:
+                return None
+            value = self._value
+            self._value = None
+            self._has_value = False
+            return value
+
+    def close(self):
+        """Réveille le consommateur et lui signale l'arrêt"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def _process_worker(conn, factory, kwargs, method):
+    """Boucle du processus contrôleur : reçoit une observation, renvoie la commande"""
+    controller = factory(**kwargs)
+    compute = getattr(controller, method)
+    while True:
+        obs = conn.recv()
+        if obs is None:
+            break
+        conn.send(compute(obs))
+    conn.close()
+
+
+# Période (s) à laquelle les boucles du mode 'shared' vérifient la demande d'arrêt
+STOP_POLL_INTERVAL = 0.05
+
+
+def scan_from_channel(observation):
+    """Entrée du contrôleur lue dans le canal partagé : le scan seul (custom_sim)"""
+    return observation['scan']
+
+
+def _shared_worker(spec, factory, kwargs, method, decode, stop):
+    """Boucle du processus contrôleur en mode 'shared' : lit la dernière observation
+    dans la mémoire partagée, y écrit la commande, jusqu'à ce que stop soit levé
+    (ou que le propriétaire du canal le ferme)"""
+    channel = SimulationChannel.attach(spec)
+    controller = factory(**kwargs)
+    compute = getattr(controller, method)
+    last = 0
+    try:
+        while not stop.is_set():
+            latest = channel.latest_observation(after=last, timeout=STOP_POLL_INTERVAL)
+            if latest is None:
+                if channel.observations.closed:
+                    break
+                continue
+            last, observation = latest
+            command = compute(decode(observation))
+            channel.publish_action(np.asarray(command, dtype=float).reshape(channel.action_shape),
+                                   last, observation['time'])
+    finally:
+        channel.release()
+
+
+class AsyncController:
+    """Exécute un contrôleur en parallèle de la simulation
+
+    Le simulateur dépose chaque nouvelle observation dans une boîte aux lettres
+    à une place et applique à chaque pas la dernière commande disponible. Un
+    contrôleur trop lent travaille donc sur des données périmées, comme sur la
+    voiture réelle, au lieu de ralentir la simulation.
+
+    Une latence de calcul simulée (en temps de simulation) peut être ajoutée :
+    une commande calculée à partir d'une observation prise à l'instant t n'est
+    appliquée qu'à partir de t + latency.
+    """
+
+    def __init__(self, factory, kwargs=None, method='plan', mode='thread',
+                 latency=0.0, default_command=None, profiler=None, channel=None, decode=None):
+        """
+        Args:
+            factory: classe (ou fonction) créant le contrôleur
+            kwargs: paramètres passés à factory
+            method: méthode de calcul de la commande ('plan' ou 'compute_command')
+            mode: 'thread', 'process' (processus séparé, cœur dédié) ou 'shared'
+                (processus séparé, observations et commandes échangées par un
+                SimulationChannel en mémoire partagée, sans sérialisation)
+            latency: latence de calcul simulée (s, temps de simulation)
+            default_command: commande appliquée avant la première réponse
+            profiler: LatencyProfiler optionnel (en mode 'process', la mesure
+                inclut l'aller-retour entre processus ; ignoré en mode 'shared')
+            channel: SimulationChannel du mode 'shared', dans lequel le simulateur
+                publie lui-même les observations
+            decode: fonction (champs d'une observation du canal) -> entrée du
+                contrôleur (mode 'shared' ; par défaut, le scan seul)
+        """
+        kwargs = kwargs or {}
+        self.mode = mode
+        self.latency = latency
+        self.mailbox = LatestValueMailbox()
+
+        # Commandes calculées en attente de leur instant de disponibilité
+        self._lock = threading.Lock()
+        self._pending = []
+        self._command = default_command
+        self._command_time = None
+        self._latest_obs_time = None
+
+        # Statistiques
+        self.submitted = 0
+        self.computed = 0
+        self.steps = 0
+        self.stale_steps = 0
+        self.max_age = 0.0
+
+        self._process = None
+        self.channel = channel
+        self._dropped = 0
+        if mode == 'shared':
+            self.controller = None
+            # Le canal appartient à l'appelant : l'arrêt passe par un drapeau, pas par close()
+            self._stop = multiprocessing.Event()
+            self._process = multiprocessing.Process(
+                target=_shared_worker,
+                args=(channel.spec, factory, kwargs, method, decode or scan_from_channel, self._stop),
+                daemon=True
+            )
+            self._process.start()
+            self._thread = threading.Thread(target=self._run_shared, daemon=True)
+            self._thread.start()
+            return
+        if mode == 'thread':
+            self.controller = factory(**kwargs)
+            compute = getattr(self.controller, method)
+        elif mode == 'process':
+            self.controller = None
+            self._conn, child_conn = multiprocessing.Pipe()
+            self._process = multiprocessing.Process(
+                target=_process_worker,
+                args=(child_conn, factory, kwargs, method),
+                daemon=True
+            )
+            self._process.start()
+            compute = self._remote_compute
+        else:
+            raise ValueError(f"Mode d'exécution inconnu: {mode}")
+
+        self._compute = profiler.wrap(compute) if profiler is not None else compute
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _remote_compute(self, obs):
+        """Délègue le calcul au processus contrôleur"""
+        self._conn.send(obs)
+        return self._conn.recv()
+
+    def _run(self):
+        """Boucle du contrôleur : traite toujours l'observation la plus récente"""
+        while True:
+            item = self.mailbox.get()
+            if item is None:
+                break
+            obs, obs_time = item
+            command = self._compute(obs)
+            with self._lock:
+                self._pending.append((obs_time + self.latency, obs_time, command))
+                self.computed += 1
+
+    def _run_shared(self):
+        """Relève les commandes publiées par le processus contrôleur dans le canal partagé"""
+        last_action = 0
+        last_observation = 0
+        while not self._stop.is_set():
+            latest = self.channel.latest_action(after=last_action, timeout=STOP_POLL_INTERVAL)
+            if latest is None:
+                if self.channel.actions.closed:
+                    break
+                continue
+            last_action, action = latest
+            observation = int(action['observation'])
+            # Observations publiées que le contrôleur n'a jamais traitées
+            self._dropped += max(observation - last_observation - 1, 0)
+            last_observation = observation
+            obs_time = float(action['time'])
+            with self._lock:
+                self._pending.append((obs_time + self.latency, obs_time, action['action']))
+                self.computed += 1
+
+    def submit(self, obs, sim_time):
+        """Publie une nouvelle observation prise à l'instant sim_time
+        
+        En mode 'shared', l'observation a déjà été publiée dans le canal par le
+        simulateur : seul son instant est noté.
+        """
+        self.submitted += 1
+        if self.mode == 'shared':
+            observation_time = self.channel.observation_time()
+            self._latest_obs_time = observation_time if observation_time is not None else sim_time
+            return
+        self._latest_obs_time = sim_time
+        self.mailbox.put((obs, sim_time))
+
+    def get_command(self, sim_time):
+        """Retourne la dernière commande disponible à l'instant sim_time"""
+        with self._lock:
+            ready = [p for p in self._pending if p[0] <= sim_time]
+            if ready:
+                _, self._command_time, self._command = max(ready, key=lambda p: p[1])
+                self._pending = [p for p in self._pending if p[0] > sim_time]
+
+        self.steps += 1
+        if self._command_time is None or self._command_time < self._latest_obs_time:
+            self.stale_steps += 1
+        if self._command_time is not None:
+            self.max_age = max(self.max_age, sim_time - self._command_time)
+        return self._command
+
+    def stats(self):
+        """Retourne les compteurs de fraîcheur des commandes"""
+        return {
+            'submitted': self.submitted,
+            'computed': self.computed,
+            'dropped_frames': self.mailbox.dropped + self._dropped,
+            'steps': self.steps,
+            'stale_steps': self.stale_steps,
+            'stale_ratio': self.stale_steps / self.steps if self.steps else 0.0,
+            'max_age': self.max_age
+        }
+
+    def close(self):
+        """Arrête le fil (et le processus) du contrôleur
+        
+        En mode 'shared', le canal reste ouvert : sa fermeture et sa libération
+        reviennent à l'appelant qui l'a créé.
+        """
+        if self.mode == 'shared':
+            self._stop.set()
+            self._thread.join(timeout=1.0)
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            return
+        self.mailbox.close()
+        self._thread.join(timeout=1.0)
+        if self._process is not None:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
@@ -0,0 +1,200 @@
+import time
+import numpy as np
+
+
+class GaussianProcess:
+    """Processus gaussien (noyau Matérn 5/2 isotrope) sur des paramètres normalisés
+
+    La longueur de corrélation est choisie parmi `length_scales` en maximisant la
+    vraisemblance marginale. Les scores sont centrés-réduits avant l'ajustement.
+    """
+
+    def __init__(self, length_scales=(0.1, 0.2, 0.4, 0.8), noise=1e-2):
+        """
+        Args:
+            length_scales: longueurs de corrélation candidates (espace normalisé)
+            noise: variance du bruit d'observation (scores réduits)
+        """
+        self.length_scales = length_scales
+        self.noise = noise
+        self.length_scale = length_scales[0]
+        self.X = None
+        self.y = None
+        self.L = None
+        self.alpha = None
+        self.y_mean = 0.0
+        self.y_std = 1.0
+
+    def kernel(self, A, B):
+        """Noyau Matérn 5/2"""
+        d = np.sqrt(np.maximum(((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=2), 0.0))
+        r = np.sqrt(5.0) * d / self.length_scale
+        return (1.0 + r + r ** 2 / 3.0) * np.exp(-r)
+
+    def _factorize(self, X, y):
+        K = self.kernel(X, X)
+        K[np.diag_indices_from(K)] += self.noise
+        L = np.linalg.cholesky(K)
+        from scipy.linalg import cho_solve  # scipy chargé au premier ajustement seulement
+        alpha = cho_solve((L, True), y)
+        return L, alpha
+
+    def fit(self, X, y):
+        """Ajuste le modèle sur les points X [n, d] et les scores y [n]"""
+        self.X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean = y.mean()
+        self.y_std = y.std() if y.std() > 0 else 1.0
+        self.y = (y - self.y_mean) / self.y_std
+
+        # Choix de la longueur de corrélation par vraisemblance marginale
+        best = None
+        for length_scale in self.length_scales:
+            self.length_scale = length_scale
+            L, alpha = self._factorize(self.X, self.y)
+            log_likelihood = -0.5 * self.y @ alpha - np.log(np.diag(L)).sum()
+            if best is None or log_likelihood > best[0]:
+                best = (log_likelihood, length_scale, L, alpha)
+        _, self.length_scale, self.L, self.alpha = best
+
+    def condition(self, x, y):
+        """Ajoute une observation sans réajuster la longueur de corrélation
+
+        La factorisation de Cholesky est étendue d'une ligne (O(n^2)).
+        """
+        from scipy.linalg import cho_solve, solve_triangular
+        x = np.atleast_2d(x)
+        k = self.kernel(self.X, x)[:, 0]
+        l = solve_triangular(self.L, k, lower=True)
+        diagonal = np.sqrt(max(1.0 + self.noise - l @ l, 1e-12))
+        n = len(self.X)
+        L = np.zeros((n + 1, n + 1))
+        L[:n, :n] = self.L
+        L[n, :n] = l
+        L[n, n] = diagonal
+        self.L = L
+        self.X = np.vstack((self.X, x))
+        self.y = np.append(self.y, (y - self.y_mean) / self.y_std)
+        self.alpha = cho_solve((self.L, True), self.y)
+
+    def predict(self, X):
+        """Moyenne et écart-type prédits (dans l'unité des scores)"""
+        from scipy.linalg import solve_triangular
+        K_s = self.kernel(np.atleast_2d(X), self.X)
+        mean = K_s @ self.alpha
+        v = solve_triangular(self.L, K_s.T, lower=True)
+        variance = np.maximum(1.0 - (v ** 2).sum(axis=0), 1e-12)
+        return mean * self.y_std + self.y_mean, np.sqrt(variance) * self.y_std
+
+
+class BatchBayesianOptimizer:
+    """Propositions par lots avec un processus gaussien et une acquisition UCB
+
+    Un lot de q points est construit par « kriging believer » : après chaque
+    point choisi, le modèle est conditionné sur sa propre prédiction, ce qui
+    réduit l'incertitude autour et pousse le point suivant ailleurs. Les essais
+    encore en cours sont traités de la même façon avant de choisir le lot.
+    """
+
+    def __init__(self, lower, upper, beta=2.0, num_candidates=2000, max_points=1000,
+                 min_points=10, seed=None):
+        """
+        Args:
+            lower: bornes minimales des paramètres
+            upper: bornes maximales des paramètres
+            beta: poids de l'incertitude dans l'acquisition (mu + beta * sigma)
+            num_candidates: nombre de candidats évalués par l'acquisition
+            max_points: nombre maximal de tests utilisés pour l'ajustement
+            min_points: nombre de tests nécessaires avant d'utiliser le modèle
+            seed: graine du générateur aléatoire
+        """
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.span = self.upper - self.lower
+        self.active = self.span > 0  # Les paramètres fixes ne sont pas modélisés
+        self.beta = beta
+        self.num_candidates = num_candidates
+        self.max_points = max_points
+        self.min_points = min_points
+        self.rng = np.random.default_rng(seed)
+        self.gp = GaussianProcess()
+
+        # Statistiques d'ajustement du modèle
+        self.last_fit_time = 0.0
+        self.total_fit_time = 0.0
+        self.fit_count = 0
+
+    def to_unit(self, X):
+        """Paramètres -> espace normalisé des paramètres actifs"""
+        return ((np.atleast_2d(X) - self.lower)[:, self.active]) / self.span[self.active]
+
+    def from_unit(self, U):
+        """Espace normalisé des paramètres actifs -> paramètres"""
+        X = np.tile(self.lower, (len(U), 1))
+        X[:, self.active] += U * self.span[self.active]
+        return X
+
+    def _training_set(self, X, y):
+        """Limite la taille du jeu d'ajustement : meilleurs scores et tests récents"""
+        if len(X) <= self.max_points:
+            return X, y
+        best = np.argsort(y)[-self.max_points // 4:]
+        recent = np.arange(len(X) - (self.max_points - len(best)), len(X))
+        keep = np.union1d(best, recent)
+        return X[keep], y[keep]
+
+    def fit(self, X, y):
+        """Ajuste le processus gaussien et mesure le temps d'ajustement"""
+        start = time.perf_counter()
+        X, y = self._training_set(np.asarray(X, dtype=float), np.asarray(y, dtype=float))
+        self.gp.fit(self.to_unit(X), y)
+        self.last_fit_time = time.perf_counter() - start
+        self.total_fit_time += self.last_fit_time
+        self.fit_count += 1
+
+    def candidates(self, best_x=None):
+        """Candidats : moitié uniforme, moitié autour du meilleur point"""
+        dims = int(self.active.sum())
+        uniform = self.rng.random((self.num_candidates // 2, dims))
+        if best_x is None:
+            return uniform
+        center = self.to_unit(best_x)[0]
+        local = center + self.rng.normal(0.0, 0.1, (self.num_candidates - len(uniform), dims))
+        return np.vstack((uniform, np.clip(local, 0.0, 1.0)))
+
+    def propose(self, X, y, q, pending=None, best_x=None, filter_candidates=None):
+        """Propose un lot de q points
+
+        Args:
+            X, y: tests effectués [n, d] et leurs scores [n]
+            q: taille du lot
+            pending: points en cours d'évaluation [m, d]
+            best_x: meilleur point connu (pour les candidats locaux)
+            filter_candidates: fonction (tableau [k, d]) -> masque des candidats admissibles
+
+        Returns:
+            tableau [q, d] (moins de q points si les candidats sont épuisés)
+        """
+        self.fit(X, y)
+
+        # Les essais en cours sont « crus » à leur prédiction
+        if pending is not None and len(pending):
+            U_pending = self.to_unit(pending)
+            for u in U_pending:
+                mean, _ = self.gp.predict(u[None, :])
+                self.gp.condition(u, mean[0])
+
+        U = self.candidates(best_x)
+        if filter_candidates is not None:
+            U = U[filter_candidates(self.from_unit(U))]
+
+        batch = []
+        for _ in range(min(q, len(U))):
+            mean, std = self.gp.predict(U)
+            best = np.argmax(mean + self.beta * std)
+            batch.append(U[best])
+            self.gp.condition(U[best], mean[best])
+            U = np.delete(U, best, axis=0)
+        if not batch:
+            return np.empty((0, len(self.lower)))
+        return self.from_unit(np.array(batch))
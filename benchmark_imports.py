@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CUSTOM_SIM_DIR = os.path.join(ROOT_DIR, 'custom_sim')
+
+# Modules lourds qu'un point d'entrée ne doit pas charger à l'import
+HEAVY_MODULES = ('pygame', 'matplotlib', 'scipy', 'gym', 'f110_gym')
+
+# Points d'entrée mesurés : module, dossier d'exécution, budget d'import (ms),
+# modules lourds interdits
+IMPORT_BUDGETS = {
+    'headless': ('headless', ROOT_DIR, 400, HEAVY_MODULES),
+    'main': ('main', ROOT_DIR, 400, HEAVY_MODULES),
+    'optimize_navigation': ('optimize_navigation', CUSTOM_SIM_DIR, 500, HEAVY_MODULES),
+    'simulation_server': ('simulation_server', CUSTOM_SIM_DIR, 500, HEAVY_MODULES),
+}
+
+# Exécuté dans un interpréteur neuf : durée de l'import, mémoire maximale, modules lourds chargés
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'import_ms': elapsed * 1000,
+    'maxrss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'loaded': sorted(name for name in {heavy!r} if name in sys.modules)
+}}))
+"""
+
+
+def measure(module, cwd, heavy=HEAVY_MODULES):
+    """Importe module dans un nouveau processus
+
+    Returns:
+        dict avec 'import_ms', 'maxrss_mb', 'loaded' et 'startup_ms' (lancement
+        de l'interpréteur compris)
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=tuple(heavy))],
+                            cwd=cwd, capture_output=True, text=True, check=True).stdout
+    startup = time.perf_counter() - start
+    result = json.loads(output.strip().splitlines()[-1])
+    result['startup_ms'] = startup * 1000
+    return result
+
+
+def benchmark(targets=None, repeat=5, budget_scale=1.0):
+    """Mesure chaque point d'entrée repeat fois (valeurs médianes)
+
+    Returns:
+        dict nom -> résultats, avec 'budget_ms' et 'ok'
+    """
+    results = {}
+    for name in targets or IMPORT_BUDGETS:
+        module, cwd, budget, forbidden = IMPORT_BUDGETS[name]
+        runs = [measure(module, cwd, forbidden) for _ in range(repeat)]
+        loaded = sorted(set().union(*(run['loaded'] for run in runs)))
+        import_ms = float(np.median([run['import_ms'] for run in runs]))
+        results[name] = {
+            'import_ms': import_ms,
+            'startup_ms': float(np.median([run['startup_ms'] for run in runs])),
+            'maxrss_mb': float(np.median([run['maxrss_mb'] for run in runs])),
+            'loaded': loaded,
+            'budget_ms': budget * budget_scale,
+            'ok': import_ms <= budget * budget_scale and not loaded
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de test du temps de démarrage des points d'entrée")
+    parser.add_argument('targets', nargs='*',
+                        help=f"points d'entrée à mesurer parmi {', '.join(IMPORT_BUDGETS)} (tous par défaut)")
+    parser.add_argument('--repeat', type=int, default=5, help="nombre d'imports par point d'entrée")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="facteur appliqué aux budgets (machine lente, CI)")
+    args = parser.parse_args()
+    unknown = [name for name in args.targets if name not in IMPORT_BUDGETS]
+    if unknown:
+        parser.error(f"Point d'entrée inconnu: {', '.join(unknown)}")
+
+    results = benchmark(args.targets, repeat=args.repeat, budget_scale=args.budget_scale)
+
+    print(f"{'Point d’entrée':<22} {'import (ms)':>12} {'total (ms)':>11} {'budget (ms)':>12} "
+          f"{'mémoire (Mo)':>13}  modules lourds")
+    for name, result in results.items():
+        print(f"{name:<22} {result['import_ms']:>12.1f} {result['startup_ms']:>11.1f} "
+              f"{result['budget_ms']:>12.0f} {result['maxrss_mb']:>13.1f}  "
+              f"{', '.join(result['loaded']) or '-'}{'' if result['ok'] else '  DÉPASSEMENT'}")
+
+    failed = [name for name, result in results.items() if not result['ok']]
+    if failed:
+        print(f"\nBudget de démarrage dépassé: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nTous les points d'entrée respectent leur budget de démarrage")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import contextlib
+import os
+import sys
+import numpy as np
+from latency_profiler import LatencyProfiler
+from scan_geometry import resample_scan, F110_NUM_BEAMS, F110_FOV
+
+# Les navigateurs de custom_sim utilisent des imports locaux (from car import Car)
+CUSTOM_SIM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'custom_sim')
+if CUSTOM_SIM_DIR not in sys.path:
+    sys.path.append(CUSTOM_SIM_DIR)
+
+
+def load_scan_stream(path):
+    """Charge un flux de scans enregistré par ScanRecorder
+
+    Returns:
+        ranges: tableau [nb_scans, nb_rayons]
+        angles: angle de chaque rayon (rad, 0 = devant)
+    """
+    data = np.load(path)
+    ranges = data['ranges']
+    angles = np.linspace(float(data['angle_min']), float(data['angle_max']), ranges.shape[1])
+    return ranges, angles
+
+
+def synthetic_scan_stream(num_scans=1000, num_beams=F110_NUM_BEAMS, fov=F110_FOV, seed=0):
+    """Génère un flux de scans d'un couloir de largeur variable (sans simulateur)"""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(-fov / 2, fov / 2, num_beams)
+    ranges = np.empty((num_scans, num_beams))
+    for i in range(num_scans):
+        left = 0.5 + 0.3 * np.sin(i / 50.0)
+        right = 1.0 - left + 0.5
+        heading = 0.3 * np.sin(i / 80.0)
+        a = angles + heading
+        with np.errstate(divide='ignore'):
+            to_left = np.where(np.sin(a) > 0, left / np.sin(a), np.inf)
+            to_right = np.where(np.sin(a) < 0, -right / np.sin(a), np.inf)
+        ranges[i] = np.minimum(np.minimum(to_left, to_right), 10.0)
+    ranges += rng.normal(0.0, 0.01, ranges.shape)
+    return np.clip(ranges, 0.0, 10.0), angles
+
+
+def custom_sim_inputs(ranges, angles, num_beams=360):
+    """Convertit un flux en scans de points (x, y) au format custom_sim (360°, 0 = devant)"""
+    target = np.arange(num_beams) * (2 * np.pi / num_beams)
+    cos_t, sin_t = np.cos(target), np.sin(target)
+    inputs = []
+    for scan in ranges:
+        r = resample_scan(scan, angles, target)
+        inputs.append(np.column_stack((r * cos_t, r * sin_t)))
+    return inputs
+
+
+def f110_inputs(ranges, angles, num_beams=F110_NUM_BEAMS, fov=F110_FOV):
+    """Convertit un flux en observations au format f110_gym"""
+    target = np.linspace(-fov / 2, fov / 2, num_beams)
+    return [{'scans': [resample_scan(scan, angles, target)]} for scan in ranges]
+
+
+def build_navigators():
+    """Retourne tous les navigateurs disponibles avec leur format d'entrée"""
+    from navigation import SimpleAutonomousController
+    from autonomous_navigator import AutonomousNavigator
+    from follow_gap_navigator import FollowGapNavigator
+    from equidistance_navigator import EquidistanceNavigator
+    from disparity_extender_navigator import DisparityExtenderNavigator
+
+    return {
+        'simple_autonomous': (SimpleAutonomousController(), 'plan', 'f110'),
+        'basic': (AutonomousNavigator(), 'compute_command', 'custom_sim'),
+        'follow_gap': (FollowGapNavigator(), 'compute_command', 'custom_sim'),
+        'equidistance': (EquidistanceNavigator(), 'compute_command', 'custom_sim'),
+        'disparity_extender': (DisparityExtenderNavigator(), 'compute_command', 'custom_sim'),
+    }
+
+
+def benchmark(ranges, angles, budget=0.01, repeat=1, navigators=None):
+    """Rejoue le même flux de scans dans chaque navigateur
+
+    Returns:
+        dict nom -> LatencyProfiler
+    """
+    if navigators is None:
+        navigators = build_navigators()
+    inputs = {
+        'f110': f110_inputs(ranges, angles),
+        'custom_sim': custom_sim_inputs(ranges, angles),
+    }
+
+    profilers = {}
+    for name, (navigator, method, input_format) in navigators.items():
+        profiler = LatencyProfiler(budget=budget, name=name)
+        profiler.attach(navigator, method)
+        step = getattr(navigator, method)
+        # Les navigateurs affichent beaucoup de texte : on le jette sans l'exclure de la mesure
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(repeat):
+                for scan_input in inputs[input_format]:
+                    step(scan_input)
+        profilers[name] = profiler
+    return profilers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de test de latence des navigateurs")
+    parser.add_argument('stream', nargs='?', help="flux de scans .npz (ScanRecorder)")
+    parser.add_argument('--budget', type=float, default=0.01, help="budget par appel (s)")
+    parser.add_argument('--repeat', type=int, default=1, help="nombre de passages du flux")
+    parser.add_argument('--synthetic', type=int, default=1000,
+                        help="nombre de scans synthétiques si aucun flux n'est fourni")
+    parser.add_argument('--histograms', help="dossier où écrire les histogrammes")
+    args = parser.parse_args()
+
+    if args.stream:
+        ranges, angles = load_scan_stream(args.stream)
+        print(f"Flux chargé : {args.stream} ({ranges.shape[0]} scans, {ranges.shape[1]} rayons)")
+    else:
+        ranges, angles = synthetic_scan_stream(args.synthetic)
+        print(f"Flux synthétique : {ranges.shape[0]} scans, {ranges.shape[1]} rayons")
+
+    profilers = benchmark(ranges, angles, budget=args.budget, repeat=args.repeat)
+
+    print(f"\n{'Navigateur':<20} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10} {'ratés':>8}")
+    for name, profiler in profilers.items():
+        stats = profiler.summary()
+        print(f"{name:<20} {stats['p50'] * 1000:>10.3f} {stats['p99'] * 1000:>10.3f} "
+              f"{stats['max'] * 1000:>10.3f} {stats['miss_rate'] * 100:>7.1f}%")
+
+    if args.histograms:
+        os.makedirs(args.histograms, exist_ok=True)
+        for name, profiler in profilers.items():
+            profiler.dump_histogram(os.path.join(args.histograms, f"latency_{name}.csv"))
+        print(f"\nHistogrammes écrits dans {args.histograms}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import time
+import numpy as np
+
+
+class CMAES:
+    """Stratégie d'évolution CMA-ES dans les bornes des paramètres
+
+    L'optimisation se fait dans l'espace normalisé [0, 1] des paramètres actifs
+    (les paramètres de plage nulle restent fixes). Chaque génération de λ
+    candidats est proposée en une fois (ask) puis évaluée en bloc (tell) ; la
+    moyenne, la covariance et le pas sont mis à jour à partir du classement des
+    scores. Les candidats hors bornes sont ramenés dans les bornes et la mise à
+    jour utilise le point corrigé.
+    """
+
+    def __init__(self, lower, upper, population_size=None, sigma=0.3, seed=None):
+        """
+        Args:
+            lower: bornes minimales des paramètres
+            upper: bornes maximales des paramètres
+            population_size: λ, nombre de candidats par génération (défaut 4 + 3 ln n)
+            sigma: pas initial (espace normalisé)
+            seed: graine du générateur aléatoire
+        """
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.span = self.upper - self.lower
+        self.active = self.span > 0
+        self.rng = np.random.default_rng(seed)
+
+        n = int(self.active.sum())
+        self.n = n
+        self.population_size = population_size or 4 + int(3 * np.log(n))
+        self.mu = self.population_size // 2
+
+        # Poids de recombinaison et constantes d'adaptation (réglages standards)
+        weights = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1.0 / (self.weights ** 2).sum()
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, np.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        # État de la distribution
+        self.mean = np.full(n, 0.5)
+        self.sigma = sigma
+        self.C = np.eye(n)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self._update_eigen()
+
+        # Statistiques
+        self.generation = 0
+        self.evaluations = 0
+        self.start_time = time.time()
+
+    def _update_eigen(self):
+        self.C = (self.C + self.C.T) / 2
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+        self.inv_sqrt_C = self.B @ np.diag(1 / self.D) @ self.B.T
+
+    def to_unit(self, X):
+        """Paramètres -> espace normalisé des paramètres actifs"""
+        return ((np.atleast_2d(X) - self.lower)[:, self.active]) / self.span[self.active]
+
+    def from_unit(self, U):
+        """Espace normalisé des paramètres actifs -> paramètres"""
+        X = np.tile(self.lower, (len(U), 1))
+        X[:, self.active] += U * self.span[self.active]
+        return X
+
+    def warm_start(self, X, scores):
+        """Initialise la distribution à partir des tests déjà effectués
+
+        La moyenne et la covariance sont celles des μ meilleurs tests (pondérées
+        comme une recombinaison), ce qui permet de reprendre une optimisation à
+        partir du fichier de résultats.
+        """
+        if len(X) < 2:
+            return
+        U = self.to_unit(X)
+        order = np.argsort(scores)[::-1][:self.mu]
+        weights = self.weights[:len(order)] / self.weights[:len(order)].sum()
+        self.mean = weights @ U[order]
+        centered = U[order] - self.mean
+        covariance = (weights[:, None] * centered).T @ centered + 1e-4 * np.eye(self.n)
+        self.sigma = float(np.clip(np.sqrt(np.trace(covariance) / self.n), 0.05, 0.3))
+        self.C = covariance / self.sigma ** 2
+        self._update_eigen()
+
+    def ask(self):
+        """Tire les λ candidats d'une génération
+
+        Returns:
+            tableau [λ, d] de paramètres (dans les bornes)
+        """
+        z = self.rng.standard_normal((self.population_size, self.n))
+        U = self.mean + self.sigma * (z * self.D) @ self.B.T
+        return self.from_unit(np.clip(U, 0.0, 1.0))
+
+    def tell(self, X, scores):
+        """Met à jour la distribution avec une génération évaluée (scores à maximiser)"""
+        U = self.to_unit(X)
+        order = np.argsort(scores)[::-1][:self.mu]
+        old_mean = self.mean
+        self.mean = self.weights @ U[order]
+
+        # Chemins d'évolution
+        step = (self.mean - old_mean) / self.sigma
+        self.ps = (1 - self.cs) * self.ps + \
+            np.sqrt(self.cs * (2 - self.cs) * self.mueff) * self.inv_sqrt_C @ step
+        self.generation += 1
+        hsig = np.linalg.norm(self.ps) / np.sqrt(1 - (1 - self.cs) ** (2 * self.generation)) \
+            < (1.4 + 2 / (self.n + 1)) * self.chi_n
+        self.pc = (1 - self.cc) * self.pc + hsig * np.sqrt(self.cc * (2 - self.cc) * self.mueff) * step
+
+        # Adaptation de la covariance (rang 1 + rang μ)
+        y = (U[order] - old_mean) / self.sigma
+        self.C = (1 - self.c1 - self.cmu) * self.C \
+            + self.c1 * (np.outer(self.pc, self.pc) + (not hsig) * self.cc * (2 - self.cc) * self.C) \
+            + self.cmu * (self.weights[:, None] * y).T @ y
+
+        # Adaptation du pas
+        self.sigma *= np.exp((self.cs / self.damps) * (np.linalg.norm(self.ps) / self.chi_n - 1))
+        self.sigma = min(self.sigma, 1.0)
+        self._update_eigen()
+
+        self.evaluations += len(X)
+
+    def rates(self):
+        """Débit de l'optimisation
+
+        Returns:
+            dict avec generations_per_hour et evaluations_per_hour
+        """
+        hours = max(time.time() - self.start_time, 1e-9) / 3600
+        return {
+            'generations_per_hour': self.generation / hours,
+            'evaluations_per_hour': self.evaluations / hours
+        }
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Modules partagés avec la simulation f110 (dossier parent). Importé par les scripts de
+# custom_sim uniquement ; le dossier est ajouté en fin de chemin pour que les modules de
+# custom_sim (dont main.py) restent prioritaires.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
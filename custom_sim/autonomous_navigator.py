@@ -1,9 +1,9 @@
 import numpy as np
 import cv2
 import yaml
-import matplotlib.pyplot as plt
 from car import Car
 from lidar import Lidar
+from scan_sectors import CircularSector
 
 
 class AutonomousNavigator:
@@ -28,6 +28,8 @@ class AutonomousNavigator:
         self.left_sector_end = int(left_sector_end)
         self.right_sector_start = int(right_sector_start)
         self.right_sector_end = int(right_sector_end)
+        self.left_sector = CircularSector(self.left_sector_start, self.left_sector_end)
+        self.right_sector = CircularSector(self.right_sector_start, self.right_sector_end)
         
         # Paramètres de vitesse
         self.normal_linear_speed = normal_linear_speed
@@ -50,11 +52,8 @@ class AutonomousNavigator:
         ranges = np.sqrt(scan[:, 0]**2 + scan[:, 1]**2)
         
         # Vérifier les obstacles à droite et à gauche
-        front_left = ranges[self.left_sector_start:self.left_sector_end]
-        front_right = ranges[self.right_sector_start:self.right_sector_end]
-        
-        min_right = min(front_right) if len(front_right) > 0 else float('inf')
-        min_left = min(front_left) if len(front_left) > 0 else float('inf')
+        min_right = self.right_sector.min(ranges, default=float('inf'))
+        min_left = self.left_sector.min(ranges, default=float('inf'))
         
         self.obstacle_right_detected = min_right < self.stop_distance
         self.obstacle_left_detected = min_left < self.stop_distance
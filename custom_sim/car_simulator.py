@@ -1,20 +1,29 @@
 import numpy as np
 import cv2
 import yaml
-import matplotlib.pyplot as plt
 from car import Car
 from lidar import Lidar
 
 class CarSimulator:
-    def __init__(self, map_path="TRR.bmp", yaml_path="map.yaml", headless=False):
+    def __init__(self, map_path="TRR.bmp", yaml_path="map.yaml", headless=False,
+                 num_beams=360, lidar_backend='vectorized', ray_step=1, channel=None,
+                 start_pose=None):
         """Simulateur de voiture avec lidar
         
         Args:
             map_path: chemin vers l'image de la carte
             yaml_path: chemin vers le fichier de configuration
             headless: si True, désactive l'interface graphique
+            num_beams: nombre de rayons du lidar
+            lidar_backend: 'vectorized' ou 'loop' (voir Lidar)
+            ray_step: pas d'avancement des rayons du lidar en pixels
+            channel: SimulationChannel optionnel dans lequel chaque scan est publié
+                (avec la pose et le temps simulé) pour un contrôleur dans un autre processus
+            start_pose: position initiale (x, y, theta) dans le repère de la carte
+                (origine du fichier yaml, comme f110_gym), ou None pour la position par défaut
         """
         self.headless = headless
+        self.channel = channel
         
         # Charger la carte
         self.map_img = cv2.imread(map_path, cv2.IMREAD_GRAYSCALE)
@@ -25,24 +34,33 @@ class CarSimulator:
         with open(yaml_path, 'r') as f:
             self.map_config = yaml.safe_load(f)
             
-        # Position initiale de la voiture
+        # Position initiale de la voiture (repère de l'image : coin inférieur gauche)
         self.start_x = 4.0
         self.start_y = 1.5
         self.start_theta = 0.0
+        if start_pose is not None:
+            origin = self.map_config.get('origin', (0.0, 0.0, 0.0))
+            self.start_x = float(start_pose[0]) - origin[0]
+            self.start_y = float(start_pose[1]) - origin[1]
+            self.start_theta = float(start_pose[2])
             
         # Initialiser la voiture et le lidar
         self.car = Car(self.start_x, self.start_y, self.start_theta)
-        self.lidar = Lidar(self.map_img, self.map_config)
+        self.lidar = Lidar(self.map_img, self.map_config, num_beams=num_beams,
+                           backend=lidar_backend, ray_step=ray_step)
         self.lidar.update(self.car.x, self.car.y, self.car.theta)
         
         # État de la simulation
+        self.sim_time = 0.0
         self.collision_detected = False
         self.collision_distance = 0.1  # Réduit à 10cm
         self.car_length = 0.5  # mètres
         self.car_width = 0.3   # mètres
         
         # Créer la fenêtre et configurer l'affichage seulement si pas en mode headless
+        # (matplotlib n'est chargé que dans ce cas)
         if not self.headless:
+            import matplotlib.pyplot as plt
             plt.ion()
             self.fig = plt.figure(figsize=(12, 5))
             self.fig.canvas.manager.set_window_title('Simulateur de voiture avec Lidar')
@@ -62,6 +80,7 @@ class CarSimulator:
         """Réinitialise la simulation à son état initial"""
         self.car = Car(self.start_x, self.start_y, self.start_theta)
         self.lidar.update(self.car.x, self.car.y, self.car.theta)
+        self.sim_time = 0.0
         self.collision_detected = False
         
     def check_collision(self, scan):
@@ -91,17 +110,57 @@ class CarSimulator:
         self.collision_detected = False
         return False
         
-    def step(self, cmd_vel_linear, cmd_vel_angular, dt):
-        """Fait avancer la simulation d'un pas de temps
+    def check_collisions(self, scans):
+        """Version vectorisée de check_collision pour plusieurs scans [n, rayons, 2]
+        (sans message ni mise à jour de collision_detected)
+        
+        Returns:
+            tableau [n] de booléens
+        """
+        valid = ~(np.isclose(scans[..., 0], 0.0) & np.isclose(scans[..., 1], 0.0))
+        inside = (np.abs(scans[..., 0]) <= self.car_length / 2) & \
+                 (np.abs(scans[..., 1]) <= self.car_width / 2)
+        return np.any(valid & inside, axis=-1)
+        
+    def step_batch(self, x, y, theta, cmd_vel_linear, cmd_vel_angular, dt, substeps=1):
+        """Fait avancer plusieurs voitures indépendantes sur la même carte en une seule
+        opération vectorisée (cinématique de Car, scan lidar et collisions)
+        
+        Args:
+            x, y, theta: tableaux [n] des poses courantes
+            cmd_vel_linear, cmd_vel_angular, dt: commandes et pas de temps (tableaux [n])
+            substeps: nombre de pas de cinématique avant le scan (tableau [n])
+            
+        Returns:
+            x, y, theta: nouvelles poses
+            scans: tableau [n, rayons, 2]
+            collisions: tableau [n] de booléens
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        theta = np.array(theta, dtype=float)
+        linear = np.asarray(cmd_vel_linear, dtype=float)
+        angular = np.asarray(cmd_vel_angular, dtype=float)
+        dt = np.asarray(dt, dtype=float)
+        substeps = np.broadcast_to(np.asarray(substeps, dtype=int), x.shape)
+        
+        # Même intégration que Car.update (orientation puis position), pas par pas
+        for k in range(int(substeps.max(initial=0))):
+            moving = k < substeps
+            theta = np.where(moving, theta + angular * dt, theta)
+            x = np.where(moving, x + linear * np.cos(theta) * dt, x)
+            y = np.where(moving, y + linear * np.sin(theta) * dt, y)
+        
+        scans = self.lidar.get_scans(x, y, theta)
+        return x, y, theta, scans, self.check_collisions(scans)
+        
+    def advance(self, cmd_vel_linear, cmd_vel_angular, dt):
+        """Intègre uniquement la cinématique du véhicule (sans scan ni collision)
         
         Args:
             cmd_vel_linear: vitesse linéaire commandée (m/s)
             cmd_vel_angular: vitesse angulaire commandée (rad/s)
             dt: pas de temps (s)
-            
-        Returns:
-            scan: données du scan lidar
-            collision: True si collision détectée
         """
         # Stocker les vitesses courantes
         self.car.cmd_vel_linear = cmd_vel_linear
@@ -109,7 +168,15 @@ class CarSimulator:
         
         # Mettre à jour la position de la voiture
         self.car.update(cmd_vel_linear, cmd_vel_angular, dt)
+        self.sim_time += dt
         
+    def sense(self):
+        """Calcule le scan lidar à la position courante et vérifie les collisions
+        
+        Returns:
+            scan: données du scan lidar
+            collision: True si collision détectée
+        """
         # Mettre à jour la position du lidar
         self.lidar.update(self.car.x, self.car.y, self.car.theta)
         
@@ -119,6 +186,28 @@ class CarSimulator:
         # Vérifier les collisions
         collision = self.check_collision(scan)
         
+        # Publier le scan pour un contrôleur dans un autre processus (sans copie sérialisée)
+        if self.channel is not None:
+            self.channel.publish_observation(scan, (self.car.x, self.car.y, self.car.theta),
+                                             self.sim_time)
+        
+        return scan, collision
+        
+    def step(self, cmd_vel_linear, cmd_vel_angular, dt):
+        """Fait avancer la simulation d'un pas de temps
+        
+        Args:
+            cmd_vel_linear: vitesse linéaire commandée (m/s)
+            cmd_vel_angular: vitesse angulaire commandée (rad/s)
+            dt: pas de temps (s)
+            
+        Returns:
+            scan: données du scan lidar
+            collision: True si collision détectée
+        """
+        self.advance(cmd_vel_linear, cmd_vel_angular, dt)
+        scan, collision = self.sense()
+        
         # Afficher si nécessaire
         if not self.headless:
             self.render(scan)
@@ -129,6 +218,7 @@ class CarSimulator:
         """Affiche l'état de la simulation"""
         if self.headless:
             return
+        import matplotlib.pyplot as plt
             
         self.ax1.clear()
         
@@ -0,0 +1,144 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scan_sectors import CircularSector
+
+class DisparityExtenderNavigator:
+    def __init__(self,
+                 car_width=0.3,              # Largeur du véhicule (m)
+                 safety_margin=0.1,          # Marge ajoutée à la demi-largeur (m)
+                 disparity_threshold=0.3,    # Saut de distance considéré comme une disparité (m)
+                 max_detection_dist=3.0,     # Distance maximale de détection (m)
+                 min_obstacle_dist=0.1,      # Distance minimale d'un obstacle (portée min du lidar, m)
+                 stop_distance=0.5,          # Distance libre minimale pour avancer (m)
+                 field_of_view=180,          # Champ de recherche du cap, centré devant (degrés)
+                 max_linear_speed=2.0,       # Vitesse linéaire maximale (m/s)
+                 max_angular_speed=4.0,      # Vitesse angulaire maximale (rad/s)
+                 steering_gain=2.0):         # Gain entre l'angle du cap et la vitesse angulaire
+        """Navigateur « disparity extender » entièrement vectorisé
+
+        Les disparités (sauts de distance entre rayons voisins) sont élargies de
+        la demi-largeur du véhicule, en angle, du côté le plus lointain, puis le
+        cap le plus dégagé du champ de recherche est choisi. L'élargissement est
+        un minimum glissant sur une fenêtre de taille fixe (bornée par la
+        distance minimale d'obstacle), donc le coût par scan est fixe :
+        N x (2K + 1) éléments pour N rayons.
+        """
+        # Paramètres de configuration
+        self.car_width = car_width
+        self.safety_margin = safety_margin
+        self.disparity_threshold = disparity_threshold
+        self.max_detection_dist = max_detection_dist
+        self.min_obstacle_dist = min_obstacle_dist
+        self.stop_distance = stop_distance
+        self.field_of_view = field_of_view
+        self.max_linear_speed = max_linear_speed
+        self.max_angular_speed = max_angular_speed
+        self.steering_gain = steering_gain
+
+        self.half_width = car_width / 2 + safety_margin
+        self.search_sector = CircularSector(-field_of_view / 2, field_of_view / 2)
+
+        # Données précalculées pour chaque nombre de rayons
+        self._geometry = {}
+
+        # État interne
+        self.current_direction = 0.0
+
+    def _get_geometry(self, num_beams):
+        """Précalcule la fenêtre d'élargissement et les rayons candidats"""
+        geometry = self._geometry.get(num_beams)
+        if geometry is None:
+            angle_increment = 2 * np.pi / num_beams
+            # Fenêtre maximale : obstacle à la distance minimale
+            max_reach = int(np.ceil(np.arctan2(self.half_width, self.min_obstacle_dist) / angle_increment))
+            max_reach = min(max_reach, num_beams // 2)
+            # Décalage (rayon courant - rayon source) pour chaque position de la fenêtre
+            offsets = max_reach - np.arange(2 * max_reach + 1)
+            candidates = self.search_sector.indices(num_beams)
+            angles = candidates * angle_increment
+            angles = np.where(angles > np.pi, angles - 2 * np.pi, angles)
+            geometry = (angle_increment, max_reach, offsets, candidates, angles)
+            self._geometry[num_beams] = geometry
+        return geometry
+
+    def extend_disparities(self, ranges):
+        """Élargit les obstacles au niveau de chaque disparité
+
+        Args:
+            ranges: distances du scan (360° à partir de l'avant)
+
+        Returns:
+            distances élargies (même taille que ranges)
+        """
+        num_beams = len(ranges)
+        angle_increment, max_reach, offsets, _, _ = self._get_geometry(num_beams)
+
+        # Disparités entre chaque rayon et son voisin suivant (le scan reboucle)
+        next_ranges = np.roll(ranges, -1)
+        disparity = np.abs(next_ranges - ranges) > self.disparity_threshold
+
+        # Nombre de rayons couverts par la demi-largeur à la distance de l'obstacle proche
+        reach = np.ceil(np.arctan2(self.half_width, np.maximum(ranges, self.min_obstacle_dist))
+                        / angle_increment).astype(int)
+        reach = np.minimum(reach, max_reach)
+
+        # Un rayon proche élargit vers le rayon suivant (reach_pos) ou précédent (reach_neg)
+        reach_pos = np.where(disparity & (ranges < next_ranges), reach, 0)
+        previous_ranges = np.roll(ranges, 1)
+        previous_disparity = np.roll(disparity, 1)
+        reach_neg = np.where(previous_disparity & (ranges < previous_ranges), reach, 0)
+
+        # Minimum glissant sur une fenêtre fixe de 2K+1 rayons (avec rebouclage)
+        def windows(values):
+            padded = np.concatenate((values[-max_reach:], values, values[:max_reach])) \
+                if max_reach > 0 else values
+            return sliding_window_view(padded, 2 * max_reach + 1)
+
+        source_ranges = windows(ranges)
+        covered = ((offsets > 0) & (offsets <= windows(reach_pos))) | \
+                  ((offsets < 0) & (-offsets <= windows(reach_neg)))
+        extended = np.where(covered, source_ranges, np.inf).min(axis=1)
+
+        return np.minimum(ranges, extended)
+
+    def compute_command(self, scan):
+        """Calcule les commandes de vitesse vers le cap le plus dégagé"""
+        ranges = np.sqrt(scan[:, 0]**2 + scan[:, 1]**2)
+
+        # Pas de retour lidar (0) ou trop loin : distance maximale
+        ranges = np.where((ranges <= 0.0) | (ranges > self.max_detection_dist),
+                          self.max_detection_dist, ranges)
+
+        extended = self.extend_disparities(ranges)
+
+        # Cap le plus dégagé dans le champ de recherche (le plus proche de l'avant en cas d'égalité)
+        _, _, _, candidates, angles = self._get_geometry(len(ranges))
+        candidate_ranges = extended[candidates]
+        best = np.argmax(candidate_ranges - 1e-3 * np.abs(angles))
+        best_distance = candidate_ranges[best]
+        target_angle = angles[best]
+        self.current_direction = target_angle
+
+        if best_distance < self.stop_distance:
+            print("\n=== Navigation (Disparity Extender) ===")
+            print("Aucun passage trouvé - Manœuvre d'évitement")
+            print("=======================================")
+            return -0.2, self.max_angular_speed  # Reculer en tournant
+
+        # La vitesse angulaire est proportionnelle à l'angle vers le cap
+        angular_vel = np.clip(self.steering_gain * target_angle,
+                              -self.max_angular_speed, self.max_angular_speed)
+
+        # La vitesse linéaire dépend de l'espace libre et diminue dans les virages
+        linear_vel = self.max_linear_speed * min(1.0, best_distance / self.max_detection_dist)
+        linear_vel *= 1.0 - abs(target_angle) / np.pi
+        linear_vel = max(0.2, linear_vel)  # Garder une vitesse minimale
+
+        # Afficher les informations de navigation
+        print("\n=== Navigation (Disparity Extender) ===")
+        print(f"Distance libre au cap: {best_distance:.2f}m")
+        print(f"Angle vers le cap: {np.degrees(target_angle):.1f}°")
+        print(f"Commandes: v={linear_vel:.2f} m/s, w={angular_vel:.2f} rad/s")
+        print("=======================================")
+
+        return linear_vel, angular_vel
@@ -1,4 +1,5 @@
 import numpy as np
+from scan_sectors import CircularSector
 
 class EquidistanceNavigator:
     def __init__(self, 
@@ -18,12 +19,16 @@ class EquidistanceNavigator:
         self.max_linear_speed = max_linear_speed
         self.max_angular_speed = max_angular_speed
         
-        # Convertir les angles en indices pour le scan
-        self.left_sector_start = int(left_sector_start * 360 / 360)
-        self.left_sector_end = int(left_sector_end * 360 / 360)
-        self.right_sector_start = int(right_sector_start * 360 / 360)
-        self.right_sector_end = int(right_sector_end * 360 / 360)
-        self.front_sector_size = int(front_sector_size * 360 / 360)
+        # Secteurs en degrés (indices précalculés pour chaque nombre de rayons)
+        self.left_sector_start = left_sector_start
+        self.left_sector_end = left_sector_end
+        self.right_sector_start = right_sector_start
+        self.right_sector_end = right_sector_end
+        self.front_sector_size = front_sector_size
+        self.left_sector = CircularSector(left_sector_start, left_sector_end)
+        self.right_sector = CircularSector(right_sector_start, right_sector_end)
+        # Le secteur avant est centré sur 0° et passe par la fin du scan
+        self.front_sector = CircularSector(-front_sector_size / 2, front_sector_size / 2)
         
         # État interne
         self.last_error = 0.0
@@ -34,28 +39,18 @@ class EquidistanceNavigator:
         self.ki = 0.1  # Gain intégral
         self.kd = 0.2  # Gain dérivé
         
-    def get_sector_distance(self, scan, start_idx, end_idx):
+    def get_sector_distance(self, ranges, sector):
         """Calcule la distance moyenne dans un secteur donné"""
-        sector = scan[start_idx:end_idx]
-        if len(sector) == 0:
-            return self.max_detection_dist
-            
-        distances = np.sqrt(sector[:, 0]**2 + sector[:, 1]**2)
-        distances = distances[distances < self.max_detection_dist]
-        
-        if len(distances) == 0:
-            return self.max_detection_dist
-            
-        return np.mean(distances)
+        return sector.mean(ranges, default=self.max_detection_dist, below=self.max_detection_dist)
     
     def compute_command(self, scan):
         """Calcule les commandes de vitesse pour maintenir l'équidistance"""
+        ranges = np.sqrt(scan[:, 0]**2 + scan[:, 1]**2)
+        
         # Calculer les distances moyennes à gauche et à droite
-        left_dist = self.get_sector_distance(scan, self.left_sector_start, self.left_sector_end)
-        right_dist = self.get_sector_distance(scan, self.right_sector_start, self.right_sector_end)
-        front_dist = self.get_sector_distance(scan, 
-                                           360 - self.front_sector_size//2,
-                                           360 + self.front_sector_size//2)
+        left_dist = self.get_sector_distance(ranges, self.left_sector)
+        right_dist = self.get_sector_distance(ranges, self.right_sector)
+        front_dist = self.get_sector_distance(ranges, self.front_sector)
         
         # Calculer l'erreur (différence entre les distances)
         error = right_dist - left_dist
@@ -0,0 +1,44 @@
+import numpy as np
+from navigation import SimpleAutonomousController
+from scan_geometry import resample_scan, F110_NUM_BEAMS, F110_FOV
+
+class F110ControllerAdapter:
+    def __init__(self, wheelbase=0.3302, max_steer=0.4189, num_beams=F110_NUM_BEAMS, fov=F110_FOV,
+                 max_range=5.0, **params):
+        """Exécute le contrôleur f110 (SimpleAutonomousController) dans custom_sim
+
+        Le scan de custom_sim (points x, y sur 360°) est converti en distances,
+        rééchantillonné sur la géométrie du lidar f110, et la commande
+        [braquage, vitesse] est convertie en vitesses linéaire et angulaire
+        (modèle bicyclette), après la même limitation du braquage que f110_gym.
+
+        Args:
+            wheelbase: empattement du véhicule f110 (m)
+            max_steer: braquage maximal du véhicule f110 (rad, s_max de f110_gym)
+            num_beams, fov: géométrie du lidar f110
+            max_range: distance donnée aux rayons sans retour (m)
+            params: paramètres de SimpleAutonomousController
+        """
+        self.controller = SimpleAutonomousController(**params)
+        self.wheelbase = wheelbase
+        self.max_steer = max_steer
+        self.max_range = max_range
+        self.target_angles = np.linspace(-fov / 2, fov / 2, num_beams)
+        self._source_angles = {}
+
+    def compute_command(self, scan):
+        """Calcule les commandes de vitesse avec le contrôleur f110"""
+        num_beams = len(scan)
+        angles = self._source_angles.get(num_beams)
+        if angles is None:
+            angles = np.arange(num_beams) * (2 * np.pi / num_beams)
+            self._source_angles[num_beams] = angles
+
+        ranges = np.sqrt(scan[:, 0]**2 + scan[:, 1]**2)
+        ranges[ranges <= 0.0] = self.max_range  # Pas de retour lidar
+        obs = {'scans': [resample_scan(ranges, angles, self.target_angles)]}
+
+        steer, speed = self.controller.plan(obs)[0]
+        steer = np.clip(steer, -self.max_steer, self.max_steer)
+        angular_vel = speed * np.tan(steer) / self.wheelbase
+        return speed, angular_vel
@@ -2,7 +2,15 @@ import numpy as np
 import cv2
 
 class Lidar:
-    def __init__(self, map_img, map_info):
+    def __init__(self, map_img, map_info, num_beams=360, backend='vectorized', ray_step=1):
+        """Lidar 2D simulé par lancer de rayons sur l'image de la carte
+        
+        Args:
+            num_beams: nombre de rayons sur 360°
+            backend: 'vectorized' (tous les rayons en une opération NumPy) ou
+                'loop' (boucle Python de référence, mêmes résultats)
+            ray_step: pas d'avancement des rayons en pixels (> 1 = plus rapide, moins précis)
+        """
         self.map_img = map_img
         self.map_info = map_info
         self.resolution = map_info['resolution']
@@ -13,10 +21,17 @@ class Lidar:
         self.theta = 0.0
         
         # Paramètres du lidar
-        self.num_beams = 360  # nombre de rayons
+        self.num_beams = num_beams  # nombre de rayons
         self.max_range = 5.0  # portée maximale en mètres
         self.min_range = 0.1  # portée minimale en mètres
         self.angle_increment = 2 * np.pi / self.num_beams
+        self.backend = backend
+        self.ray_step = ray_step
+        
+        # Distances (en pixels) parcourues par chaque rayon
+        self.ray_steps = np.arange(int(self.min_range / self.resolution),
+                                   int(self.max_range / self.resolution), ray_step)
+        self.beam_offsets = np.arange(self.num_beams) * self.angle_increment
         
     def update(self, x, y, theta):
         """Met à jour la position du lidar"""
@@ -28,6 +43,9 @@ class Lidar:
         """
         Génère un scan lidar à partir de la position actuelle du véhicule
         """
+        if self.backend == 'vectorized':
+            return self.get_scan_vectorized()
+        
         scan = np.zeros((self.num_beams, 2))
         
         # Convertir la position du lidar de mètres en pixels
@@ -43,7 +61,7 @@ class Lidar:
             
             # Rayon de recherche
             for r in range(int(self.min_range / self.resolution), 
-                          int(self.max_range / self.resolution)):
+                          int(self.max_range / self.resolution), self.ray_step):
                 # Point sur le rayon en pixels
                 x_pixel = int(lidar_x_pixel + r * np.cos(angle))
                 y_pixel = int(lidar_y_pixel - r * np.sin(angle))  # Inverser le signe de sin pour Y
@@ -60,4 +78,52 @@ class Lidar:
                     scan[i, 1] = r * self.resolution * np.sin(angle)
                     break
         
-        return scan 
\ No newline at end of file
+        return scan 
+    
+    def get_scan_vectorized(self):
+        """Même scan que get_scan, calculé pour tous les rayons et toutes les distances à la fois"""
+        return self.get_scans([self.x], [self.y], [self.theta])[0]
+    
+    def get_scans(self, x, y, theta):
+        """Scans de plusieurs positions à la fois (mêmes résultats que get_scan pour chacune)
+        
+        Args:
+            x, y, theta: tableaux [n] des positions (mètres) et orientations (radians)
+            
+        Returns:
+            tableau [n, num_beams, 2]
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        theta = np.asarray(theta, dtype=float)
+        count = len(x)
+        scans = np.zeros((count, self.num_beams, 2))
+        height, width = self.map_img.shape[:2]
+        
+        # Position de chaque lidar en pixels (troncature comme int())
+        lidar_x_pixel = (x / self.resolution).astype(int)
+        lidar_y_pixel = height - (y / self.resolution).astype(int)
+        
+        angles = theta[:, None] + self.beam_offsets[None, :]
+        cos_a = np.cos(angles)
+        sin_a = np.sin(angles)
+        r = self.ray_steps
+        
+        # Pixels de chaque rayon [positions, rayons, distances]
+        x_pixels = (lidar_x_pixel[:, None, None] + r[None, None, :] * cos_a[:, :, None]).astype(int)
+        y_pixels = (lidar_y_pixel[:, None, None] - r[None, None, :] * sin_a[:, :, None]).astype(int)
+        
+        inside = (x_pixels >= 0) & (x_pixels < width) & (y_pixels >= 0) & (y_pixels < height)
+        hit = np.zeros_like(inside)
+        hit[inside] = self.map_img[y_pixels[inside], x_pixels[inside]] < 128
+        
+        # Premier pixel hors de la carte ou obstacle le long de chaque rayon
+        stop = ~inside | hit
+        first = np.argmax(stop, axis=2)
+        poses, beams = np.indices(first.shape)
+        found = stop[poses, beams, first] & hit[poses, beams, first]
+        
+        distances = r[first[found]] * self.resolution
+        scans[found, 0] = distances * cos_a[found]
+        scans[found, 1] = distances * sin_a[found]
+        return scans
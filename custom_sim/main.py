@@ -1,63 +1,129 @@
+import argparse
 import time
+import _paths  # noqa: F401 - dossier parent (modules partagés avec f110) dans sys.path
 from car_simulator import CarSimulator
 from keyboard_controller import KeyboardController
 from autonomous_navigator import AutonomousNavigator
 from follow_gap_navigator import FollowGapNavigator
 from equidistance_navigator import EquidistanceNavigator
+from disparity_extender_navigator import DisparityExtenderNavigator
+from simulation_scheduler import MultiRateScheduler
+from async_controller import AsyncController
+from shared_channel import SimulationChannel
 
-def main():
+# Table des navigateurs disponibles
+NAVIGATORS = {
+    'basic': AutonomousNavigator,
+    'follow_gap': FollowGapNavigator,
+    'equidistance': EquidistanceNavigator,
+    'disparity_extender': DisparityExtenderNavigator
+}
+
+def main(navigator_name=None, async_mode=None, compute_latency=0.0,
+         physics_rate=100.0, sensor_rate=40.0, control_rate=40.0, render_rate=10.0):
+    """Lance le simulateur
+
+    Args:
+        navigator_name: nom du navigateur autonome (None = contrôle clavier)
+        async_mode: None (synchrone), 'thread', 'process' ou 'shared' (processus
+            séparé, scans en mémoire partagée) pour exécuter le navigateur en
+            parallèle de la simulation
+        compute_latency: latence de calcul simulée du navigateur (s)
+        physics_rate, sensor_rate, control_rate, render_rate: fréquences (Hz)
+            de la dynamique, du lidar, du contrôle et de l'affichage
+    """
     # Créer le simulateur
     simulator = CarSimulator(map_path="TRR.bmp", yaml_path="map.yaml")
-    
+    if async_mode == 'shared' and navigator_name is not None:
+        # Le simulateur publie chaque scan dans la mémoire partagée du navigateur
+        simulator.channel = SimulationChannel((simulator.lidar.num_beams, 2))
+    scheduler = MultiRateScheduler(simulator, physics_rate=physics_rate,
+                                   sensor_rate=sensor_rate, control_rate=control_rate,
+                                   render_rate=render_rate)
+
     # Créer le contrôleur clavier
     keyboard = KeyboardController()
-    
-    # Créer les navigateurs
-    navigators = {
-        'basic': AutonomousNavigator(),
-        'follow_gap': FollowGapNavigator(),
-        'equidistance': EquidistanceNavigator()
-    }
-    current_navigator = 'equidistance'
-    
+
+    # Créer le navigateur autonome si demandé
+    navigator = None
+    if navigator_name is not None:
+        navigator_class = NAVIGATORS[navigator_name]
+        if async_mode is not None:
+            navigator = AsyncController(navigator_class, method='compute_command',
+                                        mode=async_mode, latency=compute_latency,
+                                        default_command=(0.0, 0.0), channel=simulator.channel)
+        else:
+            navigator = navigator_class()
+
     # Variables de contrôle
-    dt = 0.01  # pas de temps (s)
-    autonomous_mode = False
     running = True
     last_time = time.time()
-    
+    last_submitted_scan = None
+
+    def control(scan):
+        """Étape de contrôle : clavier, puis navigateur autonome s'il est actif"""
+        nonlocal running, last_submitted_scan
+        cmd_vel_linear, cmd_vel_angular, running = keyboard.update()
+        if navigator is None:
+            return cmd_vel_linear, cmd_vel_angular
+        if async_mode is not None:
+            # Ne publier que les nouveaux scans
+            if scan is not last_submitted_scan:
+                navigator.submit(scan, scheduler.sim_time)
+                last_submitted_scan = scan
+            return navigator.get_command(scheduler.sim_time)
+        return navigator.compute_command(scan)
+
     print("=== Contrôles ===")
     print("Flèches : contrôle manuel")
-    print("Espace  : activer/désactiver navigation autonome")
-    print("n       : changer de stratégie de navigation")
     print("r       : réinitialiser la simulation")
     print("Échap   : quitter")
     print("================")
-    
+
     try:
         while running:
             # Gestion du temps
             current_time = time.time()
-            if current_time - last_time < dt:
+            if current_time - last_time < scheduler.dt:
                 continue
             last_time = current_time
-            
-            # Mise à jour des commandes clavier
-            cmd_vel_linear, cmd_vel_angular, running = keyboard.update()
-            
-            # Obtenir le scan lidar et l'état des collisions
-            scan, collision = simulator.step(cmd_vel_linear, cmd_vel_angular, dt)
-            
+
+            # Avancer d'un pas de dynamique (scan et contrôle à leur propre fréquence)
+            collision = scheduler.tick(control)
+
             # Si collision, réinitialiser la simulation
-            if collision:
+            if collision and scheduler.new_scan:
                 print("Collision détectée ! Réinitialisation...")
                 #simulator.reset()
                 continue
-            
+
     except KeyboardInterrupt:
         print("\nArrêt demandé par l'utilisateur")
     finally:
         keyboard.close()
-        
+        scheduler.report()
+        if async_mode is not None and navigator is not None:
+            navigator.close()
+            stats = navigator.stats()
+            print(f"Pas avec commande périmée: {stats['stale_steps']}/{stats['steps']}")
+            print(f"Trames perdues: {stats['dropped_frames']}")
+        if simulator.channel is not None:
+            simulator.channel.release()
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Simulateur de voiture avec lidar")
+    parser.add_argument('--navigator', choices=sorted(NAVIGATORS),
+                        help="navigation autonome (contrôle clavier par défaut)")
+    parser.add_argument('--async', dest='async_mode', choices=['thread', 'process', 'shared'],
+                        help="exécuter le navigateur en parallèle de la simulation")
+    parser.add_argument('--compute-latency', type=float, default=0.0,
+                        help="latence de calcul simulée du navigateur (s)")
+    parser.add_argument('--physics-rate', type=float, default=100.0, help="fréquence de la dynamique (Hz)")
+    parser.add_argument('--sensor-rate', type=float, default=40.0, help="fréquence du lidar (Hz)")
+    parser.add_argument('--control-rate', type=float, default=40.0, help="fréquence du contrôle (Hz)")
+    parser.add_argument('--render-rate', type=float, default=10.0, help="fréquence d'affichage (Hz)")
+    args = parser.parse_args()
+    main(navigator_name=args.navigator, async_mode=args.async_mode,
+         compute_latency=args.compute_latency, physics_rate=args.physics_rate,
+         sensor_rate=args.sensor_rate, control_rate=args.control_rate,
+         render_rate=args.render_rate)
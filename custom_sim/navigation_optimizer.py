@@ -1,15 +1,40 @@
 import numpy as np
 from car_simulator import CarSimulator
 from autonomous_navigator import AutonomousNavigator
+from simulation_scheduler import MultiRateScheduler
+from parameter_grid import ParameterGrid, GridCheckpoint
 import time
+from successive_halving import SuccessiveHalving
+from termination_rules import TerminationMonitor
+from evaluation_cache import file_hash, source_hash
+from trial_history import TrialHistory
+
+# Colonnes de l'historique des évaluations (voir TrialHistory)
+METRIC_FIELDS = [('elapsed_time', 'f'), ('real_time', 'f'), ('collision', 'b'), ('distance', 'f'),
+                 ('score', 'f'), ('completed', 'b'), ('abort_reason', 'c')]
 
 class NavigationOptimizer:
-    def __init__(self, map_path="TRR.bmp", yaml_path="map.yaml"):
+    def __init__(self, map_path="TRR.bmp", yaml_path="map.yaml", navigator_class=AutonomousNavigator,
+                 simulator_options=None, termination_rules=None, cache=None):
+        """
+        Args:
+            navigator_class: classe du navigateur à optimiser (construite avec les paramètres testés)
+            simulator_options: options supplémentaires de CarSimulator (num_beams,
+                lidar_backend, ray_step pour une simulation plus rapide, start_pose)
+            termination_rules: fonction (meilleur temps ou None) -> liste de règles
+                d'arrêt anticipé (voir termination_rules.default_rules), ou None
+            cache: EvaluationCache consulté avant chaque simulation de evaluate_params, ou None
+        """
         self.map_path = map_path
         self.yaml_path = yaml_path
+        self.navigator_class = navigator_class
+        self.simulator_options = simulator_options or {}
+        self.termination_rules = termination_rules
+        self.cache = cache
         self.best_params = None
         self.best_score = float('inf')
-        self.results = []
+        # Historique des évaluations en colonnes (paramètres déduits du premier essai)
+        self.history = TrialHistory(fields=METRIC_FIELDS)
         
         # Position de départ et paramètres de détection
         self.start_x = 4.0  # même que dans CarSimulator
@@ -17,6 +42,10 @@ class NavigationOptimizer:
         self.detection_radius = 0.5  # rayon de la zone de détection en mètres
         self.min_distance_for_lap = 5.0  # distance minimale à parcourir avant de pouvoir compter un tour
         
+        # Fréquences de simulation (Hz) : lidar et contrôle à 20 Hz, cinématique à 100 Hz
+        self.rates = {'physics_rate': 100.0, 'sensor_rate': 20.0, 'control_rate': 20.0}
+        self.last_timings = None
+        
     def evaluate_params(self, params, max_time=60, collision_penalty=float('inf')):
         """Évalue un jeu de paramètres en simulant une course
         
@@ -29,74 +58,220 @@ class NavigationOptimizer:
             score: temps total + pénalités (infini si collision)
             metrics: dict avec les métriques détaillées
         """
+        context = self.evaluation_context(max_time) if self.cache is not None else None
+        metrics = self.cache.get(params, context) if self.cache is not None else None
+        if metrics is not None:
+            print("♻ Paramètres déjà évalués dans les mêmes conditions (cache)")
+            metrics['params'] = params
+        else:
+            episode = self.start_episode(params)
+            self.run_episode(episode, max_time)
+            metrics = self.episode_metrics(episode)
+            if metrics['collision']:
+                print("❌ Collision détectée - Paramètres éliminés")
+            elif episode['lap_completed']:
+                print("✅ Tour complet sans collision!")
+            elif episode['abort_reason'] is not None:
+                print(f"⏹ Arrêt anticipé ({episode['abort_reason']})")
+            
+            # Un arrêt par borne du temps au tour dépend du meilleur temps du moment
+            if self.cache is not None and metrics['abort_reason'] != 'lap_time_bound':
+                self.cache.put(params, context, metrics)
+        
+        self._record(metrics)
+        return metrics['score'], metrics
+    
+    @property
+    def results(self):
+        """Métriques des évaluations (séquence de dicts construits depuis l'historique)"""
+        return self.history.rows
+    
+    def evaluation_context(self, max_time):
+        """Conditions d'une évaluation : avec les paramètres, elles forment la clé du cache"""
+        return {
+            'simulator': 'custom_sim',
+            'map': file_hash(self.map_path),
+            'map_yaml': file_hash(self.yaml_path),
+            'rates': self.rates,
+            'simulator_options': self.simulator_options,
+            'navigator': self.navigator_class.__name__,
+            'controller': source_hash(self.navigator_class),
+            'max_time': max_time,
+            'early_stop': self.termination_rules is not None
+        }
+    
+    def start_episode(self, params):
+        """Crée une simulation prête à être avancée (et reprise) par run_episode"""
         # Créer un nouveau simulateur avec ces paramètres en mode headless
-        simulator = CarSimulator(self.map_path, self.yaml_path, headless=True)
+        simulator = CarSimulator(self.map_path, self.yaml_path, headless=True,
+                                 **self.simulator_options)
+        # La ligne de départ suit la position initiale du simulateur (start_pose)
+        self.start_x, self.start_y = simulator.start_x, simulator.start_y
         
         # Configurer le navigateur avec les paramètres à tester
-        simulator.navigator = AutonomousNavigator(**params)
+        navigator = self.navigator_class(**params)
         
-        # Activer le mode autonome
-        simulator.autonomous_mode = True
+        # Dynamique à pas fin, lidar et contrôle à la fréquence du capteur
+        scheduler = MultiRateScheduler(simulator, **self.rates)
         
-        # Variables pour le suivi
-        start_time = time.time()
-        collision_detected = False
-        distance_traveled = 0
-        last_pos = (simulator.car.x, simulator.car.y)
+        # Règles d'arrêt anticipé (le meilleur temps sert de borne au temps au tour)
+        termination = None
+        if self.termination_rules is not None:
+            best_time = self.best_score if np.isfinite(self.best_score) else None
+            termination = TerminationMonitor(self.termination_rules(best_time))
+            termination.reset(simulator.car.x, simulator.car.y, simulator.car.theta)
         
-        # Boucle de simulation avec dt plus petit pour plus de précision
-        dt = 0.05  # 50ms au lieu de 100ms
-        elapsed_simulation_time = 0
+        return {
+            'params': params,
+            'simulator': simulator,
+            'navigator': navigator,
+            'scheduler': scheduler,
+            'real_time': 0.0,
+            'collision': False,
+            'lap_completed': False,
+            'distance': 0.0,
+            'last_pos': (simulator.car.x, simulator.car.y),
+            'termination': termination,
+            'abort_reason': None
+        }
+    
+    def run_episode(self, episode, max_time):
+        """Avance une simulation jusqu'au temps simulé max_time (ou jusqu'à sa fin)
+        
+        Returns:
+            True si la simulation est terminée (collision ou tour complet)
+        """
+        simulator = episode['simulator']
+        scheduler = episode['scheduler']
+        navigator = episode['navigator']
+        start_time = time.time()
         
-        while elapsed_simulation_time < max_time:
+        while scheduler.sim_time < max_time and not self.episode_finished(episode):
             # Mettre à jour la simulation
-            simulator.update(simulator.linear_vel, simulator.angular_vel, dt)
-            elapsed_simulation_time += dt
+            scheduler.tick(navigator.compute_command)
             
             # Si collision, on arrête immédiatement avec un mauvais score
-            if simulator.collision_detected:
-                collision_detected = True
-                print("❌ Collision détectée - Paramètres éliminés")
+            if scheduler.collision:
+                episode['collision'] = True
                 break
             
             # Calculer la distance parcourue
             current_pos = (simulator.car.x, simulator.car.y)
-            step_distance = np.sqrt((current_pos[0] - last_pos[0])**2 + 
-                                  (current_pos[1] - last_pos[1])**2)
-            distance_traveled += step_distance
-            last_pos = current_pos
+            last_pos = episode['last_pos']
+            episode['distance'] += np.sqrt((current_pos[0] - last_pos[0])**2 + 
+                                           (current_pos[1] - last_pos[1])**2)
+            episode['last_pos'] = current_pos
             
             # Vérifier si on a fait un tour complet
-            if self._check_lap_completed(simulator, distance_traveled):
-                print("✅ Tour complet sans collision!")
+            if self._check_lap_completed(simulator, episode['distance']):
+                episode['lap_completed'] = True
                 break
+            
+            # Règles d'arrêt anticipé
+            termination = episode['termination']
+            if termination is not None:
+                episode['abort_reason'] = termination.update(scheduler.sim_time, simulator.car.x,
+                                                             simulator.car.y, simulator.car.theta)
+                if episode['abort_reason'] is not None:
+                    break
         
-        # Calculer le score final
-        elapsed_time = time.time() - start_time
-        final_score = float('inf') if collision_detected else elapsed_simulation_time
-        
-        metrics = {
+        episode['real_time'] += time.time() - start_time
+        self.last_timings = scheduler.timings()
+        return self.episode_finished(episode)
+    
+    def episode_finished(self, episode):
+        """Une simulation est terminée après une collision, un tour complet ou un arrêt anticipé"""
+        return episode['collision'] or episode['lap_completed'] or episode['abort_reason'] is not None
+    
+    def episode_metrics(self, episode):
+        """Métriques d'une simulation (éventuellement interrompue)"""
+        elapsed_simulation_time = episode['scheduler'].sim_time
+        collision_detected = episode['collision']
+        distance_traveled = episode['distance']
+        # Seul un tour bouclé a un temps au tour : une simulation interrompue
+        # (collision, arrêt anticipé, budget épuisé) reçoit un score infini
+        completed = episode['lap_completed'] and not collision_detected
+        return {
             'elapsed_time': elapsed_simulation_time,
-            'real_time': elapsed_time,
+            'real_time': episode['real_time'],
             'collision': collision_detected,
             'distance': distance_traveled,
-            'score': final_score,
-            'params': params,
-            'completed': distance_traveled >= self.min_distance_for_lap and not collision_detected
+            'score': elapsed_simulation_time if completed else float('inf'),
+            'params': episode['params'],
+            'completed': completed,
+            'abort_reason': episode['abort_reason']
         }
-        
+    
+    def _record(self, metrics):
+        """Met à jour le meilleur score et l'historique des résultats"""
         # Mettre à jour le meilleur score seulement si pas de collision et tour complété
-        if not collision_detected and metrics['completed'] and final_score < self.best_score:
-            self.best_score = final_score
-            self.best_params = params
-            print(f"🏆 Nouveau meilleur score: {final_score:.2f}s")
-            print(f"   Distance: {distance_traveled:.2f}m")
-            print(f"   Temps réel d'évaluation: {elapsed_time:.2f}s")
+        if not metrics['collision'] and metrics['completed'] and metrics['score'] < self.best_score:
+            self.best_score = metrics['score']
+            self.best_params = metrics['params']
+            print(f"🏆 Nouveau meilleur score: {metrics['score']:.2f}s")
+            print(f"   Distance: {metrics['distance']:.2f}m")
+            print(f"   Temps réel d'évaluation: {metrics['real_time']:.2f}s")
         
         # Sauvegarder les résultats
-        self.results.append(metrics)
+        self.history.append(metrics['params'], metrics)
+    
+    def progress_score(self, episode):
+        """Score de progression pour comparer des simulations de durées partielles
         
-        return final_score, metrics
+        Plus grand = meilleur : un tour complet est classé par son temps, une
+        simulation en cours par la distance parcourue, une collision en dernier.
+        """
+        if episode['collision']:
+            return -1000 + episode['distance']
+        if episode['lap_completed']:
+            return 10000 - 10 * episode['scheduler'].sim_time
+        return episode['distance']
+    
+    def optimize_successive_halving(self, candidates, budgets=(10.0, 30.0, 60.0), keep_fraction=1 / 3):
+        """Évalue des candidats par paliers de budget croissant (successive halving)
+        
+        Les simulations promues sont reprises là où elles s'étaient arrêtées au
+        lieu d'être relancées depuis le départ.
+        
+        Args:
+            candidates: liste de dicts de paramètres
+            budgets: temps simulé (s) cumulé de chaque palier
+            keep_fraction: fraction des candidats promus à chaque palier
+        
+        Returns:
+            best_params, best_score
+        """
+        def evaluate(jobs):
+            results = []
+            for params, budget, previous in jobs:
+                episode = previous['state'] if previous is not None else self.start_episode(params)
+                sim_start = episode['scheduler'].sim_time
+                finished = self.run_episode(episode, budget)
+                results.append({
+                    'score': self.progress_score(episode),
+                    'finished': finished,
+                    'sim_time': episode['scheduler'].sim_time - sim_start,
+                    'state': episode,
+                    'metrics': self.episode_metrics(episode)
+                })
+            return results
+        
+        def eliminate(params, result):
+            # Une simulation interrompue par l'élimination n'a pas de temps au tour
+            if result['finished']:
+                self._record(result['metrics'])
+        
+        halving = SuccessiveHalving(budgets, keep_fraction)
+        final = halving.run(candidates, evaluate, on_eliminated=eliminate)
+        for params, result in final:
+            self._record(result['metrics'])
+        halving.report()
+        
+        print("\nMeilleurs paramètres trouvés:")
+        print(self.best_params)
+        print(f"Meilleur score: {self.best_score:.2f}")
+        
+        return self.best_params, self.best_score
     
     def _near_start_line(self, simulator):
         """Vérifie si le véhicule est près de la ligne de départ"""
@@ -110,9 +285,15 @@ class NavigationOptimizer:
         return (distance_traveled >= self.min_distance_for_lap and 
                 self._near_start_line(simulator))
     
-    def optimize_grid_search(self, param_grid):
+    def optimize_grid_search(self, param_grid, shard_index=0, num_shards=1, checkpoint_path=None,
+                             checkpoint_every=10):
         """Effectue une recherche sur grille des meilleurs paramètres
         
+        La grille est parcourue paresseusement (ParameterGrid) ; avec num_shards > 1,
+        seule la part shard_index est évaluée (pour répartir la recherche entre
+        plusieurs processus ou machines). Avec un point de reprise, les
+        combinaisons déjà évaluées sont sautées après un redémarrage.
+        
         Args:
             param_grid: dict avec les plages de valeurs à tester pour chaque paramètre
             Par exemple:
@@ -121,25 +302,108 @@ class NavigationOptimizer:
                 'normal_linear_speed': [1.0, 1.5, 2.0],
                 'obstacle_angular_speed': [2.0, 2.5, 3.0]
             }
+            shard_index: part de la grille à évaluer (0 <= shard_index < num_shards)
+            num_shards: nombre de parts
+            checkpoint_path: fichier du point de reprise (None = pas de reprise)
+            checkpoint_every: nombre d'évaluations entre deux sauvegardes
         """
-        # Générer toutes les combinaisons de paramètres
-        from itertools import product
-        keys = param_grid.keys()
-        combinations = product(*param_grid.values())
-        
-        for values in combinations:
-            params = dict(zip(keys, values))
-            print(f"\nTest des paramètres: {params}")
-            
-            score, metrics = self.evaluate_params(params)
-            print(f"Score: {score:.2f}")
-            print(f"Temps: {metrics['elapsed_time']:.2f}s")
-            print(f"Collisions: {metrics['collision']}")
-            print(f"Distance: {metrics['distance']:.2f}m")
-            print(f"Tour complété: {'Oui' if metrics['completed'] else 'Non'}")
+        grid = ParameterGrid(param_grid)
+        indices = grid.shard(shard_index, num_shards)
+        checkpoint = GridCheckpoint(checkpoint_path, grid) if checkpoint_path else None
+        
+        if checkpoint is not None:
+            # Reprendre le meilleur résultat des sessions précédentes
+            if checkpoint.best_score < self.best_score:
+                self.best_score = checkpoint.best_score
+                self.best_params = checkpoint.best_params
+            print(f"Reprise: {checkpoint.count(indices)}/{len(indices)} combinaisons déjà évaluées")
+        
+        evaluated = 0
+        try:
+            for index in indices:
+                if checkpoint is not None and checkpoint.is_done(index):
+                    continue
+                params = grid[index]
+                print(f"\nTest des paramètres ({index + 1}/{len(grid)}): {params}")
+                
+                score, metrics = self.evaluate_params(params)
+                print(f"Score: {score:.2f}")
+                print(f"Temps: {metrics['elapsed_time']:.2f}s")
+                print(f"Collisions: {metrics['collision']}")
+                print(f"Distance: {metrics['distance']:.2f}m")
+                print(f"Tour complété: {'Oui' if metrics['completed'] else 'Non'}")
+                
+                if checkpoint is not None:
+                    valid = metrics['completed'] and not metrics['collision']
+                    checkpoint.mark(index, score if valid else None, params)
+                    evaluated += 1
+                    if evaluated % checkpoint_every == 0:
+                        checkpoint.save()
+        finally:
+            if checkpoint is not None:
+                checkpoint.save()
+        
+        print("\nMeilleurs paramètres trouvés:")
+        print(self.best_params)
+        print(f"Meilleur score: {self.best_score:.2f}")
+        
+        return self.best_params, self.best_score
+    
+    def optimize_distributed(self, param_grid, coordinator, checkpoint_path=None, checkpoint_every=10,
+                             queue_depth=16, max_time=60, report_interval=30.0):
+        """Recherche sur grille répartie entre les processus de travail d'une grappe
+        
+        Les combinaisons sont mises en file du coordinateur (distributed.Coordinator)
+        au fur et à mesure, queue_depth à la fois ; les processus de travail
+        (distributed.run_worker avec evaluate_params) rendent leurs métriques,
+        enregistrées ici comme avec optimize_grid_search, point de reprise compris.
+        
+        Args:
+            param_grid: dict nom -> liste de valeurs (ou SearchSpace)
+            coordinator: distributed.Coordinator en écoute
+            max_time: temps maximum de simulation de chaque évaluation (s)
+        """
+        grid = ParameterGrid(param_grid)
+        checkpoint = GridCheckpoint(checkpoint_path, grid) if checkpoint_path else None
+        if checkpoint is not None and checkpoint.best_score < self.best_score:
+            self.best_score = checkpoint.best_score
+            self.best_params = checkpoint.best_params
+        todo = [index for index in range(len(grid)) if checkpoint is None or not checkpoint.is_done(index)]
+        print(f"{len(todo)}/{len(grid)} combinaisons à évaluer")
+        
+        next_index = 0
+        pending = set()
+        evaluated = 0
+        last_report = time.time()
+        try:
+            while next_index < len(todo) or pending:
+                while next_index < len(todo) and len(pending) < queue_depth:
+                    index = todo[next_index]
+                    next_index += 1
+                    pending.add(index)
+                    coordinator.submit(index, {'params': grid[index], 'max_time': max_time})
+                for index, metrics in coordinator.collect(timeout=1.0):
+                    pending.discard(index)
+                    self._record(metrics)
+                    evaluated += 1
+                    print(f"Combinaison {index + 1}/{len(grid)}: score {metrics['score']:.2f}, "
+                          f"distance {metrics['distance']:.2f}m - "
+                          f"{coordinator.stats()['rate']:.2f} éval/s (grappe)")
+                    if checkpoint is not None:
+                        valid = metrics['completed'] and not metrics['collision']
+                        checkpoint.mark(index, metrics['score'] if valid else None, metrics['params'])
+                        if evaluated % checkpoint_every == 0:
+                            checkpoint.save()
+                if time.time() - last_report >= report_interval:
+                    coordinator.report()
+                    last_report = time.time()
+        finally:
+            if checkpoint is not None:
+                checkpoint.save()
         
+        coordinator.report()
         print("\nMeilleurs paramètres trouvés:")
         print(self.best_params)
         print(f"Meilleur score: {self.best_score:.2f}")
         
-        return self.best_params, self.best_score 
\ No newline at end of file
+        return self.best_params, self.best_score
@@ -1,16 +1,17 @@
+import argparse
+import _paths  # noqa: F401 - dossier parent (modules partagés avec f110) dans sys.path
 from navigation_optimizer import NavigationOptimizer
-import numpy as np
+from autonomous_navigator import AutonomousNavigator
+from disparity_extender_navigator import DisparityExtenderNavigator
+from parameter_grid import ParameterGrid
+from evaluation_cache import EvaluationCache
+from search_space import SearchSpace
+from distributed import (Coordinator, run_worker, parse_address, resolve_authkey, check_authkey,
+                         DEFAULT_AUTHKEY, DEFAULT_HOST, DEFAULT_PORT, AUTHKEY_ENV)
 
-def create_range(min_val, max_val, step):
-    """Crée une liste de valeurs entre min et max avec un pas donné"""
-    return list(np.arange(min_val, max_val + step/2, step))
-
-def main():
-    # Créer l'optimiseur
-    optimizer = NavigationOptimizer(map_path="TRR.bmp", yaml_path="map.yaml")
-    
-    # Définir les plages de paramètres (min, max, pas)
-    ranges = {
+# Plages de paramètres (min, max, pas) pour chaque navigateur
+NAVIGATOR_RANGES = {
+    'basic': {
         # Distances de détection (mètres)
         'stop_distance': (0.2, 0.8, 0.2),      # [0.2, 0.4, 0.6, 0.8]
         
@@ -27,13 +28,49 @@ def main():
         'left_sector_end': (335, 355, 10),      # [335, 345, 355] (-25° à -5°)
         'right_sector_start': (5, 25, 10),      # [5, 15, 25]
         'right_sector_end': (30, 60, 15)        # [30, 45, 60]
+    },
+    'disparity_extender': {
+        # Élargissement des obstacles (mètres)
+        'safety_margin': (0.05, 0.2, 0.05),     # [0.05, 0.1, 0.15, 0.2]
+        'disparity_threshold': (0.2, 0.6, 0.2), # [0.2, 0.4, 0.6]
+        
+        # Choix du cap
+        'stop_distance': (0.3, 0.7, 0.2),       # [0.3, 0.5, 0.7]
+        'field_of_view': (120, 180, 30),        # [120, 150, 180] degrés
+        
+        # Vitesses
+        'max_linear_speed': (1.0, 2.5, 0.5),    # [1.0, 1.5, 2.0, 2.5]
+        'steering_gain': (1.0, 3.0, 1.0)        # [1.0, 2.0, 3.0]
     }
+}
+
+# Classe de navigateur associée à chaque jeu de plages
+NAVIGATOR_CLASSES = {
+    'basic': AutonomousNavigator,
+    'disparity_extender': DisparityExtenderNavigator
+}
+
+def main(navigator_name='basic', shard_index=0, num_shards=1, checkpoint_path=None, confirm=True,
+         use_cache=True, serve=None, connect=None, authkey=DEFAULT_AUTHKEY, batch_size=4):
+    # Créer l'optimiseur (les paramètres déjà évalués sont lus dans le cache)
+    cache = EvaluationCache() if use_cache else None
+    optimizer = NavigationOptimizer(map_path="TRR.bmp", yaml_path="map.yaml",
+                                    navigator_class=NAVIGATOR_CLASSES[navigator_name],
+                                    cache=cache)
+    
+    if connect is not None:
+        # Processus de travail : évaluer les combinaisons louées au coordinateur
+        print(f"Connexion au coordinateur {connect[0]}:{connect[1]}")
+        evaluated = run_worker(connect, lambda params, max_time: optimizer.evaluate_params(params, max_time)[1],
+                               authkey=authkey, batch_size=batch_size)
+        print(f"{evaluated} combinaisons évaluées")
+        return
+    
+    # Définir l'espace de recherche à partir des plages (min, max, pas)
+    space = SearchSpace.from_ranges(NAVIGATOR_RANGES[navigator_name])
     
     # Créer la grille de paramètres
-    param_grid = {
-        param: create_range(*range_vals)
-        for param, range_vals in ranges.items()
-    }
+    param_grid = space.grid_values()
     
     # Afficher les plages de valeurs
     print("=== Plages de paramètres à tester ===")
@@ -43,12 +80,34 @@ def main():
         print(f"  [{len(values)} valeurs]")
     
     print("\n=== Optimisation des paramètres de navigation ===")
-    print(f"Nombre total de combinaisons: {len([1 for _ in __import__('itertools').product(*param_grid.values())])}")
-    print("Appuyez sur Entrée pour commencer...")
-    input()
+    grid = ParameterGrid(param_grid)
+    print(f"Nombre total de combinaisons: {len(grid)}")
+    if num_shards > 1:
+        print(f"Part {shard_index + 1}/{num_shards}: {len(grid.shard(shard_index, num_shards))} combinaisons")
+    if checkpoint_path:
+        print(f"Point de reprise: {checkpoint_path}")
+    if confirm:
+        print("Appuyez sur Entrée pour commencer...")
+        input()
     
     # Lancer l'optimisation
-    best_params, best_score = optimizer.optimize_grid_search(param_grid)
+    if serve is not None:
+        coordinator = Coordinator(serve, authkey)
+        print(f"Coordinateur en écoute sur {coordinator.address[0]}:{coordinator.address[1]}")
+        try:
+            best_params, best_score = optimizer.optimize_distributed(
+                param_grid, coordinator, checkpoint_path=checkpoint_path)
+        finally:
+            coordinator.shutdown()
+    else:
+        best_params, best_score = optimizer.optimize_grid_search(
+            param_grid, shard_index=shard_index, num_shards=num_shards,
+            checkpoint_path=checkpoint_path)
+    if cache is not None:
+        cache.report()
+    if best_params is None:
+        print("\nAucun tour n'a été complété!")
+        return
     
     # Afficher les résultats détaillés
     print("\n=== Résultats détaillés ===")
@@ -57,17 +116,50 @@ def main():
         print(f"  {param}: {value}")
     print(f"\nMeilleur score: {best_score:.2f}")
     
-    # Afficher les statistiques des essais
-    completed_runs = [r for r in optimizer.results if r['completed']]
-    if completed_runs:
+    # Afficher les statistiques des essais de cette session
+    history = optimizer.history
+    completed = history.column('completed')
+    if completed.any():
         print("\nStatistiques des tours complétés:")
-        print(f"Nombre de tours complétés: {len(completed_runs)}")
-        avg_time = sum(r['elapsed_time'] for r in completed_runs) / len(completed_runs)
-        avg_collisions = sum(r['collisions'] for r in completed_runs) / len(completed_runs)
+        print(f"Nombre de tours complétés: {int(completed.sum())}")
+        avg_time = history.column('elapsed_time')[completed].mean()
+        collisions = int(history.column('collision').sum())
         print(f"Temps moyen: {avg_time:.2f}s")
-        print(f"Collisions moyennes: {avg_collisions:.1f}")
-    else:
-        print("\nAucun tour n'a été complété!")
+        print(f"Essais terminés par une collision: {collisions}/{len(history)}")
+    elif len(history):
+        print("\nAucun tour n'a été complété pendant cette session!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Optimisation des paramètres de navigation")
+    parser.add_argument('--navigator', choices=sorted(NAVIGATOR_RANGES), default='basic',
+                        help="navigateur à optimiser")
+    parser.add_argument('--shard', type=int, default=0, help="part de la grille à évaluer (à partir de 0)")
+    parser.add_argument('--num-shards', type=int, default=1, help="nombre de parts de la grille")
+    parser.add_argument('--checkpoint', help="fichier de point de reprise (.npz)")
+    parser.add_argument('--yes', action='store_true', help="démarrer sans confirmation")
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help="toujours simuler, même les paramètres déjà évalués")
+    parser.add_argument('--serve', metavar='HÔTE:PORT', nargs='?', const=f'{DEFAULT_HOST}:{DEFAULT_PORT}',
+                        help="coordonner une grappe de processus de travail (TCP)")
+    parser.add_argument('--connect', metavar='HÔTE:PORT',
+                        help="processus de travail : évaluer les combinaisons louées par un coordinateur")
+    parser.add_argument('--authkey',
+                        help="clé partagée entre le coordinateur et les processus de travail "
+                             f"(par défaut ${AUTHKEY_ENV} ; obligatoire hors de la boucle locale)")
+    parser.add_argument('--batch', type=int, default=4, help="nombre de combinaisons louées à la fois")
+    args = parser.parse_args()
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None and args.num_shards > 1:
+        checkpoint_path = f"grid_{args.navigator}_{args.shard}of{args.num_shards}.npz"
+    serve = parse_address(args.serve) if args.serve else None
+    connect = parse_address(args.connect) if args.connect else None
+    authkey = resolve_authkey(args.authkey)
+    for address in (serve, connect):
+        if address is not None:
+            try:
+                check_authkey(address, authkey)
+            except ValueError as e:
+                parser.error(str(e))
+    main(navigator_name=args.navigator, shard_index=args.shard, num_shards=args.num_shards,
+         checkpoint_path=checkpoint_path, confirm=not args.yes, use_cache=args.use_cache,
+         serve=serve, connect=connect, authkey=authkey, batch_size=args.batch)
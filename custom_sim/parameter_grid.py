@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+class ParameterGrid:
+    def __init__(self, param_grid):
+        """Grille de paramètres énumérée sans être matérialisée
+
+        La combinaison d'indice i est obtenue par arithmétique en base mixte,
+        dans le même ordre que itertools.product (le dernier paramètre varie le
+        plus vite). Le nombre de combinaisons est le produit des tailles.
+
+        Args:
+            param_grid: dict nom -> liste de valeurs, ou SearchSpace (grille de ses pas)
+        """
+        if hasattr(param_grid, 'grid_values'):
+            param_grid = param_grid.grid_values()
+        self.names = list(param_grid.keys())
+        self.values = [list(values) for values in param_grid.values()]
+        self.radices = [len(values) for values in self.values]
+
+        # Poids de chaque paramètre dans l'indice (entiers Python : pas de débordement)
+        self.strides = []
+        stride = 1
+        for radix in reversed(self.radices):
+            self.strides.insert(0, stride)
+            stride *= radix
+        self.total = stride
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        """Combinaison d'indice index (dict nom -> valeur)"""
+        if not 0 <= index < self.total:
+            raise IndexError(f"Indice {index} hors de la grille ({self.total} combinaisons)")
+        params = {}
+        for name, values, stride, radix in zip(self.names, self.values, self.strides, self.radices):
+            params[name] = values[(index // stride) % radix]
+        return params
+
+    def index(self, params):
+        """Indice d'une combinaison (inverse de __getitem__)"""
+        return sum(values.index(params[name]) * stride
+                   for name, values, stride in zip(self.names, self.values, self.strides))
+
+    def shard(self, shard_index=0, num_shards=1):
+        """Indices d'une part de la grille (une combinaison sur num_shards)
+
+        Les parts sont entrelacées, donc chacune couvre toute la grille de façon
+        uniforme et les parts ont la même taille à une combinaison près.
+        """
+        return range(shard_index, self.total, num_shards)
+
+    def signature(self):
+        """Empreinte de la grille (pour vérifier qu'un point de reprise lui correspond)"""
+        description = json.dumps([self.names, [[float(v) for v in values] for values in self.values]])
+        return hashlib.sha1(description.encode()).hexdigest()
+
+
+class GridCheckpoint:
+    def __init__(self, path, grid):
+        """Point de reprise compact d'une recherche sur grille
+
+        Les combinaisons terminées sont stockées dans un masque de bits (un bit
+        par combinaison) avec le meilleur résultat obtenu. Le fichier est écrit
+        de façon atomique (fichier temporaire puis renommage).
+
+        Args:
+            path: fichier .npz du point de reprise
+            grid: ParameterGrid correspondante
+        """
+        self.path = path
+        self.grid = grid
+        self.signature = grid.signature()
+        self.done = np.zeros(len(grid), dtype=bool)
+        self.best_score = float('inf')
+        self.best_params = None
+
+        if os.path.exists(path):
+            self.load()
+
+    def load(self):
+        """Recharge le point de reprise s'il correspond à la grille"""
+        with np.load(self.path) as data:
+            if str(data['signature']) != self.signature:
+                raise ValueError(f"Le point de reprise {self.path} ne correspond pas à la grille")
+            self.done = np.unpackbits(data['done'], count=len(self.grid)).astype(bool)
+            self.best_score = float(data['best_score'])
+            best_params = str(data['best_params'])
+            self.best_params = json.loads(best_params) if best_params else None
+
+    def save(self):
+        """Écrit le point de reprise"""
+        tmp_path = self.path + '.tmp.npz'
+        np.savez(tmp_path,
+                 signature=self.signature,
+                 done=np.packbits(self.done),
+                 best_score=self.best_score,
+                 best_params=json.dumps(self.best_params) if self.best_params is not None else '')
+        os.replace(tmp_path, self.path)
+
+    def is_done(self, index):
+        return bool(self.done[index])
+
+    def mark(self, index, score=None, params=None):
+        """Marque une combinaison comme terminée (et met à jour le meilleur score)"""
+        self.done[index] = True
+        if score is not None and score < self.best_score:
+            self.best_score = score
+            self.best_params = {name: float(value) for name, value in params.items()}
+
+    def count(self, indices=None):
+        """Nombre de combinaisons terminées (parmi indices si donné)"""
+        if indices is None:
+            return int(self.done.sum())
+        return int(self.done[indices.start:indices.stop:indices.step].sum())
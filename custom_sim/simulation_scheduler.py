@@ -0,0 +1,148 @@
+import time
+
+
+class MultiRateScheduler:
+    """Ordonnanceur multi-fréquence de la simulation
+
+    La dynamique, le lidar, le contrôle et l'affichage tournent chacun à leur
+    propre fréquence. Le pas de base est celui de la dynamique ; chaque autre
+    étape garde l'instant (en pas de base, fractionnaire) de sa prochaine
+    exécution et l'avance d'une période à chaque exécution. Une fréquence qui
+    ne divise pas celle de la dynamique (40 Hz pour 100 Hz : tous les 2,5 pas)
+    est ainsi respectée en moyenne. Le scan lidar (l'étape coûteuse)
+    n'est ainsi lancé qu'aux instants capteur, et la collision, détectée à
+    partir du scan, est vérifiée au même rythme.
+
+    Le temps passé dans chaque étape est mesuré pour savoir où part le temps de
+    calcul.
+    """
+
+    STAGES = ('dynamics', 'sensing', 'control', 'rendering')
+
+    def __init__(self, simulator, physics_rate=100.0, sensor_rate=40.0,
+                 control_rate=40.0, render_rate=10.0):
+        """
+        Args:
+            simulator: instance de CarSimulator
+            physics_rate: fréquence d'intégration de la cinématique (Hz)
+            sensor_rate: fréquence du lidar (Hz)
+            control_rate: fréquence du contrôleur (Hz)
+            render_rate: fréquence d'affichage (Hz, ignorée en mode headless)
+        """
+        self.simulator = simulator
+        self.physics_rate = physics_rate
+        self.dt = 1.0 / physics_rate
+
+        # Période de chaque étape cadencée, en pas de dynamique (au moins un pas)
+        self.rates = {'sensing': sensor_rate, 'control': control_rate, 'rendering': render_rate}
+        self.periods = {}
+        for stage, rate in self.rates.items():
+            if rate <= 0:
+                raise ValueError(f"Fréquence invalide pour {stage}: {rate}")
+            if rate > physics_rate:
+                print(f"Attention: {stage} limité à la fréquence de la dynamique "
+                      f"({rate:g} Hz demandés, {physics_rate:g} Hz effectifs)")
+            self.periods[stage] = max(1.0, physics_rate / rate)
+
+        # Temps passé et nombre d'appels par étape
+        self.stage_time = {stage: 0.0 for stage in self.STAGES}
+        self.stage_calls = {stage: 0 for stage in self.STAGES}
+
+        self.reset()
+
+    @property
+    def effective_rates(self):
+        """Fréquence moyenne de chaque étape (Hz) après limitation à celle de la dynamique"""
+        rates = {stage: self.physics_rate / period for stage, period in self.periods.items()}
+        rates['dynamics'] = self.physics_rate
+        return rates
+
+    def _due(self, stage):
+        """True si l'étape doit s'exécuter à ce pas (avance alors sa prochaine échéance)"""
+        # Tolérance : les périodes fractionnaires s'accumulent en virgule flottante
+        if self.tick_count + 1e-9 < self.next_due[stage]:
+            return False
+        self.next_due[stage] += self.periods[stage]
+        return True
+
+    def reset(self):
+        """Remet l'horloge et l'état courant à zéro (les mesures sont conservées)"""
+        self.tick_count = 0
+        self.next_due = {stage: 0.0 for stage in self.periods}
+        self.scan = None
+        self.collision = False
+        self.new_scan = False
+        self.command = (0.0, 0.0)
+
+    @property
+    def sim_time(self):
+        """Temps de simulation écoulé (s)"""
+        return self.tick_count * self.dt
+
+    def _timed(self, stage, func, *args):
+        """Exécute une étape en mesurant sa durée"""
+        start = time.perf_counter()
+        result = func(*args)
+        self.stage_time[stage] += time.perf_counter() - start
+        self.stage_calls[stage] += 1
+        return result
+
+    def tick(self, controller=None):
+        """Avance la simulation d'un pas de dynamique
+
+        Args:
+            controller: fonction scan -> (vitesse linéaire, vitesse angulaire),
+                appelée aux instants de contrôle (par ex. navigator.compute_command)
+
+        Returns:
+            collision: True si le dernier scan indique une collision
+        """
+        # Capteur : scan et collision
+        self.new_scan = self._due('sensing')
+        if self.new_scan:
+            self.scan, self.collision = self._timed('sensing', self.simulator.sense)
+
+        # Contrôle à partir du dernier scan disponible
+        if self._due('control') and controller is not None and self.scan is not None:
+            self.command = self._timed('control', controller, self.scan)
+
+        # Dynamique avec la dernière commande
+        self._timed('dynamics', self.simulator.advance,
+                    self.command[0], self.command[1], self.dt)
+
+        # Affichage
+        if self._due('rendering') and not self.simulator.headless and self.scan is not None:
+            self._timed('rendering', self.simulator.render, self.scan)
+
+        self.tick_count += 1
+        return self.collision
+
+    def run(self, controller=None, duration=10.0, stop_on_collision=True):
+        """Simule pendant `duration` secondes (ou jusqu'à la première collision)"""
+        end_tick = self.tick_count + int(round(duration / self.dt))
+        while self.tick_count < end_tick:
+            if self.tick(controller) and stop_on_collision:
+                break
+        return self.collision
+
+    def timings(self):
+        """Retourne le temps passé dans chaque étape"""
+        return {
+            stage: {
+                'total': self.stage_time[stage],
+                'calls': self.stage_calls[stage],
+                'mean': self.stage_time[stage] / self.stage_calls[stage] if self.stage_calls[stage] else 0.0
+            }
+            for stage in self.STAGES
+        }
+
+    def report(self):
+        """Affiche la répartition du temps de calcul par étape"""
+        total = sum(self.stage_time.values())
+        rates = self.effective_rates
+        print("=== Temps par étape ===")
+        for stage, stats in self.timings().items():
+            share = stats['total'] / total * 100 if total > 0 else 0.0
+            print(f"  {stage:<10}: {stats['total']:8.3f} s  {stats['calls']:7d} appels  "
+                  f"{stats['mean'] * 1000:8.3f} ms/appel  ({share:5.1f}%)  {rates[stage]:6.1f} Hz")
+        print(f"  Temps simulé : {self.sim_time:.2f} s")
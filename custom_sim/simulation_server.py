@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import os
+import pickle
+import socket
+import stat
+import struct
+import time
+import numpy as np
+from car import Car
+from car_simulator import CarSimulator
+
+DEFAULT_SOCKET = '/tmp/custom_sim.sock'
+
+# Message : longueur (4 octets, gros-boutiste) puis dict sérialisé avec pickle
+HEADER = struct.Struct('!I')
+
+
+def remove_stale_socket(path):
+    """Supprime le socket laissé par un serveur arrêté sans nettoyage
+
+    Raises:
+        FileExistsError si le chemin n'est pas un socket ou si un serveur y écoute encore
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} existe et n'est pas un socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)  # Plus personne n'écoute : socket orphelin
+        return
+    finally:
+        probe.close()
+    raise FileExistsError(f"Un serveur écoute déjà sur {path}")
+
+
+async def read_message(reader):
+    """Message suivant d'un client, ou None si la connexion est fermée"""
+    try:
+        header = await reader.readexactly(HEADER.size)
+        return pickle.loads(await reader.readexactly(HEADER.unpack(header)[0]))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def validate_step(message):
+    """Vérifie une demande de pas
+
+    Returns:
+        message d'erreur, ou None si la demande est valide
+    """
+    for key in ('linear', 'angular', 'dt'):
+        value = message.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float, np.number)) or not np.isfinite(value):
+            return f"Paramètre {key} invalide: {value!r}"
+    if message['dt'] <= 0:
+        return f"Pas de temps invalide: {message['dt']!r}"
+    substeps = message.get('substeps', 1)
+    if isinstance(substeps, bool) or not isinstance(substeps, (int, np.integer)) or substeps < 0:
+        return f"Nombre de sous-pas invalide: {substeps!r}"
+    return None
+
+
+def write_message(writer, message):
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(HEADER.pack(len(data)) + data)
+
+
+class SimulationServer:
+    def __init__(self, simulator, socket_path=DEFAULT_SOCKET, batch_window=0.002, max_batch=64):
+        """Serveur de simulation partagé (socket Unix, asyncio)
+
+        Un seul CarSimulator (carte chargée, lidar prêt) sert tous les clients,
+        chacun avec sa propre voiture. Les demandes de pas arrivées pendant
+        batch_window secondes (ou dès que tous les clients connectés en ont
+        envoyé une) sont exécutées en un seul lot vectorisé
+        (CarSimulator.step_batch : cinématique, lidar et collisions).
+
+        Args:
+            simulator: CarSimulator en mode headless
+            socket_path: chemin du socket Unix
+            batch_window: délai maximal (s) de regroupement des demandes
+            max_batch: nombre maximal de pas par lot
+        """
+        self.simulator = simulator
+        self.socket_path = socket_path
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.poses = {}      # client -> [x, y, theta]
+        self.pending = []    # (client, demande, futur de la réponse)
+        self.next_client = 0
+        self.batches = 0
+        self.steps = 0
+        self.step_time = 0.0
+        self.start_time = time.time()
+
+    def start_pose(self):
+        return [self.simulator.start_x, self.simulator.start_y, self.simulator.start_theta]
+
+    async def serve(self):
+        """Sert les clients jusqu'à l'annulation de la tâche"""
+        self.request_event = asyncio.Event()
+        self.full_event = asyncio.Event()
+        remove_stale_socket(self.socket_path)
+        server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        batcher = asyncio.ensure_future(self.run_batches())
+        print(f"Serveur de simulation en écoute sur {self.socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def handle_client(self, reader, writer):
+        client = self.next_client
+        self.next_client += 1
+        self.poses[client] = self.start_pose()
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None or not isinstance(message, dict) or message.get('op') == 'close':
+                    break
+                op = message.get('op')
+                if op == 'step':
+                    # Une demande invalide est refusée avant d'entrer dans un lot
+                    error = validate_step(message)
+                    if error is not None:
+                        reply = {'error': error}
+                    else:
+                        future = asyncio.get_running_loop().create_future()
+                        self.pending.append((client, message, future))
+                        self.request_event.set()
+                        if len(self.pending) >= min(self.max_batch, len(self.poses)):
+                            self.full_event.set()
+                        reply = await future
+                elif op == 'reset':
+                    self.poses[client] = self.start_pose()
+                    reply = {'pose': tuple(self.poses[client])}
+                elif op == 'stats':
+                    reply = self.stats()
+                else:
+                    reply = {'error': f"Opération inconnue: {op}"}
+                write_message(writer, reply)
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            del self.poses[client]
+            # Un client de moins : les autres n'ont plus à l'attendre
+            if self.pending and len(self.pending) >= min(self.max_batch, len(self.poses)):
+                self.full_event.set()
+            writer.close()
+
+    async def run_batches(self):
+        """Regroupe les demandes de pas et les exécute par lots"""
+        while True:
+            await self.request_event.wait()
+            try:
+                await asyncio.wait_for(self.full_event.wait(), self.batch_window)
+            except asyncio.TimeoutError:
+                pass
+            batch = self.pending[:self.max_batch]
+            self.pending = self.pending[self.max_batch:]
+            self.full_event.clear()
+            if not self.pending:
+                self.request_event.clear()
+            if batch:
+                try:
+                    self.execute(batch)
+                except Exception as e:
+                    # Une demande fautive ne doit pas bloquer les autres clients du lot
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_result({'error': f"Échec du pas de simulation: {e}"})
+
+    def execute(self, batch):
+        """Exécute un lot de demandes de pas et répond à chacune"""
+        start = time.perf_counter()
+        poses = np.array([self.poses[client] for client, _, _ in batch])
+        x, y, theta, scans, collisions = self.simulator.step_batch(
+            poses[:, 0], poses[:, 1], poses[:, 2],
+            [message['linear'] for _, message, _ in batch],
+            [message['angular'] for _, message, _ in batch],
+            [message['dt'] for _, message, _ in batch],
+            [message.get('substeps', 1) for _, message, _ in batch])
+        self.step_time += time.perf_counter() - start
+        self.batches += 1
+        self.steps += len(batch)
+
+        for i, (client, _, future) in enumerate(batch):
+            if client in self.poses:
+                self.poses[client] = [x[i], y[i], theta[i]]
+            if not future.done():
+                future.set_result({'pose': (float(x[i]), float(y[i]), float(theta[i])),
+                                   'scan': scans[i], 'collision': bool(collisions[i])})
+
+    def stats(self):
+        """Statistiques du serveur (clients, lots, taille moyenne des lots, débit)"""
+        elapsed = time.time() - self.start_time
+        return {
+            'clients': len(self.poses),
+            'batches': self.batches,
+            'steps': self.steps,
+            'mean_batch': self.steps / self.batches if self.batches else 0.0,
+            'steps_per_second': self.steps / elapsed if elapsed > 0 else 0.0,
+            'step_time_ms': self.step_time / self.batches * 1000 if self.batches else 0.0
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(f"{stats['steps']} pas en {stats['batches']} lots ({stats['mean_batch']:.1f} pas par lot, "
+              f"{stats['step_time_ms']:.2f} ms par lot), {stats['steps_per_second']:.0f} pas/s")
+
+
+class SimulationClient:
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        """Client d'un SimulationServer, à utiliser à la place de CarSimulator (reset/step)
+
+        La pose de la voiture du client est disponible dans self.car, comme
+        pour CarSimulator.
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.stream = self.sock.makefile('rb')
+        self.car = Car(0.0, 0.0, 0.0)
+        self.collision_detected = False
+        self.reset()
+
+    def _request(self, message):
+        data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        self.sock.sendall(HEADER.pack(len(data)) + data)
+        header = self.stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ConnectionError("Serveur de simulation déconnecté")
+        return pickle.loads(self.stream.read(HEADER.unpack(header)[0]))
+
+    def _set_pose(self, pose):
+        self.car.x, self.car.y, self.car.theta = pose
+
+    def reset(self):
+        """Remet la voiture du client à la position de départ"""
+        self._set_pose(self._request({'op': 'reset'})['pose'])
+        self.collision_detected = False
+
+    def step(self, cmd_vel_linear, cmd_vel_angular, dt, substeps=1):
+        """Fait avancer la voiture du client (substeps pas de cinématique, puis un scan)
+
+        Returns:
+            scan: données du scan lidar
+            collision: True si collision détectée
+        """
+        reply = self._request({'op': 'step', 'linear': cmd_vel_linear, 'angular': cmd_vel_angular,
+                               'dt': dt, 'substeps': substeps})
+        if 'error' in reply:
+            raise ValueError(reply['error'])
+        self._set_pose(reply['pose'])
+        self.car.cmd_vel_linear = cmd_vel_linear
+        self.car.cmd_vel_angular = cmd_vel_angular
+        self.collision_detected = reply['collision']
+        return reply['scan'], reply['collision']
+
+    def stats(self):
+        """Statistiques du serveur"""
+        return self._request({'op': 'stats'})
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                data = pickle.dumps({'op': 'close'})
+                self.sock.sendall(HEADER.pack(len(data)) + data)
+            except OSError:
+                pass
+            self.stream.close()
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serveur de simulation partagé (socket Unix)")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="chemin du socket Unix")
+    parser.add_argument('--map', default='TRR.bmp', help="image de la carte")
+    parser.add_argument('--yaml', default='map.yaml', help="configuration de la carte")
+    parser.add_argument('--num-beams', type=int, default=360, help="nombre de rayons du lidar")
+    parser.add_argument('--ray-step', type=int, default=1, help="pas des rayons du lidar (pixels)")
+    parser.add_argument('--window', type=float, default=0.002,
+                        help="délai maximal de regroupement des demandes de pas (s)")
+    parser.add_argument('--max-batch', type=int, default=64, help="nombre maximal de pas par lot")
+    args = parser.parse_args()
+
+    simulator = CarSimulator(args.map, args.yaml, headless=True, num_beams=args.num_beams,
+                             ray_step=args.ray_step)
+    server = SimulationServer(simulator, args.socket, batch_window=args.window, max_batch=args.max_batch)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\nServeur arrêté")
+    finally:
+        server.report()
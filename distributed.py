@@ -0,0 +1,338 @@
+import ipaddress
+import os
+import socket
+import threading
+import time
+from collections import deque
+from multiprocessing.managers import BaseManager
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 50000
+# Clé publique : n'est acceptée que sur la boucle locale (voir check_authkey)
+DEFAULT_AUTHKEY = b'f1tenth'
+AUTHKEY_ENV = 'F1TENTH_AUTHKEY'
+
+
+def parse_address(text, default_host=DEFAULT_HOST):
+    """'hôte:port' (ou 'port') -> (hôte, port)"""
+    host, _, port = text.rpartition(':')
+    return (host or default_host, int(port))
+
+
+def resolve_authkey(text=None):
+    """Clé d'authentification : argument, sinon variable F1TENTH_AUTHKEY, sinon clé par défaut"""
+    text = text or os.environ.get(AUTHKEY_ENV)
+    return text.encode() if text else DEFAULT_AUTHKEY
+
+
+def is_loopback(host):
+    """True si host désigne la machine locale par la boucle locale"""
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def check_authkey(address, authkey):
+    """Refuse la clé par défaut hors de la boucle locale
+
+    Les gestionnaires multiprocessing désérialisent (pickle) ce qu'ils reçoivent :
+    avec une clé connue de tous, n'importe qui sur le réseau pourrait exécuter du
+    code sur le coordinateur ou les processus de travail.
+    """
+    if authkey == DEFAULT_AUTHKEY and not is_loopback(address[0]):
+        raise ValueError(f"Adresse {address[0]} hors de la boucle locale : choisir une clé avec "
+                         f"--authkey ou la variable {AUTHKEY_ENV}")
+
+
+class TrialQueue:
+    """File des essais partagée entre le coordinateur et les processus de travail
+
+    Un processus de travail loue un lot d'essais pour lease_timeout secondes,
+    prolongées à chacun de ses signes de vie, et rend les résultats du lot en
+    une fois. Les essais d'une location expirée (processus arrêté, machine
+    injoignable) sont remis en tête de file ; un résultat reçu pour un essai
+    déjà terminé est ignoré.
+    """
+
+    def __init__(self, lease_timeout=30.0):
+        self.lease_timeout = lease_timeout
+        self.condition = threading.Condition()
+        self.pending = deque()      # essais en attente de location
+        self.outstanding = {}       # essais non terminés (en attente ou loués) -> tâche
+        self.leases = {}            # location -> {'worker', 'trials', 'deadline'}
+        self.results = []           # (essai, résultat) pas encore relevés par le coordinateur
+        self.workers = {}
+        self.closed = False
+        self.next_lease = 0
+        self.evaluations = 0
+        self.requeued = 0
+        self.duplicates = 0
+        self.start_time = time.time()
+
+    def _touch(self, worker_id):
+        worker = self.workers[worker_id]
+        worker['last_seen'] = time.time()
+        return worker
+
+    def _expire(self):
+        """Remet en file les essais des locations expirées"""
+        now = time.time()
+        expired = 0
+        for lease_id, lease in list(self.leases.items()):
+            if lease['deadline'] >= now:
+                continue
+            del self.leases[lease_id]
+            trials = [trial_id for trial_id in lease['trials'] if trial_id in self.outstanding]
+            self.pending.extendleft(reversed(trials))
+            expired += len(trials)
+        self.requeued += expired
+        return expired
+
+    # Côté processus de travail (appelé à travers le gestionnaire)
+
+    def register(self, name):
+        """Enregistre un processus de travail
+
+        Returns:
+            (identifiant du processus, durée des locations en secondes)
+        """
+        with self.condition:
+            worker_id = len(self.workers)
+            now = time.time()
+            self.workers[worker_id] = {'name': name, 'registered': now, 'last_seen': now,
+                                       'evaluations': 0, 'finished': False}
+            return worker_id, self.lease_timeout
+
+    def lease(self, worker_id, max_trials):
+        """Loue jusqu'à max_trials essais
+
+        Returns:
+            (location, liste de (essai, tâche)) - liste vide s'il n'y a rien à
+            évaluer pour l'instant - ou None quand la recherche est terminée
+        """
+        with self.condition:
+            worker = self._touch(worker_id)
+            self._expire()
+            trials = []
+            while self.pending and len(trials) < max_trials:
+                trial_id = self.pending.popleft()
+                if trial_id in self.outstanding:
+                    trials.append(trial_id)
+            if not trials:
+                if self.closed:
+                    worker['finished'] = True
+                    return None
+                return None, []
+            lease_id = self.next_lease
+            self.next_lease += 1
+            self.leases[lease_id] = {'worker': worker_id, 'trials': trials,
+                                     'deadline': time.time() + self.lease_timeout}
+            return lease_id, [(trial_id, self.outstanding[trial_id]) for trial_id in trials]
+
+    def heartbeat(self, worker_id, lease_id=None):
+        """Signe de vie : prolonge la location en cours
+
+        Returns:
+            False si la location a expiré (ses essais ont été remis en file)
+        """
+        with self.condition:
+            self._touch(worker_id)
+            lease = self.leases.get(lease_id)
+            if lease is None or lease['worker'] != worker_id:
+                return lease_id is None
+            lease['deadline'] = time.time() + self.lease_timeout
+            return True
+
+    def complete(self, worker_id, lease_id, results):
+        """Rend les résultats d'une location (liste de (essai, résultat))
+
+        Returns:
+            nombre de résultats acceptés
+        """
+        with self.condition:
+            worker = self._touch(worker_id)
+            self.leases.pop(lease_id, None)
+            accepted = 0
+            for trial_id, result in results:
+                if self.outstanding.pop(trial_id, None) is None:
+                    self.duplicates += 1
+                    continue
+                self.results.append((trial_id, result))
+                accepted += 1
+            worker['evaluations'] += accepted
+            self.evaluations += accepted
+            self.condition.notify_all()
+            return accepted
+
+    # Côté coordinateur
+
+    def put(self, trial_id, task):
+        """Ajoute un essai (task : arguments nommés de la fonction d'évaluation)"""
+        with self.condition:
+            self.outstanding[trial_id] = task
+            self.pending.append(trial_id)
+
+    def take_results(self, timeout=None):
+        """Résultats reçus depuis le dernier appel (attend jusqu'à timeout s'il n'y en a pas)"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.results, timeout)
+            self._expire()
+            results, self.results = self.results, []
+            return results
+
+    def close(self):
+        """Plus d'essais à venir : les processus de travail s'arrêtent une fois la file vide"""
+        with self.condition:
+            self.closed = True
+
+    def stats(self):
+        """Statistiques de la grappe (évaluations, débit, locations, processus actifs)"""
+        with self.condition:
+            now = time.time()
+            elapsed = max(now - self.start_time, 1e-9)
+            workers = [{
+                'name': worker['name'],
+                'evaluations': worker['evaluations'],
+                'rate': worker['evaluations'] / max(now - worker['registered'], 1e-9),
+                'alive': not worker['finished'] and now - worker['last_seen'] < self.lease_timeout
+            } for worker in self.workers.values()]
+            return {
+                'evaluations': self.evaluations,
+                'elapsed': elapsed,
+                'rate': self.evaluations / elapsed,
+                'pending': len(self.pending),
+                'leases': len(self.leases),
+                'requeued': self.requeued,
+                'duplicates': self.duplicates,
+                'workers': workers
+            }
+
+
+class _WorkerManager(BaseManager):
+    pass
+
+
+_WorkerManager.register('get_queue')
+
+
+class Coordinator:
+    def __init__(self, address=(DEFAULT_HOST, DEFAULT_PORT), authkey=DEFAULT_AUTHKEY, lease_timeout=30.0):
+        """Coordinateur d'une grappe d'évaluation (TCP, multiprocessing.managers)
+
+        Le coordinateur est le seul à proposer des paramètres et à enregistrer les
+        résultats : il dépose les essais dans une TrialQueue servie dans un thread,
+        que les processus de travail (run_worker, sur cette machine ou d'autres)
+        consultent à travers le réseau.
+
+        Args:
+            address: (hôte, port) d'écoute (port 0 = choisi par le système)
+            authkey: clé partagée avec les processus de travail (la clé par défaut
+                n'est acceptée que sur la boucle locale)
+            lease_timeout: durée (s) d'une location sans signe de vie avant remise en file
+        """
+        check_authkey(address, authkey)
+        self.queue = TrialQueue(lease_timeout)
+        # Classe de gestionnaire propre à chaque coordinateur : register() modifie la
+        # classe, une classe partagée servirait la file du dernier coordinateur créé
+        manager_class = type('_CoordinatorManager', (BaseManager,), {})
+        manager_class.register('get_queue', callable=lambda: self.queue)
+        self.server = manager_class(address=address, authkey=authkey).get_server()
+        self.address = self.server.address
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        try:
+            self.server.serve_forever()
+        except SystemExit:
+            pass  # serve_forever termine par sys.exit() une fois stop_event levé
+
+    def submit(self, trial_id, task):
+        """Dépose un essai (task : arguments nommés de la fonction d'évaluation)"""
+        self.queue.put(trial_id, task)
+
+    def collect(self, timeout=1.0):
+        """Résultats reçus (liste de (essai, résultat)), en attendant au plus timeout secondes"""
+        return self.queue.take_results(timeout)
+
+    def stats(self):
+        return self.queue.stats()
+
+    def report(self):
+        """Affiche le débit de la grappe et de chaque processus de travail"""
+        stats = self.stats()
+        alive = sum(worker['alive'] for worker in stats['workers'])
+        print(f"Grappe: {stats['evaluations']} évaluations en {stats['elapsed']:.0f}s "
+              f"({stats['rate']:.2f} éval/s), {alive}/{len(stats['workers'])} processus actifs, "
+              f"{stats['leases']} locations en cours, {stats['requeued']} essais remis en file")
+        for worker in stats['workers']:
+            print(f"  {worker['name']}: {worker['evaluations']} évaluations "
+                  f"({worker['rate']:.2f} éval/s){'' if worker['alive'] else ' - arrêté'}")
+
+    def shutdown(self, linger=5.0):
+        """Ferme la file et arrête le serveur une fois les processus de travail prévenus
+        (au plus linger secondes)"""
+        self.queue.close()
+        deadline = time.time() + linger
+        while time.time() < deadline and any(worker['alive'] for worker in self.stats()['workers']):
+            time.sleep(0.1)
+        self.server.stop_event.set()
+        self.thread.join(timeout=2.0)
+        self.server.listener.close()
+
+
+def run_worker(address, evaluate, authkey=DEFAULT_AUTHKEY, batch_size=4, poll_interval=0.5,
+               name=None):
+    """Processus de travail : loue des lots d'essais au coordinateur, les évalue et
+    rend les résultats par lot, jusqu'à la fin de la recherche
+
+    Un thread envoie un signe de vie au tiers de la durée des locations, pour que
+    les évaluations longues ne soient pas remises en file.
+
+    Args:
+        address: (hôte, port) du coordinateur
+        evaluate: fonction (**tâche) -> résultat (sérialisable)
+        batch_size: nombre d'essais loués à la fois
+        poll_interval: attente (s) quand la file est vide
+
+    Returns:
+        nombre d'essais évalués
+    """
+    check_authkey(address, authkey)
+    manager = _WorkerManager(address=address, authkey=authkey)
+    manager.connect()
+    queue = manager.get_queue()
+    worker_id, lease_timeout = queue.register(name or f"{socket.gethostname()}:{os.getpid()}")
+
+    current = {'lease': None}
+    stop = threading.Event()
+
+    def heartbeat():
+        try:
+            while not stop.wait(lease_timeout / 3):
+                queue.heartbeat(worker_id, current['lease'])
+        except (EOFError, OSError):
+            pass
+
+    threading.Thread(target=heartbeat, daemon=True).start()
+    evaluated = 0
+    try:
+        while True:
+            leased = queue.lease(worker_id, batch_size)
+            if leased is None:
+                break
+            lease_id, trials = leased
+            if not trials:
+                time.sleep(poll_interval)
+                continue
+            current['lease'] = lease_id
+            results = [(trial_id, evaluate(**task)) for trial_id, task in trials]
+            queue.complete(worker_id, lease_id, results)
+            current['lease'] = None
+            evaluated += len(results)
+    except (EOFError, OSError):
+        print("Coordinateur injoignable - arrêt du processus de travail")
+    finally:
+        stop.set()
+    return evaluated
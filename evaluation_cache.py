@@ -0,0 +1,136 @@
+import atexit
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used);
+"""
+
+_file_hashes = {}
+
+
+def file_hash(path):
+    """Empreinte du contenu d'un fichier (carte, yaml...), recalculée s'il est modifié"""
+    mtime = os.path.getmtime(path)
+    cached = _file_hashes.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            cached = (mtime, hashlib.sha1(f.read()).hexdigest())
+        _file_hashes[path] = cached
+    return cached[1]
+
+
+def source_hash(*objects):
+    """Empreinte du code source des modules définissant les objets (version du contrôleur)"""
+    digest = hashlib.sha1()
+    for obj in objects:
+        module = sys.modules[obj.__module__] if not inspect.ismodule(obj) else obj
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+def _json_scalar(value):
+    """Convertit un scalaire NumPy (np.bool_, np.integer, np.floating) en type Python
+    de même nature pour json.dumps"""
+    return value.item() if hasattr(value, 'item') else float(value)
+
+
+class EvaluationCache:
+    def __init__(self, path='evaluation_cache.db', max_entries=10000, resolution=1e-4):
+        """Cache persistant des évaluations, adressé par leur contenu
+
+        La clé d'une évaluation est l'empreinte des paramètres (arrondis à
+        `resolution`) et du contexte de simulation (empreinte de la carte, pas
+        de temps, intégrateur, version du contrôleur...). Une évaluation déjà
+        faite dans les mêmes conditions n'est pas simulée à nouveau. Au-delà de
+        max_entries, les entrées les moins récemment utilisées sont supprimées.
+
+        Args:
+            path: fichier de la base SQLite
+            max_entries: nombre maximal d'entrées conservées
+            resolution: pas de quantification des paramètres
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.resolution = resolution
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        atexit.register(self.close)
+
+    def key(self, params, context):
+        """Clé d'une évaluation (paramètres quantifiés + contexte)"""
+        quantized = {name: int(round(float(value) / self.resolution)) for name, value in params.items()}
+        description = json.dumps({'params': quantized, 'context': context}, sort_keys=True)
+        return hashlib.sha1(description.encode()).hexdigest()
+
+    def get(self, params, context):
+        """Résultat mis en cache, ou None"""
+        key = self.key(params, context)
+        row = self.conn.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.conn:
+            self.conn.execute('UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?',
+                              (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, params, context, value):
+        """Met en cache le résultat d'une évaluation (dict sérialisable en JSON)"""
+        key = self.key(params, context)
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO entries (key, value, last_used) VALUES (?, ?, ?)',
+                              (key, json.dumps(value, default=_json_scalar), time.time()))
+            # Éviction LRU au-delà de max_entries
+            cursor = self.conn.execute(
+                'DELETE FROM entries WHERE key IN '
+                '(SELECT key FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,))
+        self.stores += 1
+        self.evictions += max(cursor.rowcount, 0)
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def stats(self):
+        """Statistiques de la session (succès, échecs, écritures, évictions)"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': len(self)
+        }
+
+    def report(self):
+        """Affiche les statistiques du cache"""
+        stats = self.stats()
+        print(f"Cache des évaluations: {stats['hits']} succès, {stats['misses']} échecs "
+              f"({stats['hit_rate'] * 100:.0f}%), {stats['stores']} écritures, "
+              f"{stats['evictions']} évictions, {stats['entries']} entrées")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,207 @@
+import argparse
+import os
+import numpy as np
+from navigation import SimpleAutonomousController
+from async_controller import AsyncController
+from shared_channel import SimulationChannel
+from termination_rules import TerminationMonitor
+from distributed import (run_worker, parse_address, resolve_authkey, check_authkey,
+                         DEFAULT_AUTHKEY, AUTHKEY_ENV)
+
+# Point d'entrée sans affichage des processus de travail : seuls numpy et le
+# contrôleur sont chargés au démarrage (ni pygame, ni matplotlib, ni scipy) ;
+# gym est importé à la création de l'environnement.
+
+# Carte et position initiale utilisées pour l'optimisation
+MAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maps', 'example_map')
+INITIAL_POSE = np.array([[0.7, 0.0, 1.37079632679]], dtype=np.float64)
+
+def observation_from_channel(observation):
+    """Observation f110 (entrée de plan()) reconstruite à partir du canal partagé"""
+    lap_time, lap_count = observation['extra']
+    x, y, theta = observation['pose']
+    return {
+        'scans': observation['scan'][None, :],
+        'poses_x': [x], 'poses_y': [y], 'poses_theta': [theta],
+        'lap_times': [lap_time], 'lap_counts': [lap_count]
+    }
+
+def publish_observation(channel, obs, sim_time):
+    """Publie une observation f110 dans un canal partagé (scan, pose, temps et tour)"""
+    return channel.publish_observation(
+        obs['scans'][0], (obs['poses_x'][0], obs['poses_y'][0], obs['poses_theta'][0]), sim_time,
+        extra=(obs['lap_times'][0], obs['lap_counts'][0]))
+
+def test_parameters(env, initial_pose, params, display=None, profiler=None, recorder=None,
+                    async_mode=None, compute_latency=0.0, max_time=120.0, termination=None,
+                    channel=None):
+    """Teste un jeu de paramètres spécifique sur un seul tour
+
+    Args:
+        max_time: temps simulé maximal du test (s)
+        termination: TerminationMonitor évalué à chaque pas (par défaut, arrêt après
+            5 s d'immobilité). La raison d'un arrêt est retournée dans 'abort_reason'.
+        profiler: LatencyProfiler optionnel mesurant chaque appel à plan()
+        recorder: ScanRecorder optionnel enregistrant les scans pour un rejeu hors ligne
+        async_mode: None (synchrone), 'thread', 'process' ou 'shared' (processus
+            séparé, observations en mémoire partagée) pour exécuter le contrôleur
+            en parallèle de la simulation
+        compute_latency: latence de calcul simulée du contrôleur (s) en mode asynchrone
+        channel: SimulationChannel dans lequel chaque observation est publiée (créé
+            pour le test en mode 'shared' si None)
+    """
+    # Réinitialisation de l'environnement
+    obs_tuple = env.reset(initial_pose)
+    obs = obs_tuple[0] if isinstance(obs_tuple, tuple) else obs_tuple
+    
+    # Canal partagé du mode 'shared' (dimensionné sur le scan)
+    own_channel = async_mode == 'shared' and channel is None
+    if own_channel:
+        channel = SimulationChannel(obs['scans'][0].shape, action_shape=(1, 2), extra_size=2)
+    
+    # Initialisation du contrôleur avec les paramètres
+    if async_mode is not None:
+        controller = AsyncController(SimpleAutonomousController, params, 'plan',
+                                     mode=async_mode, latency=compute_latency,
+                                     default_command=np.array([[0.0, 0.0]]),
+                                     profiler=profiler, channel=channel,
+                                     decode=observation_from_channel)
+    else:
+        controller = SimpleAutonomousController(**params)
+        if profiler is not None:
+            profiler.attach(controller, 'plan')
+    
+    # Variables de suivi
+    total_time = 0.0
+    collision = False
+    tour_complete = False
+    temps_tour = 0.0
+    distance_parcourue = 0.0
+    previous_pose = (obs['poses_x'][0], obs['poses_y'][0])
+    
+    # Règles d'arrêt anticipé (immobilité, absence de progression, ...)
+    if termination is None:
+        termination = TerminationMonitor()
+    termination.reset(obs['poses_x'][0], obs['poses_y'][0], obs['poses_theta'][0])
+    abort_reason = None
+    
+    # Pas de temps fixe
+    dt = 0.01
+    
+    while True:
+        if recorder is not None:
+            recorder.record(obs['scans'][0])
+        
+        if channel is not None:
+            publish_observation(channel, obs, total_time)
+        
+        # Obtenir les actions du contrôleur
+        if async_mode is not None:
+            controller.submit(obs, total_time)
+            actions = controller.get_command(total_time)
+        else:
+            actions = controller.plan(obs)
+        
+        # Faire un pas de simulation
+        obs_tuple, _, done, _ = env.step(actions)
+        obs = obs_tuple[0] if isinstance(obs_tuple, tuple) else obs_tuple
+        
+        # Arrêter si une règle d'arrêt se déclenche (immobile depuis 5 secondes, ...)
+        abort_reason = termination.update(total_time + dt, obs['poses_x'][0],
+                                          obs['poses_y'][0], obs['poses_theta'][0])
+        if abort_reason is not None:
+            break
+        
+        # Mettre à jour les métriques (distance intégrée sur les positions, comme
+        # dans LapTimeBoundRule qui la compare à la longueur du meilleur tour)
+        total_time += dt
+        x, y = obs['poses_x'][0], obs['poses_y'][0]
+        distance_parcourue += float(np.hypot(x - previous_pose[0], y - previous_pose[1]))
+        previous_pose = (x, y)
+        
+        # Mettre à jour l'affichage si disponible
+        if display is not None:
+            display.update(actions[0][1], actions[0][0], obs)
+            env.render(mode='human_fast')
+        
+        # Vérifier si le tour est complet
+        if int(obs['lap_counts'][0]) > 0:
+            tour_complete = True
+            temps_tour = total_time
+            break
+        
+        # Vérifier collision
+        if done:
+            collision = bool(obs['collisions'][0])
+            break
+        
+        # Limite de temps de sécurité
+        if total_time > max_time:
+            abort_reason = 'timeout'
+            break
+    
+    results = {
+        'collision': collision,
+        'total_time': total_time,
+        'distance': distance_parcourue,
+        'tour_complete': tour_complete,
+        'temps_tour': temps_tour,
+        'immobile': abort_reason == 'immobile',
+        'abort_reason': abort_reason
+    }
+    
+    if async_mode is not None:
+        controller.close()
+        stats = controller.stats()
+        results['stale_steps'] = stats['stale_steps']
+        results['dropped_frames'] = stats['dropped_frames']
+    if own_channel:
+        channel.release()
+    
+    return results
+
+def make_env(map_path=MAP_PATH):
+    """Crée l'environnement f110_gym (gym n'est importé qu'ici : il est long à charger)"""
+    import gym
+    return gym.make('f110_gym:f110-v0',
+                    map=map_path,
+                    map_ext='.png',
+                    num_agents=1,
+                    timestep=0.01)
+
+# Environnement propre à chaque processus de travail (créé une seule fois)
+_worker_env = None
+
+def init_worker(map_path):
+    """Initialise un processus de travail : crée son environnement sans affichage"""
+    global _worker_env
+    _worker_env = make_env(map_path)
+
+def evaluate_in_worker(params, max_time=120.0, termination=None):
+    """Évalue un jeu de paramètres dans l'environnement du processus de travail"""
+    return test_parameters(_worker_env, INITIAL_POSE, params, max_time=max_time,
+                           termination=termination)
+
+def run_worker_node(address, authkey=DEFAULT_AUTHKEY, batch_size=4, map_path=MAP_PATH):
+    """Processus de travail d'une grappe : évalue sans affichage les tests loués au coordinateur"""
+    init_worker(map_path)
+    print(f"Connexion au coordinateur {address[0]}:{address[1]}")
+    evaluated = run_worker(address, evaluate_in_worker, authkey=authkey, batch_size=batch_size)
+    print(f"{evaluated} tests évalués")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Processus de travail sans affichage d'une grappe")
+    parser.add_argument('--connect', metavar='HÔTE:PORT', required=True, help="adresse du coordinateur")
+    parser.add_argument('--authkey',
+                        help=f"clé partagée avec le coordinateur (par défaut ${AUTHKEY_ENV} ; "
+                             "obligatoire hors de la boucle locale)")
+    parser.add_argument('--batch', type=int, default=4, help="nombre de tests loués à la fois")
+    parser.add_argument('--map', default=MAP_PATH, help="carte f110 (sans extension)")
+    args = parser.parse_args()
+    address = parse_address(args.connect)
+    authkey = resolve_authkey(args.authkey)
+    try:
+        check_authkey(address, authkey)
+    except ValueError as e:
+        parser.error(str(e))
+    run_worker_node(address, authkey, args.batch, args.map)
@@ -0,0 +1,155 @@
+import time
+import numpy as np
+
+
+class LatencyProfiler:
+    """Mesure la latence de chaque appel d'un navigateur et vérifie le budget temps réel
+
+    Le profileur enveloppe n'importe quelle méthode de contrôle (`plan` pour les
+    contrôleurs f110, `compute_command` pour ceux de custom_sim) et enregistre la
+    durée de chaque appel. Un appel qui dépasse `budget` compte comme une
+    échéance manquée.
+    """
+
+    def __init__(self, budget=0.01, name=None):
+        """
+        Args:
+            budget: budget de calcul par appel en secondes (0.01 = 100 Hz)
+            name: nom affiché dans les rapports
+        """
+        self.budget = budget
+        self.name = name
+        self.latencies = []
+        self.deadline_misses = 0
+
+    def wrap(self, func):
+        """Retourne une version de `func` qui mesure chaque appel"""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.record(time.perf_counter() - start)
+            return result
+        timed.__wrapped__ = func
+        return timed
+
+    def attach(self, navigator, method=None):
+        """Remplace la méthode de contrôle du navigateur par sa version mesurée
+
+        Args:
+            navigator: instance de navigateur
+            method: nom de la méthode ('plan' ou 'compute_command' par défaut)
+        """
+        if method is None:
+            method = 'plan' if hasattr(navigator, 'plan') else 'compute_command'
+        if self.name is None:
+            self.name = type(navigator).__name__
+        setattr(navigator, method, self.wrap(getattr(navigator, method)))
+        return navigator
+
+    def record(self, latency):
+        """Ajoute une mesure de latence (secondes)"""
+        self.latencies.append(latency)
+        if latency > self.budget:
+            self.deadline_misses += 1
+
+    def reset(self):
+        """Efface toutes les mesures"""
+        self.latencies = []
+        self.deadline_misses = 0
+
+    def summary(self):
+        """Retourne les statistiques de latence (en secondes)"""
+        if not self.latencies:
+            return {
+                'calls': 0, 'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0,
+                'deadline_misses': 0, 'miss_rate': 0.0, 'budget': self.budget
+            }
+        latencies = np.asarray(self.latencies)
+        return {
+            'calls': len(latencies),
+            'mean': float(np.mean(latencies)),
+            'p50': float(np.percentile(latencies, 50)),
+            'p99': float(np.percentile(latencies, 99)),
+            'max': float(np.max(latencies)),
+            'deadline_misses': self.deadline_misses,
+            'miss_rate': self.deadline_misses / len(latencies),
+            'budget': self.budget
+        }
+
+    def histogram(self, bins=50):
+        """Calcule l'histogramme des latences en millisecondes
+
+        Returns:
+            counts, edges: comme np.histogram
+        """
+        latencies_ms = np.asarray(self.latencies) * 1000.0
+        if len(latencies_ms) == 0:
+            return np.zeros(bins, dtype=int), np.linspace(0.0, self.budget * 1000.0, bins + 1)
+        return np.histogram(latencies_ms, bins=bins)
+
+    def dump_histogram(self, path, bins=50):
+        """Écrit l'histogramme dans un fichier CSV (ou PNG si l'extension est .png)"""
+        counts, edges = self.histogram(bins)
+        if path.endswith('.png'):
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(10, 5))
+            plt.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+            plt.axvline(self.budget * 1000.0, color='red', linestyle='--', label='Budget')
+            plt.title(f"Latence de {self.name or 'navigateur'}")
+            plt.xlabel('Latence (ms)')
+            plt.ylabel("Nombre d'appels")
+            plt.legend()
+            plt.grid(True)
+            plt.savefig(path)
+            plt.close()
+            return
+        with open(path, 'w') as f:
+            f.write('bin_start_ms,bin_end_ms,count\n')
+            for start, end, count in zip(edges[:-1], edges[1:], counts):
+                f.write(f"{start:.4f},{end:.4f},{count}\n")
+
+    def report(self):
+        """Affiche un résumé des latences"""
+        stats = self.summary()
+        print(f"=== Latence {self.name or ''} ===")
+        print(f"  Appels          : {stats['calls']}")
+        print(f"  Moyenne         : {stats['mean'] * 1000:.3f} ms")
+        print(f"  p50             : {stats['p50'] * 1000:.3f} ms")
+        print(f"  p99             : {stats['p99'] * 1000:.3f} ms")
+        print(f"  Max             : {stats['max'] * 1000:.3f} ms")
+        print(f"  Budget          : {stats['budget'] * 1000:.3f} ms")
+        print(f"  Échéances ratées: {stats['deadline_misses']} ({stats['miss_rate'] * 100:.1f}%)")
+
+
+class ScanRecorder:
+    """Enregistre un flux de scans lidar pour le rejouer hors ligne
+
+    Les scans sont stockés sous forme de distances, avec la géométrie du
+    lidar (angle du premier rayon et incrément) pour pouvoir les rééchantillonner
+    vers le format attendu par chaque navigateur.
+    """
+
+    def __init__(self, angle_min=-2.35, angle_max=2.35):
+        """
+        Args:
+            angle_min: angle du premier rayon (rad, 0 = devant)
+            angle_max: angle du dernier rayon (rad)
+        """
+        self.angle_min = angle_min
+        self.angle_max = angle_max
+        self.scans = []
+
+    def record(self, ranges):
+        """Ajoute un scan de distances (format f110)"""
+        self.scans.append(np.array(ranges, dtype=np.float32))
+
+    def record_points(self, scan):
+        """Ajoute un scan de points (x, y) au format custom_sim"""
+        self.scans.append(np.hypot(scan[:, 0], scan[:, 1]).astype(np.float32))
+
+    def save(self, path):
+        """Sauvegarde le flux dans un fichier .npz"""
+        np.savez_compressed(path,
+                            ranges=np.stack(self.scans),
+                            angle_min=self.angle_min,
+                            angle_max=self.angle_max)
@@ -1,265 +1,421 @@
-import gym
-import numpy as np
+import argparse
 from navigation import SimpleAutonomousController
-import pygame
 import os
-from f110_gym.envs.base_classes import Integrator  # Ajout de l'import pour RK4
-import csv
-from datetime import datetime
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import Process
 from parameter_tester import ParameterTester
+from successive_halving import SuccessiveHalving
+from termination_rules import TerminationMonitor, default_rules
+from multi_fidelity import (MultiFidelityPipeline, FidelityModel, init_low_fidelity_worker,
+                            evaluate_low_fidelity, low_fidelity_config)
+from evaluation_cache import EvaluationCache, file_hash, source_hash
+from scoring import SCORERS
+from distributed import (Coordinator, parse_address, resolve_authkey, check_authkey,
+                         DEFAULT_AUTHKEY, DEFAULT_HOST, DEFAULT_PORT, AUTHKEY_ENV)
+from headless import (MAP_PATH, INITIAL_POSE, make_env, test_parameters, init_worker,
+                      evaluate_in_worker, run_worker_node)
 
-class InfoDisplay:
-    def __init__(self):
-        pygame.init()
-        # Couleurs modernes
-        self.COLORS = {
-            'background': (40, 44, 52),      # Fond sombre
-            'panel': (30, 33, 39),           # Panneaux plus sombres
-            'text': (220, 223, 228),         # Texte clair
-            'highlight': (97, 175, 239),     # Bleu clair pour les valeurs importantes
-            'warning': (224, 108, 117),      # Rouge pour les alertes
-            'success': (152, 195, 121),      # Vert pour les succès
-            'separator': (55, 59, 69)        # Lignes de séparation
-        }
-        
-        # Configuration de la fenêtre
-        self.screen = pygame.display.set_mode((1000, 500))
-        pygame.display.set_caption("F1TENTH Telemetry")
-        os.environ['SDL_VIDEO_WINDOW_POS'] = "820,100"
-        
-        # Chargement des polices
-        try:
-            self.title_font = pygame.font.SysFont('Arial', 36, bold=True)
-            self.main_font = pygame.font.SysFont('Arial', 28)
-            self.small_font = pygame.font.SysFont('Arial', 20)
-        except:
-            self.title_font = pygame.font.Font(None, 36)
-            self.main_font = pygame.font.Font(None, 28)
-            self.small_font = pygame.font.Font(None, 20)
-        
-        # Zone pour le scan laser (300x300 pixels)
-        self.scan_surface = pygame.Surface((300, 300))
-        self.scan_center = (150, 150)
-        self.scan_scale = 30
-        self.fov = None
-        
-        # Variables pour le suivi des tours
-        self.lap_times_history = []
-        self.current_lap_count = 0
-        self.best_lap_time = float('inf')
+# Simulateur basse fidélité du criblage (custom_sim, imports locaux), ajouté en fin de
+# chemin pour que les modules de la racine (dont main.py) restent prioritaires
+CUSTOM_SIM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'custom_sim')
+if CUSTOM_SIM_DIR not in sys.path:
+    sys.path.append(CUSTOM_SIM_DIR)
 
-    def draw_panel(self, surface, rect, title=None):
-        """Dessine un panneau avec titre et bordure"""
-        pygame.draw.rect(surface, self.COLORS['panel'], rect)
-        pygame.draw.rect(surface, self.COLORS['separator'], rect, 1)
-        if title:
-            title_surf = self.title_font.render(title, True, self.COLORS['highlight'])
-            surface.blit(title_surf, (rect[0] + 10, rect[1] + 5))
+def simulation_config(map_path=MAP_PATH):
+    """Configuration de simulation associée aux résultats enregistrés"""
+    return {'simulator': 'f110_gym', 'map': os.path.basename(map_path), 'timestep': 0.01}
 
-    def draw_scan(self, scan_data, obs):
-        """Dessine les données du scan laser avec un style amélioré"""
-        self.scan_surface.fill(self.COLORS['panel'])
-        
-        if scan_data is not None and len(scan_data) > 0:
-            if self.fov is None and 'lidar_param' in obs:
-                self.fov = obs['lidar_param'][1]
-            half_fov = self.fov / 2 if self.fov is not None else 2.356194490192345
-            angles = np.linspace(-half_fov, half_fov, len(scan_data))
-            
-            # Grille de fond
-            for i in range(0, 301, 50):
-                pygame.draw.circle(self.scan_surface, self.COLORS['separator'], self.scan_center, i, 1)
-            pygame.draw.line(self.scan_surface, self.COLORS['separator'], 
-                           (0, self.scan_center[1]), (300, self.scan_center[1]), 1)
-            pygame.draw.line(self.scan_surface, self.COLORS['separator'], 
-                           (self.scan_center[0], 0), (self.scan_center[0], 300), 1)
-            
-            # Points du scan
-            for i, distance in enumerate(scan_data):
-                if not np.isinf(distance) and distance < 10:
-                    x = distance * np.cos(angles[i])
-                    y = distance * np.sin(angles[i])
-                    screen_x = int(self.scan_center[0] + x * self.scan_scale)
-                    screen_y = int(self.scan_center[1] - y * self.scan_scale)
-                    if 0 <= screen_x < 300 and 0 <= screen_y < 300:
-                        pygame.draw.circle(self.scan_surface, self.COLORS['highlight'], 
-                                        (screen_x, screen_y), 2)
-        
-        # Robot au centre
-        pygame.draw.circle(self.scan_surface, self.COLORS['success'], self.scan_center, 5)
+def evaluation_context(map_path=MAP_PATH, max_time=120.0, early_stop=False, async_mode=None,
+                       compute_latency=0.0):
+    """Conditions d'une évaluation : avec les paramètres, elles forment la clé du cache"""
+    return {
+        'simulator': 'f110_gym',
+        'map': file_hash(map_path + '.png'),
+        'map_yaml': file_hash(map_path + '.yaml'),
+        'timestep': 0.01,
+        'integrator': 'RK4',  # Intégrateur par défaut de f110_gym
+        'distance': 'pose',  # distance intégrée sur les positions (et non la vitesse commandée)
+        'controller': source_hash(SimpleAutonomousController),
+        'max_time': max_time,
+        'early_stop': early_stop,
+        'async_mode': async_mode,
+        'compute_latency': compute_latency
+    }
 
-    def update(self, speed, steer, obs):
-        """Met à jour l'affichage avec un design moderne"""
-        # Fond principal
-        self.screen.fill(self.COLORS['background'])
-        
-        # Vérifier collision
-        is_colliding = False
-        if obs['collisions'] is not None and len(obs['collisions']) > 0:
-            is_colliding = bool(obs['collisions'][0])
-        
-        # Panneau principal (gauche)
-        main_panel = pygame.Rect(20, 20, 460, 460)
-        self.draw_panel(self.screen, main_panel, "État du Véhicule")
-        
-        # Informations de contrôle
-        y_offset = 70
-        line_spacing = 40
-        
-        # Vitesse et direction avec des barres de progression
-        speed_text = self.main_font.render(f"Vitesse: {speed:.2f} m/s", True, self.COLORS['text'])
-        steer_text = self.main_font.render(f"Direction: {steer:.2f} rad", True, self.COLORS['text'])
-        self.screen.blit(speed_text, (40, y_offset))
-        self.screen.blit(steer_text, (40, y_offset + line_spacing))
-        
-        # Barres de progression
-        speed_bar_rect = pygame.Rect(40, y_offset + 30, 400 * (speed/3.0), 5)
-        steer_bar_rect = pygame.Rect(40, y_offset + line_spacing + 30, 400 * (abs(steer)/0.4), 5)
-        pygame.draw.rect(self.screen, self.COLORS['highlight'], speed_bar_rect)
-        pygame.draw.rect(self.screen, self.COLORS['highlight'], steer_bar_rect)
-        
-        # Informations de tour
-        y_offset += 3 * line_spacing
-        lap_time = obs['lap_times'][0] if 'lap_times' in obs and len(obs['lap_times']) > 0 else 0.0
-        lap_count = int(obs['lap_counts'][0]) if 'lap_counts' in obs and len(obs['lap_counts']) > 0 else 0
-        
-        if lap_count > self.current_lap_count:
-            if self.current_lap_count > 0:
-                self.lap_times_history.append(lap_time)
-                if lap_time < self.best_lap_time:
-                    self.best_lap_time = lap_time
-            self.current_lap_count = lap_count
-        
-        # Affichage des temps
-        lap_time_text = self.main_font.render(f"Temps tour: {lap_time:.2f} s", True, self.COLORS['text'])
-        lap_count_text = self.main_font.render(f"Tour: {lap_count}", True, self.COLORS['text'])
-        self.screen.blit(lap_time_text, (40, y_offset))
-        self.screen.blit(lap_count_text, (40, y_offset + line_spacing))
-        
-        if self.best_lap_time < float('inf'):
-            best_time_text = self.main_font.render(f"Meilleur tour: {self.best_lap_time:.2f} s", 
-                                                 True, self.COLORS['success'])
-            self.screen.blit(best_time_text, (40, y_offset + 2 * line_spacing))
-        
-        # Panneau de scan (droite)
-        scan_panel = pygame.Rect(500, 20, 480, 460)
-        self.draw_panel(self.screen, scan_panel, "Scan LIDAR")
-        
-        # Mise à jour et affichage du scan
-        if 'scans' in obs and obs['scans'] is not None and len(obs['scans']) > 0:
-            self.draw_scan(obs['scans'][0], obs)
-        self.screen.blit(self.scan_surface, (590, 100))
-        
-        # Affichage des alertes
-        if is_colliding:
-            warning_text = self.title_font.render("! COLLISION !", True, self.COLORS['warning'])
-            text_rect = warning_text.get_rect(center=(250, 400))
-            self.screen.blit(warning_text, text_rect)
-        
-        pygame.display.flip()
+def cacheable(results):
+    """Un arrêt par borne du temps au tour dépend du meilleur tour du moment : pas de mise en cache"""
+    return results['abort_reason'] != 'lap_time_bound'
 
-    def __del__(self):
-        pygame.quit()
+def make_termination(tester, early_stop):
+    """Règles d'arrêt d'un test : immobilité seule, ou toutes les règles d'arrêt
+    anticipé avec le meilleur tour connu comme borne du temps au tour"""
+    if not early_stop:
+        return TerminationMonitor()
+    best_lap_time, track_length = tester.best_lap()
+    return TerminationMonitor(default_rules(best_lap_time, track_length))
 
-def test_parameters(env, initial_pose, params, display=None):
-    """Teste un jeu de paramètres spécifique sur un seul tour"""
-    # Initialisation du contrôleur avec les paramètres
-    controller = SimpleAutonomousController(**params)
+def run_trials(tester, submit, collect, capacity, rate, cache=None, context=None, early_stop=False):
+    """Boucle ask/tell commune à run_parallel et run_coordinator
     
-    # Réinitialisation de l'environnement
-    obs_tuple = env.reset(initial_pose)
-    obs = obs_tuple[0] if isinstance(obs_tuple, tuple) else obs_tuple
+    Les propositions du testeur sont lues dans le cache ou envoyées à submit
+    jusqu'à capacity évaluations en cours ; les résultats rendus par collect
+    sont transmis au testeur dans leur ordre d'arrivée. Avec CMA-ES, chaque
+    génération est envoyée entière dès que la précédente est terminée.
     
-    # Variables de suivi
-    total_time = 0.0
-    collision = False
-    tour_complete = False
-    temps_tour = 0.0
-    distance_parcourue = 0.0
+    Args:
+        submit: fonction (trial_id, params, termination) qui lance une évaluation
+        collect: fonction () -> liste de (trial_id, résultats) des évaluations
+            terminées (attend qu'au moins une se termine ou un délai)
+        capacity: nombre d'évaluations en cours à maintenir
+        rate: fonction (nombre de résultats reçus) -> débit affiché
+    """
+    max_tests = tester.get_total_combinations()
+    tested = len(tester.tested_params)
+    completed = 0
+    submitted = tested
+    pending = {}
     
-    # Variables pour détecter l'immobilité
-    derniere_position = (obs['poses_x'][0], obs['poses_y'][0])
-    temps_immobile = 0.0
-    seuil_mouvement = 0.01  # 1cm de déplacement minimum
+    def record(trial_id, results, cached=False):
+        """Transmet un résultat au testeur et affiche la progression"""
+        nonlocal tested, completed
+        tester.tell(
+            trial_id,
+            total_time=results['total_time'],
+            distance=results['distance'],
+            collision=results['collision'],
+            tour_complete=results['tour_complete'],
+            temps_tour=results['temps_tour'],
+            abort_reason=results['abort_reason']
+        )
+        tested += 1
+        completed += 1
+        
+        status = "collision" if results['collision'] else \
+            f"tour en {results['temps_tour']:.2f}s" if results['tour_complete'] else \
+            f"arrêt ({results['abort_reason']})" if results['abort_reason'] else "tour incomplet"
+        if cached:
+            status += " (cache)"
+        print(f"Test {tested}/{max_tests}: {status}, distance {results['distance']:.2f}m "
+              f"- meilleur score {tester.best_score:.2f} - {rate(completed)}")
     
-    # Pas de temps fixe
-    dt = 0.01
+    def refill():
+        """Garder capacity évaluations en cours"""
+        nonlocal submitted
+        while True:
+            if tester.cmaes is not None:
+                # CMA-ES : la génération entière est envoyée d'un coup
+                trials = tester.ask_generation(max_trials=max_tests - submitted) \
+                    if max_tests > submitted else []
+            else:
+                free = min(capacity - len(pending), max_tests - submitted)
+                trials = tester.ask_batch(free) if free > 0 else []
+            cached = 0
+            for trial_id, params in trials:
+                submitted += 1
+                results = cache.get(params, context) if cache is not None else None
+                if results is not None:
+                    record(trial_id, results, cached=True)
+                    cached += 1
+                    continue
+                pending[trial_id] = params
+                submit(trial_id, params, make_termination(tester, early_stop))
+            # Les résultats lus dans le cache libèrent des places : nouvelles propositions
+            if cached == 0:
+                return
     
-    while True:
-        # Obtenir les actions du contrôleur
-        actions = controller.plan(obs)
-        
-        # Faire un pas de simulation
-        obs_tuple, _, done, _ = env.step(actions)
-        obs = obs_tuple[0] if isinstance(obs_tuple, tuple) else obs_tuple
+    refill()
+    while pending:
+        for trial_id, results in collect():
+            params = pending.pop(trial_id)
+            if cache is not None and cacheable(results):
+                cache.put(params, context, results)
+            record(trial_id, results)
+        refill()
+
+def run_parallel(num_workers, map_path=MAP_PATH, strategy='local', early_stop=False, cache=None,
+                 scoring='lap_time'):
+    """Optimisation sans affichage avec un pool de processus de travail
+    
+    Chaque processus possède son propre environnement. Le processus parent est le
+    seul à proposer des paramètres, écrire les résultats et mettre à jour les
+    meilleurs paramètres ; les résultats sont traités dans leur ordre d'arrivée
+    (interface ask/tell de ParameterTester, voir run_trials), sans attendre les
+    processus lents. Les processus libres sont réalimentés par un lot de
+    propositions (ask_batch). Les propositions déjà évaluées dans les mêmes
+    conditions sont lues dans le cache.
+    """
+    tester = ParameterTester(strategy=strategy, config=simulation_config(map_path), scoring=scoring)
+    print(f"Début de l'optimisation parallèle - {tester.get_total_combinations()} tests prévus, "
+          f"{num_workers} processus")
+    print(f"Tests déjà effectués: {len(tester.tested_params)}")
+    print("-" * 50)
+    
+    start_time = time.time()
+    futures = {}
+    context = evaluation_context(map_path, 120.0, early_stop) if cache is not None else None
+    
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker,
+                             initargs=(map_path,)) as executor:
+        def submit(trial_id, params, termination):
+            futures[executor.submit(evaluate_in_worker, params, 120.0, termination)] = trial_id
         
-        # Vérifier si le véhicule est immobile
-        position_actuelle = (obs['poses_x'][0], obs['poses_y'][0])
-        deplacement = np.sqrt((position_actuelle[0] - derniere_position[0])**2 + 
-                            (position_actuelle[1] - derniere_position[1])**2)
+        def collect():
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            return [(futures.pop(future), future.result()) for future in done]
         
-        if deplacement < seuil_mouvement:
-            temps_immobile += dt
+        try:
+            run_trials(tester, submit, collect, num_workers,
+                       lambda completed: f"{completed / (time.time() - start_time) * 3600:.0f} tests/h",
+                       cache=cache, context=context, early_stop=early_stop)
+        except KeyboardInterrupt:
+            print("\nTests interrompus par l'utilisateur")
+            for future in futures:
+                future.cancel()
+    
+    if tester.best_params is not None:
+        print("\nMeilleurs paramètres trouvés:")
+        for name, value in tester.best_params.items():
+            print(f"  {name}: {value:.3f}")
+        print(f"Score: {tester.best_score:.2f}")
+    if cache is not None:
+        cache.report()
+    if tester.abort_counts:
+        print("Tests interrompus: " + ", ".join(f"{reason} {count}"
+                                               for reason, count in sorted(tester.abort_counts.items())))
+    if tester.bayesian is not None and tester.bayesian.fit_count:
+        print(f"Ajustement du modèle GP: {tester.bayesian.fit_count} fois, "
+              f"{tester.bayesian.total_fit_time / tester.bayesian.fit_count * 1000:.0f} ms en moyenne")
+
+def run_coordinator(address, authkey=DEFAULT_AUTHKEY, map_path=MAP_PATH, strategy='local',
+                    early_stop=False, cache=None, scoring='lap_time', queue_depth=16,
+                    local_workers=0, batch_size=4, lease_timeout=30.0, report_interval=30.0):
+    """Optimisation répartie : le processus courant coordonne, des processus de
+    travail (run_worker_node, sur cette machine ou d'autres) évaluent
+    
+    Comme run_parallel, le coordinateur est le seul à proposer des paramètres et
+    à écrire les résultats (voir run_trials) ; il garde queue_depth tests en
+    file ou en cours d'évaluation. Les processus de travail louent les tests par
+    lots de batch_size et rendent leurs résultats par lot ; les tests d'un
+    processus sans signe de vie depuis lease_timeout secondes sont remis en file.
+    
+    Args:
+        address: (hôte, port) d'écoute du coordinateur
+        local_workers: nombre de processus de travail lancés sur cette machine
+    """
+    tester = ParameterTester(strategy=strategy, config=simulation_config(map_path), scoring=scoring)
+    coordinator = Coordinator(address, authkey, lease_timeout)
+    host, port = coordinator.address
+    print(f"Coordinateur en écoute sur {host}:{port} - {tester.get_total_combinations()} tests prévus")
+    print(f"Tests déjà effectués: {len(tester.tested_params)}")
+    print("-" * 50)
+    
+    workers = [Process(target=run_worker_node, args=(('127.0.0.1', port), authkey, batch_size, map_path),
+                       daemon=True)
+               for _ in range(local_workers)]
+    for worker in workers:
+        worker.start()
+    
+    context = evaluation_context(map_path, 120.0, early_stop) if cache is not None else None
+    last_report = time.time()
+    
+    def submit(trial_id, params, termination):
+        coordinator.submit(trial_id, {'params': params, 'max_time': 120.0, 'termination': termination})
+    
+    def collect():
+        nonlocal last_report
+        results = coordinator.collect(timeout=1.0)
+        if time.time() - last_report >= report_interval:
+            coordinator.report()
+            last_report = time.time()
+        return results
+    
+    try:
+        run_trials(tester, submit, collect, queue_depth,
+                   lambda completed: f"{coordinator.stats()['rate']:.2f} éval/s (grappe)",
+                   cache=cache, context=context, early_stop=early_stop)
+    except KeyboardInterrupt:
+        print("\nTests interrompus par l'utilisateur")
+    finally:
+        coordinator.shutdown()
+        for worker in workers:
+            worker.join(timeout=5.0)
+    
+    coordinator.report()
+    if tester.best_params is not None:
+        print("\nMeilleurs paramètres trouvés:")
+        for name, value in tester.best_params.items():
+            print(f"  {name}: {value:.3f}")
+        print(f"Score: {tester.best_score:.2f}")
+    if cache is not None:
+        cache.report()
+
+def run_successive_halving(num_candidates, num_workers=1, budgets=(10.0, 30.0, 120.0),
+                           keep_fraction=1/3, map_path=MAP_PATH, strategy='local', scoring='lap_time'):
+    """Évalue un lot de candidats par paliers de budget croissant (successive halving)
+    
+    Tous les candidats roulent d'abord pendant le budget le plus court ; seul le
+    meilleur tiers (progression partielle) est relancé avec le budget suivant.
+    L'environnement f110 ne pouvant pas être sauvegardé en cours de course, les
+    candidats promus repartent du départ avec le budget plus long. Un candidat
+    éliminé n'est enregistré que si sa simulation était terminée (tour complet,
+    collision, immobilité) ; une course coupée par un budget court est
+    abandonnée (cancel) pour ne pas passer pour un essai complet dans la base,
+    le modèle de substitution et le filtre des doublons.
+    """
+    tester = ParameterTester(strategy=strategy, config=simulation_config(map_path), scoring=scoring)
+    candidates = tester.ask_batch(num_candidates)
+    print(f"Successive halving - {len(candidates)} candidats, paliers {list(budgets)}s, "
+          f"{num_workers} processus")
+    print("-" * 50)
+    
+    def record(candidate, result):
+        trial_id, _ = candidate
+        results = result['results']
+        tester.tell(
+            trial_id,
+            total_time=results['total_time'],
+            distance=results['distance'],
+            collision=results['collision'],
+            tour_complete=results['tour_complete'],
+            temps_tour=results['temps_tour'],
+            abort_reason=results['abort_reason']
+        )
+    
+    def eliminate(candidate, result):
+        if result['finished']:
+            record(candidate, result)
         else:
-            temps_immobile = 0.0
-            derniere_position = position_actuelle
-        
-        # Arrêter si immobile depuis 5 secondes
-        if temps_immobile >= 5.0:
-            break
-        
-        # Mettre à jour les métriques
-        total_time += dt
-        speed = actions[0][1]  # Vitesse actuelle
-        distance_parcourue += speed * dt
-        
-        # Mettre à jour l'affichage si disponible
-        if display is not None:
-            display.update(actions[0][1], actions[0][0], obs)
-            env.render(mode='human_fast')
+            tester.cancel(candidate[0])
+    
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker,
+                             initargs=(map_path,)) as executor:
+        def evaluate(jobs):
+            futures = [executor.submit(evaluate_in_worker, params, budget)
+                       for (_, params), budget, _ in jobs]
+            evaluated = []
+            for future in futures:
+                results = future.result()
+                evaluated.append({
+                    'score': tester.calculate_score(results),
+                    'finished': results['collision'] or results['tour_complete'] or results['immobile'],
+                    'sim_time': results['total_time'],
+                    'results': results
+                })
+            return evaluated
         
-        # Vérifier si le tour est complet
-        if int(obs['lap_counts'][0]) > 0:
-            tour_complete = True
-            temps_tour = total_time
-            break
+        halving = SuccessiveHalving(budgets, keep_fraction)
+        final = halving.run(candidates, evaluate, on_eliminated=eliminate)
+    
+    for candidate, result in final:
+        record(candidate, result)
+    halving.report()
+    
+    if tester.best_params is not None:
+        print("\nMeilleurs paramètres trouvés:")
+        for name, value in tester.best_params.items():
+            print(f"  {name}: {value:.3f}")
+        print(f"Score: {tester.best_score:.2f}")
+
+def run_multi_fidelity(num_candidates, rounds=1, num_workers=1, promote_fraction=0.2,
+                       map_path=MAP_PATH, strategy='local', pairs_file=None, scoring='lap_time'):
+    """Crible des lots de candidats dans custom_sim avant de les tester dans f110_gym
+    
+    Chaque lot est d'abord évalué en basse fidélité (custom_sim, lidar réduit et
+    pas de temps grossier) ; seuls les candidats dont le score f110 prédit est
+    compétitif sont simulés dans f110_gym et enregistrés. La relation entre les
+    deux fidélités est apprise au fil des lots (et conservée dans pairs_file,
+    par défaut un fichier par carte).
+    """
+    if pairs_file is None:
+        pairs_file = f"multi_fidelity_pairs_{os.path.basename(map_path)}.csv"
+    tester = ParameterTester(strategy=strategy, config=simulation_config(map_path), scoring=scoring)
+    
+    # Criblage sur la même carte et depuis le même départ que l'évaluation f110
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_low_fidelity_worker,
+                             initargs=(low_fidelity_config(map_path),)) as low_pool, \
+            ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker,
+                                initargs=(map_path,)) as high_pool:
+        def low_fidelity(candidates):
+            return list(low_pool.map(evaluate_low_fidelity, [params for _, params in candidates]))
         
-        # Vérifier collision
-        if done:
-            collision = bool(obs['collisions'][0])
-            break
+        def high_fidelity(candidates):
+            evaluated = []
+            for results in high_pool.map(evaluate_in_worker, [params for _, params in candidates]):
+                evaluated.append({'score': tester.calculate_score(results),
+                                  'sim_time': results['total_time'],
+                                  'results': results})
+            return evaluated
         
-        # Limite de temps de sécurité (30 secondes)
-        if total_time > 120.0:
-            break
+        pipeline = MultiFidelityPipeline(low_fidelity, high_fidelity,
+                                         model=FidelityModel(pairs_file),
+                                         promote_fraction=promote_fraction)
+        try:
+            for round_index in range(rounds):
+                candidates = tester.ask_batch(num_candidates)
+                for (trial_id, _), low, high in pipeline.run(candidates):
+                    if high is None:
+                        tester.cancel(trial_id)
+                        continue
+                    results = high['results']
+                    tester.tell(
+                        trial_id,
+                        total_time=results['total_time'],
+                        distance=results['distance'],
+                        collision=results['collision'],
+                        tour_complete=results['tour_complete'],
+                        temps_tour=results['temps_tour'],
+                        abort_reason=results['abort_reason']
+                    )
+                print(f"Lot {round_index + 1}/{rounds}: meilleur score {tester.best_score:.2f}")
+        except KeyboardInterrupt:
+            print("\nTests interrompus par l'utilisateur")
     
-    return {
-        'collision': collision,
-        'total_time': total_time,
-        'distance': distance_parcourue,
-        'tour_complete': tour_complete,
-        'temps_tour': temps_tour,
-        'immobile': temps_immobile >= 5.0
-    }
+    pipeline.report()
+    if tester.best_params is not None:
+        print("\nMeilleurs paramètres trouvés:")
+        for name, value in tester.best_params.items():
+            print(f"  {name}: {value:.3f}")
+        print(f"Score: {tester.best_score:.2f}")
 
-def main():
+def main(async_mode=None, compute_latency=0.0, workers=1, strategy='local', halving=0,
+         budgets=(10.0, 30.0, 120.0), screen=0, rounds=1, early_stop=False, use_cache=True,
+         scoring='lap_time', serve=None, connect=None, authkey=DEFAULT_AUTHKEY, batch_size=4,
+         local_workers=0):
+    if connect is not None:
+        run_worker_node(connect, authkey, batch_size)
+        return
+    cache = EvaluationCache() if use_cache else None
+    if serve is not None:
+        run_coordinator(serve, authkey, strategy=strategy, early_stop=early_stop, cache=cache,
+                        scoring=scoring, local_workers=local_workers, batch_size=batch_size)
+        return
+    if screen > 0:
+        run_multi_fidelity(screen, rounds=rounds, num_workers=workers, strategy=strategy,
+                           scoring=scoring)
+        return
+    if halving > 0:
+        run_successive_halving(halving, num_workers=workers, budgets=budgets, strategy=strategy,
+                               scoring=scoring)
+        return
+    if workers > 1:
+        run_parallel(workers, strategy=strategy, early_stop=early_stop, cache=cache, scoring=scoring)
+        return
+    
     # Création de l'environnement
-    map_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maps', 'example_map')
-    racecar_env = gym.make('f110_gym:f110-v0',
-                          map=map_path,
-                          map_ext='.png',
-                          num_agents=1,
-                          timestep=0.01)
+    racecar_env = make_env()
 
     # Position initiale
-    initial_pose = np.array([[0.7, 0.0, 1.37079632679]], dtype=np.float64)
+    initial_pose = INITIAL_POSE
     
-    # Initialisation de l'affichage
+    # Initialisation de l'affichage (pygame n'est chargé qu'en mode interactif)
+    from info_display import InfoDisplay
     display = InfoDisplay()
     
     try:
         # Création du testeur de paramètres
-        tester = ParameterTester()
+        tester = ParameterTester(strategy=strategy, config=simulation_config(), scoring=scoring)
         max_tests = tester.get_total_combinations()
         nb_tests_precedents = len(tester.tested_params)
         print(f"Début de l'optimisation - {max_tests} tests prévus")
@@ -268,6 +424,7 @@ def main():
         
         # Test de chaque combinaison de paramètres
         tested = nb_tests_precedents
+        context = evaluation_context(MAP_PATH, 120.0, early_stop, async_mode, compute_latency)
         while tested < max_tests:
             # Obtenir les prochains paramètres à tester
             params = tester.get_next_parameters()
@@ -278,21 +435,33 @@ def main():
             for name, value in params.items():
                 print(f"  {name}: {value:.3f}")
             
-            # Test des paramètres avec affichage
-            results = test_parameters(racecar_env, initial_pose, params, display)
+            # Test des paramètres avec affichage (sauf s'ils ont déjà été évalués)
+            results = cache.get(params, context) if cache is not None else None
+            cached = results is not None
+            if not cached:
+                results = test_parameters(racecar_env, initial_pose, params, display,
+                                          async_mode=async_mode, compute_latency=compute_latency,
+                                          termination=make_termination(tester, early_stop))
+                if cache is not None and cacheable(results):
+                    cache.put(params, context, results)
             
             # Afficher les résultats
-            print("\nRésultats:")
+            print("\nRésultats (cache):" if cached else "\nRésultats:")
             if results['collision']:
                 print("  Collision détectée")
             elif results['immobile']:
                 print("  Véhicule immobile pendant 5 secondes")
+            elif results['abort_reason'] not in (None, 'timeout'):
+                print(f"  Test interrompu ({results['abort_reason']})")
             elif results['tour_complete']:
                 print(f"  Tour complet en {results['temps_tour']:.2f} secondes")
             else:
                 print("  Tour incomplet")
             print(f"  Distance parcourue: {results['distance']:.2f}m")
             print(f"  Temps total: {results['total_time']:.2f}s")
+            if async_mode is not None:
+                print(f"  Pas avec commande périmée: {results['stale_steps']}")
+                print(f"  Trames perdues: {results['dropped_frames']}")
             print("-" * 50)
             
             # Enregistrement des résultats
@@ -302,7 +471,8 @@ def main():
                 distance=results['distance'],
                 collision=results['collision'],
                 tour_complete=results['tour_complete'],
-                temps_tour=results['temps_tour']
+                temps_tour=results['temps_tour'],
+                abort_reason=results['abort_reason']
             )
             
             tested += 1
@@ -315,7 +485,8 @@ def main():
             print(f"Score: {tester.best_score:.2f}")
             
             print("\nTest des meilleurs paramètres...")
-            results = test_parameters(racecar_env, initial_pose, tester.best_params, display)
+            results = test_parameters(racecar_env, initial_pose, tester.best_params, display,
+                                      async_mode=async_mode, compute_latency=compute_latency)
             
     except KeyboardInterrupt:
         print("\nTests interrompus par l'utilisateur")
@@ -326,6 +497,55 @@ def main():
             print(f"Score: {tester.best_score:.2f}")
     finally:
         racecar_env.close()
+        if cache is not None:
+            cache.report()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Optimisation des paramètres du contrôleur F1TENTH")
+    parser.add_argument('--async', dest='async_mode', choices=['thread', 'process', 'shared'],
+                        help="exécuter le contrôleur en parallèle de la simulation")
+    parser.add_argument('--compute-latency', type=float, default=0.0,
+                        help="latence de calcul simulée du contrôleur (s)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="nombre de processus d'évaluation parallèles (sans affichage si > 1)")
+    parser.add_argument('--strategy', choices=['local', 'bayesian', 'cmaes'], default='local',
+                        help="stratégie de proposition des paramètres")
+    parser.add_argument('--halving', type=int, default=0,
+                        help="nombre de candidats évalués par successive halving (0 = désactivé)")
+    parser.add_argument('--budgets', type=float, nargs='+', default=[10.0, 30.0, 120.0],
+                        help="budgets de temps simulé (s) des paliers du successive halving")
+    parser.add_argument('--screen', type=int, default=0,
+                        help="taille des lots criblés dans custom_sim avant f110 (0 = désactivé)")
+    parser.add_argument('--rounds', type=int, default=1, help="nombre de lots criblés")
+    parser.add_argument('--early-stop', action='store_true',
+                        help="interrompre les tests sans progression, en marche arrière ou trop lents")
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help="toujours simuler, même les paramètres déjà évalués")
+    parser.add_argument('--scoring', choices=sorted(SCORERS), default='lap_time',
+                        help="fonction de score (l'historique est recalculé sans nouvelle simulation)")
+    parser.add_argument('--serve', metavar='HÔTE:PORT', nargs='?', const=f'{DEFAULT_HOST}:{DEFAULT_PORT}',
+                        help="coordonner une grappe de processus de travail (TCP)")
+    parser.add_argument('--connect', metavar='HÔTE:PORT',
+                        help="processus de travail : évaluer les tests loués par un coordinateur")
+    parser.add_argument('--authkey',
+                        help="clé partagée entre le coordinateur et les processus de travail "
+                             f"(par défaut ${AUTHKEY_ENV} ; obligatoire hors de la boucle locale)")
+    parser.add_argument('--batch', type=int, default=4, help="nombre de tests loués à la fois")
+    parser.add_argument('--local-workers', type=int, default=0,
+                        help="processus de travail lancés sur la machine du coordinateur")
+    args = parser.parse_args()
+    serve = parse_address(args.serve) if args.serve else None
+    connect = parse_address(args.connect) if args.connect else None
+    authkey = resolve_authkey(args.authkey)
+    for address in (serve, connect):
+        if address is not None:
+            try:
+                check_authkey(address, authkey)
+            except ValueError as e:
+                parser.error(str(e))
+    main(async_mode=args.async_mode, compute_latency=args.compute_latency, workers=args.workers,
+         strategy=args.strategy, halving=args.halving, budgets=args.budgets,
+         screen=args.screen, rounds=args.rounds, early_stop=args.early_stop,
+         use_cache=args.use_cache, scoring=args.scoring,
+         serve=serve, connect=connect, authkey=authkey, batch_size=args.batch,
+         local_workers=args.local_workers)
\ No newline at end of file
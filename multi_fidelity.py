@@ -0,0 +1,233 @@
+import contextlib
+import csv
+import math
+import os
+import time
+import numpy as np
+
+from headless import MAP_PATH, INITIAL_POSE
+
+
+def low_fidelity_config(map_path=MAP_PATH, initial_pose=INITIAL_POSE[0], map_ext='.png'):
+    """Configuration basse fidélité sur la carte et la position de départ de f110_gym
+
+    Les deux fidélités évaluent ainsi le même circuit depuis le même départ
+    (custom_sim lit l'image et l'origine du fichier yaml de la carte f110) :
+    peu de rayons, lidar vectorisé à pas de 2 pixels, pas de temps grossier.
+
+    Args:
+        map_path: carte f110 (sans extension)
+        initial_pose: (x, y, theta) dans le repère de la carte
+        map_ext: extension de l'image de la carte
+    """
+    return {
+        'map_path': map_path + map_ext,
+        'yaml_path': map_path + '.yaml',
+        'simulator_options': {'num_beams': 90, 'lidar_backend': 'vectorized', 'ray_step': 2,
+                              'start_pose': tuple(float(value) for value in initial_pose)},
+        'rates': {'physics_rate': 20.0, 'sensor_rate': 10.0, 'control_rate': 10.0},
+        'max_time': 60.0
+    }
+
+
+LOW_FIDELITY_CONFIG = low_fidelity_config()
+
+
+class FidelityModel:
+    """Relation apprise entre les scores basse et haute fidélité
+
+    Régression linéaire score_haut ≈ a + b * score_bas sur les paires déjà
+    évaluées aux deux fidélités, avec l'écart-type des résidus comme
+    incertitude. Les paires sont conservées dans un fichier CSV pour que
+    l'apprentissage continue d'une session à l'autre.
+    """
+
+    def __init__(self, pairs_file=None):
+        """
+        Args:
+            pairs_file: fichier CSV des paires (score_bas, score_haut), ou None
+        """
+        self.pairs_file = pairs_file
+        self.low = []
+        self.high = []
+        self.coefficients = None
+        self.residual_std = None
+        self.rank_correlation = None
+        if pairs_file is not None and os.path.exists(pairs_file):
+            with open(pairs_file, 'r') as f:
+                for row in csv.DictReader(f):
+                    self.low.append(float(row['low_score']))
+                    self.high.append(float(row['high_score']))
+            self.fit()
+
+    def __len__(self):
+        return len(self.low)
+
+    def add(self, low_score, high_score):
+        """Ajoute une paire évaluée aux deux fidélités"""
+        self.low.append(low_score)
+        self.high.append(high_score)
+        if self.pairs_file is not None:
+            new_file = not os.path.exists(self.pairs_file)
+            with open(self.pairs_file, 'a', newline='') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(['low_score', 'high_score'])
+                writer.writerow([f"{low_score:.2f}", f"{high_score:.2f}"])
+
+    def fit(self):
+        """Ajuste la régression (au moins 3 paires)"""
+        if len(self.low) < 3:
+            return
+        low = np.array(self.low)
+        high = np.array(self.high)
+        if np.ptp(low) == 0:
+            return
+        self.coefficients = np.polyfit(low, high, 1)
+        residuals = high - np.polyval(self.coefficients, low)
+        self.residual_std = float(np.sqrt(np.mean(residuals ** 2)))
+        from scipy.stats import spearmanr  # scipy chargé au premier ajustement seulement
+        self.rank_correlation = float(spearmanr(low, high)[0])
+
+    def predict(self, low_scores):
+        """Score haute fidélité prédit et son incertitude"""
+        return np.polyval(self.coefficients, np.asarray(low_scores)), self.residual_std
+
+
+class MultiFidelityPipeline:
+    """Criblage basse fidélité puis confirmation haute fidélité
+
+    Tous les candidats sont évalués par `low_fidelity` ; seuls ceux dont le
+    score haute fidélité prédit (plus kappa écarts-types) peut atteindre le
+    meilleur score haute fidélité connu sont envoyés à `high_fidelity`, dans la
+    limite de promote_fraction des candidats. Tant que le modèle n'a pas assez
+    de paires, les meilleurs candidats basse fidélité sont promus. Les deux
+    fonctions reçoivent une liste de candidats et retournent une liste de
+    dicts avec au moins 'score' (plus grand = meilleur) et 'sim_time'.
+    """
+
+    def __init__(self, low_fidelity, high_fidelity, model=None, promote_fraction=0.2,
+                 min_pairs=5, kappa=1.0):
+        """
+        Args:
+            low_fidelity: évaluation basse fidélité d'une liste de candidats
+            high_fidelity: évaluation haute fidélité d'une liste de candidats
+            model: FidelityModel (un modèle vide par défaut)
+            promote_fraction: fraction maximale des candidats promus
+            min_pairs: nombre de paires nécessaires avant d'utiliser le modèle
+            kappa: nombre d'écarts-types ajoutés à la prédiction
+        """
+        self.low_fidelity = low_fidelity
+        self.high_fidelity = high_fidelity
+        self.model = model if model is not None else FidelityModel()
+        self.promote_fraction = promote_fraction
+        self.min_pairs = min_pairs
+        self.kappa = kappa
+        self.best_high_score = max(self.model.high) if len(self.model) else float('-inf')
+
+        self.stats = {
+            'low': {'evaluations': 0, 'wall_time': 0.0, 'sim_time': 0.0},
+            'high': {'evaluations': 0, 'wall_time': 0.0, 'sim_time': 0.0},
+            'promoted': 0,
+            'screened': 0
+        }
+
+    def _run_stage(self, stage, evaluate, candidates):
+        start = time.time()
+        results = evaluate(candidates) if candidates else []
+        stats = self.stats[stage]
+        stats['evaluations'] += len(results)
+        stats['wall_time'] += time.time() - start
+        stats['sim_time'] += sum(result['sim_time'] for result in results)
+        return results
+
+    def select(self, low_scores):
+        """Indices des candidats promus en haute fidélité"""
+        low_scores = np.asarray(low_scores)
+        max_promoted = max(1, math.ceil(len(low_scores) * self.promote_fraction))
+        if len(self.model) < self.min_pairs or self.model.coefficients is None:
+            return list(np.argsort(low_scores)[::-1][:max_promoted])
+        mean, std = self.model.predict(low_scores)
+        upper = mean + self.kappa * std
+        order = np.argsort(upper)[::-1]
+        competitive = [i for i in order if upper[i] >= self.best_high_score]
+        return competitive[:max_promoted]
+
+    def run(self, candidates):
+        """Évalue un lot de candidats
+
+        Returns:
+            liste de (candidat, résultat basse fidélité, résultat haute fidélité ou None)
+        """
+        low_results = self._run_stage('low', self.low_fidelity, candidates)
+        promoted = self.select([result['score'] for result in low_results])
+        high_results = self._run_stage('high', self.high_fidelity,
+                                       [candidates[i] for i in promoted])
+
+        output = [[candidate, low, None] for candidate, low in zip(candidates, low_results)]
+        for i, high in zip(promoted, high_results):
+            output[i][2] = high
+            self.model.add(low_results[i]['score'], high['score'])
+            self.best_high_score = max(self.best_high_score, high['score'])
+        self.model.fit()
+
+        self.stats['screened'] += len(candidates)
+        self.stats['promoted'] += len(promoted)
+        return [tuple(entry) for entry in output]
+
+    def report(self):
+        """Affiche le coût de chaque étape et les statistiques de promotion"""
+        print("\n=== Pipeline multi-fidélité ===")
+        for stage, label in (('low', 'Basse fidélité'), ('high', 'Haute fidélité')):
+            stats = self.stats[stage]
+            per_eval = stats['wall_time'] / stats['evaluations'] if stats['evaluations'] else 0.0
+            print(f"{label}: {stats['evaluations']} évaluations, {stats['wall_time']:.1f}s réelles "
+                  f"({per_eval:.2f}s/éval), {stats['sim_time']:.0f}s simulées")
+        if self.stats['screened']:
+            rate = self.stats['promoted'] / self.stats['screened'] * 100
+            print(f"Promus: {self.stats['promoted']}/{self.stats['screened']} ({rate:.1f}%)")
+        if self.model.rank_correlation is not None:
+            a, b = self.model.coefficients[1], self.model.coefficients[0]
+            print(f"Corrélation de rang bas/haut: {self.model.rank_correlation:.2f} "
+                  f"({len(self.model)} paires, haut ≈ {a:.1f} + {b:.3f} x bas, "
+                  f"écart-type {self.model.residual_std:.1f})")
+        print("===============================")
+
+
+# Évaluation basse fidélité dans un processus de travail
+_low_fidelity_optimizer = None
+_low_fidelity_max_time = None
+
+
+def init_low_fidelity_worker(config=LOW_FIDELITY_CONFIG):
+    """Initialise un processus de travail basse fidélité (custom_sim sans affichage)
+
+    Le dossier custom_sim doit être dans sys.path (voir main.py).
+    """
+    global _low_fidelity_optimizer, _low_fidelity_max_time
+    from navigation_optimizer import NavigationOptimizer
+    from f110_controller_adapter import F110ControllerAdapter
+
+    _low_fidelity_optimizer = NavigationOptimizer(config['map_path'], config['yaml_path'],
+                                                  navigator_class=F110ControllerAdapter,
+                                                  simulator_options=config['simulator_options'])
+    _low_fidelity_optimizer.rates = dict(config['rates'])
+    _low_fidelity_max_time = config['max_time']
+
+
+def evaluate_low_fidelity(params):
+    """Évalue les paramètres du contrôleur f110 dans custom_sim
+
+    Returns:
+        dict avec score (progression, plus grand = meilleur), sim_time et metrics
+    """
+    optimizer = _low_fidelity_optimizer
+    # Le contrôleur affiche son état à chaque pas : on jette ce texte
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        episode = optimizer.start_episode(params)
+        optimizer.run_episode(episode, _low_fidelity_max_time)
+    return {
+        'score': optimizer.progress_score(episode),
+        'sim_time': episode['scheduler'].sim_time,
+        'metrics': optimizer.episode_metrics(episode)
+    }
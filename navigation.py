@@ -1,9 +1,11 @@
 import numpy as np
-import pygame
+from scan_sectors import CircularSector
 
 class Teleoperation:
     def __init__(self):
-        # Initialiser pygame pour la capture des touches
+        # Initialiser pygame pour la capture des touches (chargé ici : inutile aux
+        # contrôleurs autonomes)
+        import pygame
         pygame.init()
         # Créer une petite fenêtre invisible pour capturer les entrées clavier
         self.screen = pygame.display.set_mode((1, 1))
@@ -28,6 +30,7 @@ class Teleoperation:
             numpy.ndarray: [angle_braquage, vitesse]
         """
         # Gestion des événements pygame
+        import pygame
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
@@ -62,6 +65,7 @@ class Teleoperation:
         return np.array([[self.steer, self.speed]])
 
     def __del__(self):
+        import pygame
         pygame.quit()
 
 class SimpleAutonomousController:
@@ -86,6 +90,13 @@ class SimpleAutonomousController:
         self.front_angle = front_angle
         self.side_angle = side_angle
         
+        # Secteurs du scan. Convention historique : les degrés sont comptés comme si
+        # le scan couvrait 360° autour du rayon central (N/360 rayons par degré), ce
+        # qui garde leur sens aux paramètres déjà optimisés.
+        self.front_sector = CircularSector(-front_angle, front_angle, angle_min_deg=-180.0)
+        self.left_sector = CircularSector(-side_angle, 0.0, angle_min_deg=-180.0)
+        self.right_sector = CircularSector(0.0, side_angle, angle_min_deg=-180.0)
+        
         # Variables pour l'affichage
         self.front_dist = np.inf
         self.left_dist = np.inf
@@ -148,32 +159,12 @@ class SimpleAutonomousController:
             return np.inf, np.inf, np.inf
             
         # Convertir en array numpy si nécessaire
-        distances = np.array(scan_data)
-        
-        # Nombre total de points
-        num_points = len(distances)
-        
-        # Indices pour les différents secteurs
-        center = num_points // 2
-        
-        # Secteur frontal (±30°)
-        front_span = int(num_points * self.front_angle / 360)
-        front_indices = np.arange(center - front_span, center + front_span)
-        
-        # Secteurs latéraux (±90°)
-        side_span = int(num_points * self.side_angle / 360)
-        left_indices = np.arange(center - side_span, center)
-        right_indices = np.arange(center, center + side_span)
-        
-        # Assurer que les indices sont dans les limites
-        front_indices = front_indices[(front_indices >= 0) & (front_indices < num_points)]
-        left_indices = left_indices[(left_indices >= 0) & (left_indices < num_points)]
-        right_indices = right_indices[(right_indices >= 0) & (right_indices < num_points)]
+        distances = np.asarray(scan_data)
         
         # Calculer les distances minimales dans chaque secteur
-        self.front_dist = np.min(distances[front_indices]) if len(front_indices) > 0 else np.inf
-        self.left_dist = np.min(distances[left_indices]) if len(left_indices) > 0 else np.inf
-        self.right_dist = np.min(distances[right_indices]) if len(right_indices) > 0 else np.inf
+        self.front_dist = self.front_sector.min(distances)
+        self.left_dist = self.left_sector.min(distances)
+        self.right_dist = self.right_sector.min(distances)
         
         return self.front_dist, self.left_dist, self.right_dist
         
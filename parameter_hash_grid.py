@@ -0,0 +1,111 @@
+import itertools
+import numpy as np
+
+
+class ParameterHashGrid:
+    """Détection de doublons par grille de hachage sur les paramètres normalisés
+
+    Deux jeux de paramètres sont considérés similaires si, pour chaque paramètre,
+    l'écart normalisé par la plage min/max est au plus `tolerance`. La grille
+    utilise des cellules de côté 2 x tolerance : les voisins possibles d'un point
+    sont dans au plus 2 cellules par paramètre (2^d cellules au total), ce qui
+    donne une recherche en O(1) en moyenne, suivie d'une vérification exacte.
+
+    Les paramètres de plage nulle (min == max) sont ignorés.
+    """
+
+    def __init__(self, lower, upper, tolerance=0.01):
+        """
+        Args:
+            lower: bornes minimales des paramètres
+            upper: bornes maximales des paramètres
+            tolerance: écart normalisé maximal entre deux points similaires
+        """
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        span = self.upper - self.lower
+        self.scale = np.divide(1.0, span, out=np.zeros_like(span), where=span > 0)
+        self.tolerance = tolerance
+        self.cell_size = 2 * tolerance
+
+        self._cells = {}    # cellule -> identifiants des points
+        self._points = {}   # identifiant -> (point normalisé, cellule)
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._points)
+
+    def normalize(self, x):
+        """Normalise un ou plusieurs jeux de paramètres"""
+        return (np.asarray(x, dtype=float) - self.lower) * self.scale
+
+    def _cell(self, point):
+        return tuple(np.floor(point / self.cell_size).astype(int).tolist())
+
+    def _neighbour_cells(self, point):
+        """Cellules pouvant contenir un point à moins de tolerance"""
+        low = np.floor((point - self.tolerance) / self.cell_size).astype(int)
+        high = np.floor((point + self.tolerance) / self.cell_size).astype(int)
+        choices = [(lo,) if lo == hi else (lo, hi) for lo, hi in zip(low.tolist(), high.tolist())]
+        return itertools.product(*choices)
+
+    def _find(self, point):
+        """Identifiant d'un point similaire déjà présent, ou None"""
+        for cell in self._neighbour_cells(point):
+            for point_id in self._cells.get(cell, ()):
+                if np.all(np.abs(self._points[point_id][0] - point) <= self.tolerance + 1e-12):
+                    return point_id
+        return None
+
+    def add(self, x):
+        """Ajoute un jeu de paramètres
+
+        Returns:
+            identifiant du point (pour remove)
+        """
+        point = self.normalize(x)
+        cell = self._cell(point)
+        point_id = self._next_id
+        self._next_id += 1
+        self._points[point_id] = (point, cell)
+        self._cells.setdefault(cell, set()).add(point_id)
+        return point_id
+
+    def remove(self, point_id):
+        """Retire un point ajouté par add (sans effet s'il n'existe plus)"""
+        entry = self._points.pop(point_id, None)
+        if entry is None:
+            return
+        cell = entry[1]
+        members = self._cells[cell]
+        members.discard(point_id)
+        if not members:
+            del self._cells[cell]
+
+    def contains(self, x):
+        """Vérifie si un jeu de paramètres similaire est déjà présent"""
+        return self._find(self.normalize(x)) is not None
+
+    def contains_batch(self, X):
+        """Vérifie pour chaque ligne de X si un jeu similaire est déjà présent"""
+        points = self.normalize(np.atleast_2d(X))
+        return np.array([self._find(point) is not None for point in points], dtype=bool)
+
+    def filter_new(self, X, others=()):
+        """Sélectionne les candidats nouveaux d'une population
+
+        Un candidat est rejeté s'il est similaire à un point de la grille, d'une
+        des grilles `others`, ou à un candidat déjà retenu dans le même lot.
+
+        Returns:
+            masque booléen des candidats retenus
+        """
+        X = np.atleast_2d(X)
+        keep = np.zeros(len(X), dtype=bool)
+        batch = ParameterHashGrid(self.lower, self.upper, self.tolerance)
+        for i, x in enumerate(X):
+            if self.contains(x) or any(grid.contains(x) for grid in others) or batch.contains(x):
+                continue
+            batch.add(x)
+            keep[i] = True
+        return keep
@@ -1,11 +1,43 @@
 import numpy as np
-import csv
-from datetime import datetime
-from scipy.optimize import minimize
+import atexit
+import glob
+import threading
 import os
+import time
+from results_store import ResultsStore, EXPORT_FILE
+from trial_history import TrialHistory
+from scoring import get_scorer, score_one
+from search_space import SearchSpace
+from surrogate_index import SurrogateIndex
+from parameter_hash_grid import ParameterHashGrid
+from bayesian_optimizer import BatchBayesianOptimizer
+from cma_es import CMAES
+
+# Base des résultats (tous les jours, toutes les configurations de simulation)
+RESULTS_DB = 'parameter_test_results.db'
+PARAMETER_NAMES = ['max_speed', 'max_steer', 'min_front_dist', 'safety_margin',
+                   'front_angle', 'side_angle']
+# Configuration de simulation des résultats (les résultats d'une autre carte sont ignorés)
+DEFAULT_CONFIG = {'simulator': 'f110_gym', 'map': 'example_map', 'timestep': 0.01}
+# Version du format du fichier d'état (un état d'une autre version est ignoré)
+STATE_VERSION = 3
+# Colonnes de l'historique des tests (voir TrialHistory)
+RESULT_FIELDS = [('total_time', 'f'), ('distance', 'f'), ('collision', 'b'), ('tour_complete', 'b'),
+                 ('temps_tour', 'f'), ('score', 'f'), ('abort_reason', 'c')]
 
 class ParameterTester:
-    def __init__(self):
+    def __init__(self, strategy='local', results_db=RESULTS_DB, config=None, state_file=None,
+                 scoring='lap_time'):
+        """
+        Args:
+            strategy: 'local' (perturbation autour du meilleur résultat, avec phases
+                d'exploration), 'bayesian' (processus gaussien, propositions par lots)
+                ou 'cmaes' (CMA-ES, générations évaluées en bloc)
+            results_db: base SQLite des résultats
+            config: configuration de simulation (DEFAULT_CONFIG par défaut)
+            state_file: fichier .npz de l'état de l'optimiseur (un par configuration par défaut)
+            scoring: nom de la fonction de score (voir scoring.SCORERS)
+        """
         # Définition des plages de paramètres avec min, max et pas
         self.parameter_definitions = {
             'max_speed': {
@@ -40,22 +72,38 @@ class ParameterTester:
             }
         }
         
-        # Cache pour éviter les doublons
-        self.tested_combinations = set()
+        # Espace de recherche : conversions vectorisées dict <-> tableau, bornes, pas
+        self.space = SearchSpace(self.parameter_definitions)
+        lower, upper = self.space.lower, self.space.upper
+        
+        # Cache pour éviter les doublons (tests effectués et essais en cours)
+        self.tested_combinations = ParameterHashGrid(lower, upper, tolerance=0.01)
+        self.pending_combinations = ParameterHashGrid(lower, upper, tolerance=0.01)
         
         # Création des plages de valeurs à partir des définitions
-        self.parameter_ranges = {
-            name: np.arange(
-                params['min'],
-                params['max'] + params['step']/2,  # +step/2 pour inclure la valeur max
-                params['step']
-            )
-            for name, params in self.parameter_definitions.items()
-        }
+        self.parameter_ranges = self.space.grid_values()
+        
+        # Fonction de score vectorisée, appliquée aux métriques brutes de l'historique
+        self.scoring = scoring
+        self.scorer = get_scorer(scoring)
+        
+        # Historique des tests, en colonnes (tested_params et results en sont des vues)
+        self.history = TrialHistory(self.space.names, RESULT_FIELDS)
+        self.abort_counts = {}  # Nombre de tests interrompus par raison d'arrêt
         
-        # Historique des tests
-        self.tested_params = []
-        self.results = []
+        # Historique normalisé et indexé pour l'estimation des scores
+        self.surrogate = SurrogateIndex(lower, upper, radius=0.2)
+        
+        # Optimisation bayésienne par lots (initialisée avec l'historique du CSV)
+        self.strategy = strategy
+        self.bayesian = BatchBayesianOptimizer(lower, upper) if strategy == 'bayesian' else None
+        
+        # CMA-ES : candidats de la génération courante pas encore proposés,
+        # essais en cours et résultats reçus de cette génération
+        self.cmaes = CMAES(lower, upper) if strategy == 'cmaes' else None
+        self.generation_queue = []
+        self.generation_trials = set()
+        self.generation_results = {}
         
         # Meilleurs résultats
         self.best_params = None
@@ -64,10 +112,12 @@ class ParameterTester:
         # État de l'optimisation Nelder-Mead
         self.using_nelder_mead = False
         self.nelder_mead_result = None
+        self.nelder_mead_thread = None
         self.current_params = None
         
-        # Création du fichier de résultats (sans l'heure)
-        self.results_file = f"parameter_test_results_{datetime.now().strftime('%Y%m%d')}.csv"
+        # Base des résultats, indexée par paramètres et configuration de simulation
+        self.store = ResultsStore(results_db, self.space.names,
+                                  config if config is not None else DEFAULT_CONFIG)
         
         # Nouveaux paramètres pour la détection de convergence
         self.score_history = []
@@ -77,109 +127,228 @@ class ParameterTester:
         self.exploration_count = 0
         self.max_exploration_tests = 5  # Nombre de tests aléatoires après convergence
         
-        # Charger les résultats existants si le fichier existe
-        self.load_existing_results()
-        self.write_header()
+        # Essais proposés (ask) dont le résultat n'est pas encore connu (tell)
+        self.pending_trials = {}
+        self.next_trial_id = 0
+        # Phase courante : incrémentée à chaque entrée/sortie du mode exploration.
+        # Seuls les essais d'exploitation de la phase courante servent à détecter la convergence.
+        self.phase = 0
+        self.convergence_scores = []
+        
+        # État de l'optimiseur sauvegardé régulièrement pour un redémarrage rapide
+        self.state_file = state_file if state_file is not None else \
+            f"parameter_tester_state_{self.store.config_hash[:12]}.npz"
+        # Sauvegarde à intervalle de temps (et en fin de session) : chaque sauvegarde réécrit
+        # tout l'historique, une sauvegarde tous les N résultats coûterait O(N²) au total.
+        # Après un arrêt brutal, l'état en retard sur la base est ignoré et l'historique relu.
+        self.state_interval = 60.0  # Secondes entre deux sauvegardes de l'état
+        self.last_state_save = time.time()
+        
+        # Charger les résultats existants (anciens fichiers CSV journaliers compris) :
+        # depuis l'état sauvegardé s'il est à jour, sinon depuis la base
+        self.import_legacy_results()
+        if not self.load_state():
+            self.load_existing_results()
+            self.rescore()
+        atexit.register(self.save_state)
+        
+        # Reprendre CMA-ES à partir des meilleurs résultats existants
+        if self.cmaes is not None and len(self.history):
+            self.cmaes.warm_start(self.history.params, self.history.column('score'))
         
-        # Initialiser l'optimisation Nelder-Mead si on a assez de données
-        if len(self.tested_params) >= 10:
-            self.initialize_nelder_mead()
+        # Initialiser l'optimisation Nelder-Mead si on a assez de données, en arrière-plan
+        # pour que le premier test démarre immédiatement. L'estimateur est copié ici :
+        # le thread ne lit jamais l'historique que tell() modifie pendant ce temps.
+        if len(self.tested_params) >= 10 and self.nelder_mead_result is None \
+                and self.best_params is not None:
+            self.nelder_mead_thread = threading.Thread(
+                target=self.initialize_nelder_mead,
+                args=(self.parameters_to_array(self.best_params), self.surrogate.copy(), self.best_score),
+                daemon=True)
+            self.nelder_mead_thread.start()
         
+    def import_legacy_results(self):
+        """Importe dans la base les anciens fichiers parameter_test_results_AAAAMMJJ.csv"""
+        for path in sorted(glob.glob('parameter_test_results_*.csv')):
+            if os.path.basename(path) == EXPORT_FILE:
+                continue
+            imported = self.store.import_csv(path)
+            if imported:
+                print(f"{imported} résultats importés depuis {path}")
+    
     def load_existing_results(self):
-        """Charge les résultats existants du fichier CSV s'il existe"""
-        try:
-            with open(self.results_file, 'r') as f:
-                reader = csv.reader(f)
-                # Ignorer les lignes de commentaires
-                for row in reader:
-                    if not row[0].startswith('#'):
-                        if row[0] != 'max_speed':  # Ignorer l'en-tête
-                            # Convertir les valeurs en float
-                            params = {
-                                'max_speed': float(row[0]),
-                                'max_steer': float(row[1]),
-                                'min_front_dist': float(row[2]),
-                                'safety_margin': float(row[3]),
-                                'front_angle': float(row[4]),
-                                'side_angle': float(row[5])
-                            }
-                            
-                            # Recréer l'objet results
-                            results = {
-                                'total_time': float(row[6]),
-                                'distance': float(row[7]),
-                                'collision': row[8].lower() == 'true',
-                                'tour_complete': row[9].lower() == 'true',
-                                'temps_tour': float(row[10]) if row[10] != 'N/A' else None
-                            }
-                            
-                            # Calculer le score
-                            score = self.calculate_score(results)
-                            
-                            # Mettre à jour le meilleur score si nécessaire
-                            if score > self.best_score:
-                                self.best_score = score
-                                self.best_params = params.copy()
-                            
-                            # Ajouter aux historiques
-                            self.tested_params.append(params)
-                            self.results.append(results)
-        except FileNotFoundError:
-            pass  # Le fichier n'existe pas encore
-        
-    def write_header(self):
-        """Écrit l'en-tête du fichier CSV uniquement si le fichier n'existe pas"""
-        # Vérifier si le fichier existe déjà
-        try:
-            with open(self.results_file, 'r') as f:
-                return  # Si le fichier existe, ne rien faire
-        except FileNotFoundError:
-            # Si le fichier n'existe pas, créer l'en-tête
-            with open(self.results_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                # Ajouter les plages de valeurs en commentaire
-                writer.writerow(['# Plages de paramètres:'])
-                for name, params in self.parameter_definitions.items():
-                    writer.writerow([
-                        f'# {name}: min={params["min"]}, max={params["max"]}, '
-                        f'step={params["step"]}'
-                    ])
-                writer.writerow(['#'])
-                # En-tête des données
-                writer.writerow([
-                    'max_speed', 'max_steer', 'min_front_dist', 'safety_margin',
-                    'front_angle', 'side_angle', 'temps_total', 'distance_parcourue',
-                    'collision', 'tour_complete', 'temps_tour', 'score'
-                ])
+        """Charge les résultats de la configuration courante depuis la base
+        
+        Les scores enregistrés sont ensuite recalculés en un seul passage avec la
+        fonction de score courante (rescore).
+        """
+        for params, results, score in self.store.load():
+            # Mettre à jour le meilleur score si nécessaire
+            if score > self.best_score:
+                self.best_score = score
+                self.best_params = params.copy()
+            
+            # Ajouter aux historiques
+            results['score'] = score
+            self.history.append(params, results)
+            self.surrogate.add(self.parameters_to_array(params), score)
+            self.tested_combinations.add(self.parameters_to_array(params))
+    
+    @property
+    def tested_params(self):
+        """Paramètres des tests (séquence de dicts construits depuis l'historique)"""
+        return self.history.param_dicts
+    
+    @property
+    def results(self):
+        """Résultats des tests (séquence de dicts construits depuis l'historique)"""
+        return self.history.rows
+    
+    def save_state(self):
+        """Sauvegarde l'état de l'optimiseur (historique, meilleur résultat, fenêtre de
+        convergence, simplexe Nelder-Mead) dans un fichier binaire compact"""
+        # L'état doit correspondre au contenu de la base : écrire les résultats en attente
+        self.store.flush()
+        history = self.history
+        state = {
+            'version': STATE_VERSION,
+            'scoring': self.scoring,
+            'config_hash': self.store.config_hash,
+            'history_count': len(history),
+            'params': history.params,
+            'timestamp': history.column('timestamp'),
+            'abort_labels': np.array([label or '' for label in history.labels['abort_reason']], dtype=str),
+            'best_params': self.parameters_to_array(self.best_params) if self.best_params else np.empty(0),
+            'best_score': self.best_score,
+            'score_history': np.array(self.score_history, dtype=float),
+            'convergence_scores': np.array(self.convergence_scores, dtype=float),
+            'phase': self.phase,
+            'exploration_mode': self.exploration_mode,
+            'exploration_count': self.exploration_count
+        }
+        for name, _ in RESULT_FIELDS:
+            state[name] = history.column(name)
+        result = self.nelder_mead_result
+        if result is not None:
+            simplex, simplex_values = result.final_simplex
+            state.update(nelder_mead_x=result.x, nelder_mead_fun=result.fun,
+                         nelder_mead_simplex=simplex, nelder_mead_values=simplex_values)
+        
+        tmp_path = self.state_file + '.tmp.npz'
+        np.savez(tmp_path, **state)
+        os.replace(tmp_path, self.state_file)
+        self.last_state_save = time.time()
+    
+    def load_state(self):
+        """Restaure l'état sauvegardé s'il correspond exactement au contenu de la base
+        
+        Returns:
+            True si l'état a été restauré (sinon l'historique est relu dans la base)
+        """
+        if not os.path.exists(self.state_file):
+            return False
+        with np.load(self.state_file) as data:
+            if 'version' not in data or int(data['version']) != STATE_VERSION or \
+                    str(data['config_hash']) != self.store.config_hash or \
+                    int(data['history_count']) != self.store.count():
+                return False
+            
+            X = data['params']
+            scores = data['score']
+            columns = {name: data[name] for name, _ in RESULT_FIELDS}
+            labels = [str(label) or None for label in data['abort_labels']]
+            columns['abort_reason'] = [labels[code] for code in columns['abort_reason']]
+            self.history.extend(X, columns, data['timestamp'])
+            if len(X):
+                self.surrogate.add_batch(X, scores)
+            for x in X:
+                self.tested_combinations.add(x)
+            
+            if data['best_params'].size:
+                self.best_params = self.space.decode(data['best_params'])
+            self.best_score = float(data['best_score'])
+            self.score_history = list(data['score_history'])
+            self.convergence_scores = list(data['convergence_scores'])
+            self.phase = int(data['phase'])
+            self.exploration_mode = bool(data['exploration_mode'])
+            self.exploration_count = int(data['exploration_count'])
+            
+            if 'nelder_mead_x' in data:
+                from scipy.optimize import OptimizeResult
+                self.using_nelder_mead = True
+                self.nelder_mead_result = OptimizeResult(
+                    x=data['nelder_mead_x'], fun=float(data['nelder_mead_fun']),
+                    final_simplex=(data['nelder_mead_simplex'], data['nelder_mead_values']))
+            
+            # État sauvegardé avec une autre fonction de score
+            if str(data['scoring']) != self.scoring:
+                self.rescore()
+        return True
+    
+    def export_csv(self, path=EXPORT_FILE):
+        """Exporte l'historique au format CSV lu par visualize_results.py"""
+        return self.store.export_csv(path, self.parameter_definitions)
     
     def calculate_score(self, results):
-        """Calcule un score pour les résultats d'un test"""
-        # Pénalité pour collision
-        if results['collision']:
-            return -1000
-        
-        # Si le tour n'est pas complet
-        if not results['tour_complete']:
-            # Pénalité pour tour non complété
-            return -1000 + results['distance']  # On ajoute la distance pour différencier les essais incomplets
-        
-        # Si le tour est complet, score basé sur le temps
-        # Plus le temps est court, meilleur est le score
-        base_score = 10000  # Score de base plus élevé pour un tour complet
-        time_penalty = results['temps_tour'] * 10  # Pénalité de temps
-        return base_score - time_penalty
+        """Calcule un score pour les résultats d'un test (fonction de score courante)
+        
+        Un test interrompu par une règle d'arrêt (results['abort_reason']) est un
+        tour non complété : il est classé par la distance parcourue avant l'arrêt.
+        """
+        return score_one(self.scorer, results)
+    
+    def rescore(self, scoring=None):
+        """Recalcule le score de tout l'historique à partir des métriques brutes
+        
+        Un seul passage vectorisé : les scores de l'historique et de l'index
+        d'estimation ainsi que les meilleurs paramètres sont mis à jour sans
+        nouvelle simulation.
+        
+        Args:
+            scoring: nouvelle fonction de score (None = garder la fonction courante)
+        """
+        if scoring is not None and scoring != self.scoring:
+            self.scorer = get_scorer(scoring)
+            self.scoring = scoring
+            # La fenêtre de convergence contient des scores de l'ancienne fonction
+            self._set_phase(self.exploration_mode)
+        if not len(self.history):
+            return
+        scores = self.scorer(self.history.columns())
+        self.history.column('score')[:] = scores
+        self.surrogate.set_scores(scores)
+        best = int(np.argmax(scores))
+        self.best_score = float(scores[best])
+        self.best_params = self.history.param_dict(best)
     
-    def save_results(self, params, total_time, distance, collision, tour_complete, temps_tour):
-        """Enregistre les résultats dans le fichier CSV et met à jour l'historique"""
+    def save_results(self, params, total_time, distance, collision, tour_complete, temps_tour,
+                     trial_id=None, abort_reason=None):
+        """Enregistre les résultats dans la base et met à jour l'historique
+        
+        Args:
+            trial_id: identifiant retourné par ask(). S'il est omis, l'essai en attente
+                correspondant à `params` est retrouvé automatiquement.
+            abort_reason: raison de l'arrêt anticipé du test ('immobile', 'no_progress',
+                'reverse', 'lap_time_bound', 'timeout') ou None
+        """
+        if trial_id is None:
+            trial_id = self._find_pending_trial(params)
+        trial = self.pending_trials.pop(trial_id, None)
+        if trial is not None:
+            self.pending_combinations.remove(trial['grid_id'])
+        
         # Calculer le score
         results = {
             'total_time': total_time,
             'distance': distance,
             'collision': collision,
             'tour_complete': tour_complete,
-            'temps_tour': temps_tour
+            'temps_tour': temps_tour,
+            'abort_reason': abort_reason
         }
         score = self.calculate_score(results)
+        if abort_reason is not None:
+            self.abort_counts[abort_reason] = self.abort_counts.get(abort_reason, 0) + 1
         
         # Mettre à jour le meilleur score
         if score > self.best_score:
@@ -187,68 +356,205 @@ class ParameterTester:
             self.best_params = params.copy()
         
         # Sauvegarder dans l'historique
-        self.tested_params.append(params)
-        self.results.append(results)
-        
-        # Écrire dans le fichier CSV avec 2 décimales
-        with open(self.results_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                f"{params['max_speed']:.2f}",
-                f"{params['max_steer']:.2f}",
-                f"{params['min_front_dist']:.2f}",
-                f"{params['safety_margin']:.2f}",
-                f"{params['front_angle']:.2f}",
-                f"{params['side_angle']:.2f}",
-                f"{total_time:.2f}",
-                f"{distance:.2f}",
-                collision,
-                tour_complete,
-                f"{temps_tour:.2f}" if tour_complete else 'N/A',
-                f"{score:.2f}"
-            ])
+        self.history.append(params, dict(results, score=score))
+        self.surrogate.add(self.parameters_to_array(params), score)
+        self.tested_combinations.add(self.parameters_to_array(params))
+        
+        # Écrire dans la base (par lots)
+        self.store.add(params, results, score)
         
         # Ajouter le score à l'historique
         self.score_history.append(score)
+        if time.time() - self.last_state_save >= self.state_interval:
+            self.save_state()
+        
+        # Les résultats d'une phase précédente (arrivés en retard) ne comptent pas pour la convergence
+        if trial is None or (trial['mode'] == 'exploitation' and trial['phase'] == self.phase):
+            self.convergence_scores.append(score)
+        
+        if trial_id in self.generation_trials:
+            self._record_generation_result(trial_id, params, score)
+        
+        return score
     
-    def parameters_to_array(self, params):
-        """Convertit un dictionnaire de paramètres en tableau numpy"""
-        return np.array([
-            params['max_speed'],
-            params['max_steer'],
-            params['min_front_dist'],
-            params['safety_margin'],
-            params['front_angle'],
-            params['side_angle']
-        ])
+    def _record_generation_result(self, trial_id, params, score):
+        """Met à jour CMA-ES quand tous les candidats d'une génération sont évalués"""
+        self.generation_trials.discard(trial_id)
+        self.generation_results[trial_id] = (self.parameters_to_array(params), score)
+        self._finish_generation()
     
-    def array_to_parameters(self, x):
-        """Convertit un tableau numpy en dictionnaire de paramètres"""
-        return {
-            'max_speed': np.clip(x[0], self.parameter_definitions['max_speed']['min'], 
-                               self.parameter_definitions['max_speed']['max']),
-            'max_steer': np.clip(x[1], self.parameter_definitions['max_steer']['min'], 
-                               self.parameter_definitions['max_steer']['max']),
-            'min_front_dist': np.clip(x[2], self.parameter_definitions['min_front_dist']['min'], 
-                                    self.parameter_definitions['min_front_dist']['max']),
-            'safety_margin': np.clip(x[3], self.parameter_definitions['safety_margin']['min'], 
-                                   self.parameter_definitions['safety_margin']['max']),
-            'front_angle': np.clip(x[4], self.parameter_definitions['front_angle']['min'], 
-                                 self.parameter_definitions['front_angle']['max']),
-            'side_angle': np.clip(x[5], self.parameter_definitions['side_angle']['min'], 
-                                self.parameter_definitions['side_angle']['max'])
+    def _finish_generation(self):
+        """Met à jour CMA-ES si plus aucun candidat de la génération n'est attendu"""
+        if self.generation_trials or self.generation_queue or not self.generation_results:
+            return
+        if len(self.generation_results) < self.cmaes.mu:
+            # Trop de candidats abandonnés : génération ignorée
+            self.generation_results = {}
+            return
+        X = np.array([x for x, _ in self.generation_results.values()])
+        scores = np.array([score for _, score in self.generation_results.values()])
+        self.generation_results = {}
+        self.cmaes.tell(X, scores)
+        rates = self.cmaes.rates()
+        print(f"Génération {self.cmaes.generation}: meilleur score {scores.max():.2f}, "
+              f"sigma {self.cmaes.sigma:.3f} - {rates['generations_per_hour']:.1f} générations/h, "
+              f"{rates['evaluations_per_hour']:.0f} évaluations/h")
+    
+    def ask_generation(self, max_trials=None):
+        """Propose tous les candidats restants de la génération CMA-ES courante
+        
+        Une nouvelle génération n'est tirée que lorsque la précédente est
+        entièrement évaluée ; en attendant, la liste retournée est vide.
+        
+        Returns:
+            liste de (trial_id, params)
+        """
+        if not self.generation_queue and not self.generation_trials:
+            self.generation_queue = [self.array_to_parameters(x) for x in self.cmaes.ask()]
+        count = len(self.generation_queue)
+        if max_trials is not None:
+            count = min(count, max_trials)
+        trials = []
+        for _ in range(count):
+            trial_id, params = self._register(self.generation_queue.pop(0), 'cmaes')
+            self.generation_trials.add(trial_id)
+            trials.append((trial_id, params))
+        return trials
+    
+    def ask(self):
+        """Propose un nouvel essai sans attendre le résultat des essais en cours
+        
+        Returns:
+            trial_id, params: identifiant à passer à tell() et paramètres à tester
+        """
+        if self.bayesian is not None:
+            return self.ask_batch(1)[0]
+        if self.cmaes is not None:
+            trials = self.ask_generation(max_trials=1)
+            if trials:
+                return trials[0]
+        return self._register(*self._propose())
+    
+    def ask_batch(self, q):
+        """Propose q essais à la fois (pour occuper tous les processus de travail)
+        
+        Avec la stratégie 'bayesian', le lot est choisi en une seule fois par le
+        processus gaussien en tenant compte des essais en cours.
+        
+        Returns:
+            liste de (trial_id, params)
+        """
+        trials = []
+        if self.bayesian is not None and len(self.tested_params) >= self.bayesian.min_points:
+            X = self.history.params  # Vue sur l'historique, sans copie
+            y = self.history.column('score')  # Scores de tout l'historique, base chargée comprise
+            pending = [self.parameters_to_array(trial['params']) for trial in self.pending_trials.values()]
+            best_x = self.parameters_to_array(self.best_params) if self.best_params else None
+            batch = self.bayesian.propose(
+                X, y, q,
+                pending=np.array(pending) if pending else None,
+                best_x=best_x,
+                filter_candidates=lambda C: self.tested_combinations.filter_new(
+                    C, others=(self.pending_combinations,))
+            )
+            print(f"Modèle GP ajusté en {self.bayesian.last_fit_time * 1000:.0f} ms "
+                  f"({len(X)} tests, {len(batch)} propositions)")
+            trials = [self._register(self.array_to_parameters(x), 'bayesian') for x in batch]
+        
+        # Pas assez de données pour le modèle : stratégie locale
+        while len(trials) < q:
+            trials.append(self._register(*self._propose()))
+        return trials
+    
+    def _register(self, params, mode):
+        """Enregistre un essai proposé comme en attente de résultat"""
+        trial_id = self.next_trial_id
+        self.next_trial_id += 1
+        self.pending_trials[trial_id] = {
+            'params': params,
+            'mode': mode,
+            'phase': self.phase,
+            'grid_id': self.pending_combinations.add(self.parameters_to_array(params))
         }
+        return trial_id, params
+    
+    def tell(self, trial_id, total_time, distance, collision, tour_complete, temps_tour,
+             abort_reason=None):
+        """Enregistre le résultat d'un essai proposé par ask() (dans n'importe quel ordre)
+        
+        Returns:
+            score de l'essai
+        """
+        params = self.pending_trials[trial_id]['params']
+        return self.save_results(params, total_time, distance, collision, tour_complete,
+                                 temps_tour, trial_id=trial_id, abort_reason=abort_reason)
+    
+    def best_lap(self):
+        """Meilleur tour complet de l'historique
+        
+        Returns:
+            temps_tour, distance (None, None si aucun tour complet)
+        """
+        complete = self.history.column('tour_complete')
+        if not complete.any():
+            return None, None
+        lap_times = self.history.column('temps_tour')[complete]
+        best = np.argmin(lap_times)
+        return float(lap_times[best]), float(self.history.column('distance')[complete][best])
     
-    def initialize_nelder_mead(self):
-        """Initialise l'optimisation Nelder-Mead avec les meilleurs résultats précédents"""
-        if self.best_params is None:
+    def cancel(self, trial_id):
+        """Abandonne un essai proposé par ask() qui ne sera pas évalué"""
+        trial = self.pending_trials.pop(trial_id, None)
+        if trial is None:
             return
+        self.pending_combinations.remove(trial['grid_id'])
+        if trial_id in self.generation_trials:
+            self.generation_trials.discard(trial_id)
+            self._finish_generation()
+    
+    def _find_pending_trial(self, params):
+        """Retrouve l'essai en attente correspondant à un jeu de paramètres"""
+        for trial_id, trial in self.pending_trials.items():
+            if trial['params'] is params:
+                return trial_id
+        for trial_id, trial in self.pending_trials.items():
+            if trial['params'] == params:
+                return trial_id
+        return None
+    
+    def _set_phase(self, exploration_mode):
+        """Change de phase (exploration/exploitation) et repart d'une fenêtre de convergence vide"""
+        self.exploration_mode = exploration_mode
+        self.exploration_count = 0
+        self.phase += 1
+        self.convergence_scores = []
+    
+    def is_pending_similar(self, params):
+        """Vérifie si une combinaison similaire est déjà en cours d'évaluation"""
+        return self.pending_combinations.contains(self.parameters_to_array(params))
+    
+    def parameters_to_array(self, params):
+        """Convertit un dictionnaire (ou une liste de dictionnaires) de paramètres en tableau numpy"""
+        return self.space.encode(params)
+    
+    def array_to_parameters(self, x):
+        """Convertit un tableau numpy en dictionnaire de paramètres (dans les bornes)"""
+        return self.space.decode(self.space.clip(x))
+    
+    def initialize_nelder_mead(self, x0, surrogate, best_score):
+        """Initialise l'optimisation Nelder-Mead avec les meilleurs résultats précédents
         
-        self.using_nelder_mead = True
-        x0 = self.parameters_to_array(self.best_params)
+        Exécutée dans un thread d'arrière-plan au démarrage : le score estimé est
+        calculé sur une copie de l'historique, prise avant le lancement du thread.
         
+        Args:
+            x0: meilleurs paramètres connus (tableau)
+            surrogate: copie du SurrogateIndex des tests effectués
+            best_score: meilleur score connu (estimation loin de tout test)
+        """
         # Définir les bornes pour chaque paramètre
-        bounds = [(params['min'], params['max']) for params in self.parameter_definitions.values()]
+        lower, upper = self.space.lower, self.space.upper
+        bounds = list(zip(lower, upper))
         
         # Calculer l'échelle initiale pour chaque paramètre (10% de la plage)
         initial_simplex = []
@@ -260,8 +566,11 @@ class ParameterTester:
         initial_simplex = [x0] + initial_simplex
         
         # Lancer l'optimisation Nelder-Mead avec des paramètres ajustés
-        self.nelder_mead_result = minimize(
-            lambda x: -self.estimate_score(x),  # Négation car on veut maximiser
+        # (scipy n'est chargé qu'ici, dans le thread de Nelder-Mead)
+        from scipy.optimize import minimize
+        result = minimize(
+            # Négation car on veut maximiser
+            lambda x: -surrogate.estimate(np.clip(x, lower, upper)[None, :], default=best_score)[0],
             x0,
             method='Nelder-Mead',
             bounds=bounds,
@@ -272,55 +581,62 @@ class ParameterTester:
                 'fatol': 1e-3,       # Tolérance plus large sur f
                 'adaptive': True,     # Adaptation automatique du simplexe
                 'initial_simplex': initial_simplex,  # Simplexe initial personnalisé
-                'disp': True
+                'disp': False
             }
         )
+        self.nelder_mead_result = result
+        self.using_nelder_mead = True
     
     def estimate_score(self, x):
         """Estime le score pour un jeu de paramètres donné"""
-        params = self.array_to_parameters(x)
-        
-        # Chercher les tests similaires dans l'historique
-        scores = []
-        weights = []
-        
-        for test_params, result in zip(self.tested_params, self.results):
-            # Calculer la distance euclidienne entre les paramètres
-            distance = np.sqrt(sum(
-                ((params[k] - test_params[k]) / (self.parameter_definitions[k]['max'] - self.parameter_definitions[k]['min'])) ** 2
-                for k in params.keys()
-            ))
-            
-            if distance < 0.2:  # Seulement considérer les tests proches
-                weight = 1 / (1 + distance)  # Plus le test est proche, plus il a de poids
-                scores.append(self.calculate_score(result))
-                weights.append(weight)
+        return self.estimate_scores(np.asarray(x)[None, :])[0]
+    
+    def estimate_scores(self, X):
+        """Estime le score de plusieurs jeux de paramètres à la fois
         
-        if not scores:
-            return self.best_score  # Retourner le meilleur score connu si pas de données similaires
+        Moyenne des scores des tests proches (distance normalisée < 0.2), pondérée
+        par 1 / (1 + distance) ; le meilleur score connu si aucun test n'est proche.
         
-        # Retourner la moyenne pondérée des scores
-        return np.average(scores, weights=weights)
+        Args:
+            X: tableau [nb_candidats, nb_paramètres]
+        """
+        X = self.space.clip(np.atleast_2d(X))
+        return self.surrogate.estimate(X, default=self.best_score)
     
     def parameters_to_key(self, params):
         """Convertit un dictionnaire de paramètres en une chaîne unique pour le cache"""
         return "|".join(f"{k}:{v:.3f}" for k, v in sorted(params.items()))
 
-    def is_similar_combination(self, params, threshold=0.01):
-        """Vérifie si une combinaison similaire a déjà été testée"""
-        params_array = self.parameters_to_array(params)
-        for tested_params in self.tested_params:
-            tested_array = self.parameters_to_array(tested_params)
-            if np.allclose(params_array, tested_array, rtol=threshold, atol=threshold):
-                return True
-        return False
+    def is_similar_combination(self, params):
+        """Vérifie si une combinaison similaire (écart < 1% de chaque plage) a déjà été testée"""
+        return self.tested_combinations.contains(self.parameters_to_array(params))
+    
+    def filter_new_candidates(self, candidates):
+        """Retire d'une population les candidats déjà testés, en cours d'évaluation
+        ou similaires à un autre candidat de la population
+        
+        Args:
+            candidates: liste de dictionnaires de paramètres
+        
+        Returns:
+            liste des candidats retenus (dans l'ordre d'origine)
+        """
+        if not candidates:
+            return []
+        X = self.space.encode(candidates)
+        keep = self.tested_combinations.filter_new(X, others=(self.pending_combinations,))
+        return [params for params, kept in zip(candidates, keep) if kept]
 
     def is_converging(self):
-        """Vérifie si l'algorithme converge en analysant l'historique des scores"""
-        if len(self.score_history) < self.convergence_window:
+        """Vérifie si l'algorithme converge en analysant l'historique des scores
+        
+        Seuls les scores des essais d'exploitation proposés depuis le dernier
+        changement de phase sont pris en compte.
+        """
+        if len(self.convergence_scores) < self.convergence_window:
             return False
             
-        recent_scores = self.score_history[-self.convergence_window:]
+        recent_scores = self.convergence_scores[-self.convergence_window:]
         score_variation = np.std(recent_scores)
         mean_score = np.mean(recent_scores)
         
@@ -330,58 +646,56 @@ class ParameterTester:
         return score_variation < self.convergence_threshold and mean_score > 0
 
     def get_random_parameters(self):
-        """Génère des paramètres complètement aléatoires"""
-        params = {}
-        for name, config in self.parameter_definitions.items():
-            min_val = config['min']
-            max_val = config['max']
-            # Utiliser une distribution uniforme pour l'exploration
-            params[name] = min_val + (max_val - min_val) * np.random.random()
-        return params
+        """Génère des paramètres complètement aléatoires (uniformes dans les plages)"""
+        return self.space.decode(self.space.sample(1)[0])
 
     def get_next_parameters(self):
         """Retourne les prochains paramètres à tester"""
+        _, params = self.ask()
+        return params
+    
+    def _propose(self, max_attempts=10):
+        """Génère les prochains paramètres à tester en tenant compte des essais en cours
+        
+        Returns:
+            params, mode: paramètres et mode ('exploration' ou 'exploitation')
+        """
         if self.exploration_mode:
             # Mode exploration : générer des paramètres aléatoires
             self.exploration_count += 1
             if self.exploration_count >= self.max_exploration_tests:
-                self.exploration_mode = False
-                self.exploration_count = 0
+                self._set_phase(exploration_mode=False)
                 print("Fin de la phase d'exploration, retour à l'optimisation normale")
             else:
                 print(f"Mode exploration ({self.exploration_count}/{self.max_exploration_tests})")
-            return self.get_random_parameters()
+            return self.get_random_parameters(), 'exploration'
         
         # Vérifier la convergence
         if self.is_converging() and not self.exploration_mode:
             print("Convergence détectée, passage en mode exploration")
-            self.exploration_mode = True
-            self.exploration_count = 0
-            return self.get_random_parameters()
+            self._set_phase(exploration_mode=True)
+            return self.get_random_parameters(), 'exploration'
         
         # Optimisation normale avec Nelder-Mead modifié
         if not self.best_params:
-            # Premier test : paramètres au milieu des plages
-            params = {}
-            for name, config in self.parameter_definitions.items():
-                params[name] = (config['min'] + config['max']) / 2
-            return params
-        
-        # Générer de nouveaux paramètres basés sur les meilleurs résultats
-        new_params = {}
-        for name, config in self.parameter_definitions.items():
-            current_value = self.best_params[name]
-            step = config['step']
-            
-            # Ajout d'une petite perturbation aléatoire
-            perturbation = np.random.normal(0, step/2)
-            new_value = current_value + perturbation
-            
-            # S'assurer que la valeur reste dans les limites
-            new_value = max(config['min'], min(config['max'], new_value))
-            new_params[name] = new_value
+            # Premier test : paramètres au milieu des plages, puis aléatoires
+            # tant qu'aucun résultat n'est connu
+            params = self.space.decode(self.space.center())
+            if self.is_pending_similar(params):
+                params = self.get_random_parameters()
+            return params, 'exploitation'
+        
+        # Générer de nouveaux paramètres basés sur les meilleurs résultats (petite
+        # perturbation aléatoire de chaque paramètre, dans les limites), en tirant
+        # max_attempts candidats d'un coup : le premier qui n'est ni testé ni en
+        # cours d'évaluation est retenu
+        x0 = self.space.encode(self.best_params)
+        candidates = self.space.clip(
+            x0 + np.random.normal(0, self.space.steps / 2, (max_attempts, len(self.space))))
+        keep = self.tested_combinations.filter_new(candidates, others=(self.pending_combinations,))
+        new_index = int(np.argmax(keep)) if keep.any() else max_attempts - 1
         
-        return new_params
+        return self.space.decode(candidates[new_index]), 'exploitation'
 
     def get_total_combinations(self):
         """Calcule le nombre total de combinaisons possibles"""
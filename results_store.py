@@ -0,0 +1,255 @@
+import argparse
+import atexit
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+# Fichier CSV produit pour visualize_results.py (jamais réimporté)
+EXPORT_FILE = 'parameter_test_results_export.csv'
+
+RESULT_COLUMNS = ['temps_total', 'distance_parcourue', 'collision', 'tour_complete',
+                  'temps_tour', 'score']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    param_hash TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    total_time REAL NOT NULL,
+    distance REAL NOT NULL,
+    collision INTEGER NOT NULL,
+    tour_complete INTEGER NOT NULL,
+    temps_tour REAL,
+    score REAL NOT NULL,
+    abort_reason TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_config_score ON results (config_hash, score);
+CREATE INDEX IF NOT EXISTS idx_results_param ON results (param_hash, config_hash);
+CREATE TABLE IF NOT EXISTS configs (
+    config_hash TEXT PRIMARY KEY,
+    description TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imported_files (
+    name TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+def parameter_hash(params):
+    """Empreinte d'un jeu de paramètres (indépendante de l'ordre des clés)"""
+    description = json.dumps({name: round(float(value), 6) for name, value in params.items()},
+                             sort_keys=True)
+    return hashlib.sha1(description.encode()).hexdigest()
+
+
+def config_hash(config):
+    """Empreinte de la configuration de simulation (simulateur, carte, pas de temps...)"""
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+class ResultsStore:
+    def __init__(self, path, param_names, config=None, batch_size=32, flush_interval=2.0):
+        """Historique des tests dans une base SQLite (mode WAL)
+
+        Chaque résultat est indexé par l'empreinte de ses paramètres et celle de
+        la configuration de simulation : l'historique n'est plus réinitialisé
+        chaque jour et les résultats de configurations différentes ne se
+        mélangent pas. Les insertions sont regroupées en transactions ; le mode
+        WAL permet à plusieurs processus d'écrire dans la même base.
+
+        Args:
+            path: fichier de la base SQLite
+            param_names: noms des paramètres (ordre des colonnes de l'export CSV)
+            config: dict décrivant la configuration de simulation
+            batch_size: nombre de résultats regroupés par transaction
+            flush_interval: délai maximal (s) avant l'écriture des résultats en attente
+        """
+        self.path = path
+        self.param_names = list(param_names)
+        self.config = config if config is not None else {}
+        self.config_hash = config_hash(self.config)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.time()
+
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self.conn.execute('INSERT OR IGNORE INTO configs VALUES (?, ?)',
+                              (self.config_hash, json.dumps(self.config, sort_keys=True)))
+        atexit.register(self.close)
+
+    def add(self, params, results, score, created_at=None):
+        """Ajoute un résultat (écrit par lot, voir flush)"""
+        temps_tour = results['temps_tour'] if results['tour_complete'] else None
+        self.buffer.append((
+            parameter_hash(params),
+            self.config_hash,
+            json.dumps({name: float(value) for name, value in params.items()}),
+            float(results['total_time']),
+            float(results['distance']),
+            int(bool(results['collision'])),
+            int(bool(results['tour_complete'])),
+            float(temps_tour) if temps_tour is not None else None,
+            float(score),
+            results.get('abort_reason'),
+            created_at or datetime.now().isoformat(timespec='seconds')
+        ))
+        if len(self.buffer) >= self.batch_size or time.time() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Écrit les résultats en attente en une seule transaction"""
+        self.last_flush = time.time()
+        if not self.buffer or self.conn is None:
+            return
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO results (param_hash, config_hash, params, total_time, distance, '
+                'collision, tour_complete, temps_tour, score, abort_reason, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                self.buffer)
+        self.buffer = []
+
+    def close(self):
+        """Écrit les résultats en attente et ferme la base"""
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
+
+    def load(self):
+        """Résultats de la configuration courante, dans l'ordre d'enregistrement
+
+        Returns:
+            liste de (params, results, score)
+        """
+        self.flush()
+        rows = self.conn.execute(
+            'SELECT params, total_time, distance, collision, tour_complete, temps_tour, score, '
+            'abort_reason FROM results WHERE config_hash = ? ORDER BY id',
+            (self.config_hash,))
+        history = []
+        for params, total_time, distance, collision, tour_complete, temps_tour, score, abort_reason in rows:
+            results = {
+                'total_time': total_time,
+                'distance': distance,
+                'collision': bool(collision),
+                'tour_complete': bool(tour_complete),
+                'temps_tour': temps_tour,
+                'abort_reason': abort_reason
+            }
+            history.append((json.loads(params), results, score))
+        return history
+
+    def best(self, limit=10):
+        """Meilleurs résultats de la configuration courante (params, score)"""
+        self.flush()
+        rows = self.conn.execute(
+            'SELECT params, score FROM results WHERE config_hash = ? ORDER BY score DESC LIMIT ?',
+            (self.config_hash, limit))
+        return [(json.loads(params), score) for params, score in rows]
+
+    def count(self):
+        """Nombre de résultats de la configuration courante"""
+        self.flush()
+        return self.conn.execute('SELECT COUNT(*) FROM results WHERE config_hash = ?',
+                                 (self.config_hash,)).fetchone()[0]
+
+    def import_csv(self, path):
+        """Importe un ancien fichier parameter_test_results_AAAAMMJJ.csv (une seule fois)
+
+        Les résultats sont rattachés à la configuration courante ; le score
+        enregistré dans le fichier est conservé.
+
+        Returns:
+            nombre de résultats importés
+        """
+        name = os.path.basename(path)
+        if self.conn.execute('SELECT 1 FROM imported_files WHERE name = ?', (name,)).fetchone():
+            return 0
+        date = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec='seconds')
+        imported = 0
+        with open(path, 'r') as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith('#') or row[0] == self.param_names[0]:
+                    continue
+                if len(row) != len(self.param_names) + len(RESULT_COLUMNS):
+                    continue
+                n = len(self.param_names)
+                params = {name: float(value) for name, value in zip(self.param_names, row[:n])}
+                tour_complete = row[n + 3].lower() == 'true'
+                results = {
+                    'total_time': float(row[n]),
+                    'distance': float(row[n + 1]),
+                    'collision': row[n + 2].lower() == 'true',
+                    'tour_complete': tour_complete,
+                    'temps_tour': float(row[n + 4]) if tour_complete else None
+                }
+                self.add(params, results, float(row[n + 5]), created_at=date)
+                imported += 1
+        self.flush()
+        with self.conn:
+            self.conn.execute('INSERT INTO imported_files VALUES (?, ?)',
+                              (name, datetime.now().isoformat(timespec='seconds')))
+        return imported
+
+    def export_csv(self, path=EXPORT_FILE, parameter_definitions=None):
+        """Exporte les résultats de la configuration courante au format CSV historique
+        (lu par visualize_results.py)
+
+        Returns:
+            nombre de résultats exportés
+        """
+        history = self.load()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            if parameter_definitions is not None:
+                writer.writerow(['# Plages de paramètres:'])
+                for name, definition in parameter_definitions.items():
+                    writer.writerow([
+                        f'# {name}: min={definition["min"]}, max={definition["max"]}, '
+                        f'step={definition["step"]}'
+                    ])
+                writer.writerow(['#'])
+            writer.writerow(self.param_names + RESULT_COLUMNS)
+            for params, results, score in history:
+                writer.writerow(
+                    [f"{params[name]:.2f}" for name in self.param_names] + [
+                        f"{results['total_time']:.2f}",
+                        f"{results['distance']:.2f}",
+                        results['collision'],
+                        results['tour_complete'],
+                        f"{results['temps_tour']:.2f}" if results['tour_complete'] else 'N/A',
+                        f"{score:.2f}"
+                    ])
+        return len(history)
+
+
+if __name__ == '__main__':
+    from parameter_tester import PARAMETER_NAMES, RESULTS_DB, DEFAULT_CONFIG
+
+    parser = argparse.ArgumentParser(description="Base des résultats de ParameterTester")
+    parser.add_argument('--db', default=RESULTS_DB, help="fichier de la base SQLite")
+    parser.add_argument('--export', nargs='?', const=EXPORT_FILE,
+                        help="exporter les résultats au format CSV")
+    parser.add_argument('--best', type=int, default=0, help="afficher les N meilleurs résultats")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db, PARAMETER_NAMES, DEFAULT_CONFIG)
+    print(f"{store.count()} résultats pour la configuration {store.config}")
+    if args.export:
+        print(f"{store.export_csv(args.export)} résultats exportés dans {args.export}")
+    for params, score in store.best(args.best) if args.best else []:
+        print(f"{score:.2f}: " + ", ".join(f"{name}={value:.3f}" for name, value in params.items()))
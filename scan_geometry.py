@@ -0,0 +1,23 @@
+import numpy as np
+
+# Géométrie du lidar f110_gym par défaut
+F110_NUM_BEAMS = 1080
+F110_FOV = 4.7
+
+
+def resample_scan(ranges, angles, target_angles, fill=0.0):
+    """Rééchantillonne un scan (plus proche voisin) sur une autre géométrie de lidar
+
+    Les rayons cibles hors du champ de vision de la source reçoivent `fill`.
+    """
+    increment = (angles[-1] - angles[0]) / (len(angles) - 1)
+    full_circle = angles[-1] - angles[0] + increment >= 2 * np.pi - 1e-6
+    offset = np.mod(target_angles - angles[0], 2 * np.pi)
+    indices = np.rint(offset / increment).astype(int)
+    valid = (indices >= 0) & (indices < len(angles))
+    if full_circle:
+        indices %= len(angles)
+        valid[:] = True
+    resampled = np.full(len(target_angles), fill, dtype=float)
+    resampled[valid] = ranges[indices[valid]]
+    return resampled
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class CircularSector:
+    """Secteur angulaire d'un scan lidar, défini en degrés
+
+    Le secteur [start_deg, end_deg] est parcouru dans le sens des indices
+    croissants ; si end_deg < start_deg il passe par 360°. Pour chaque nombre de
+    rayons, les indices correspondants sont calculés une seule fois et mis en
+    cache sous forme d'au plus deux tranches contiguës (deux quand le secteur
+    passe par la fin du scan). Les réductions travaillent directement sur ces
+    vues, sans copier le scan.
+
+    Un rayon d'indice i est à l'angle angle_min_deg + i * 360 / N pour un scan
+    circulaire (fov_deg=360), et angle_min_deg + i * fov_deg / (N - 1) sinon. Un
+    scan partiel ne reboucle pas : le secteur est tronqué au champ de vision.
+    """
+
+    def __init__(self, start_deg, end_deg, angle_min_deg=0.0, fov_deg=360.0):
+        """
+        Args:
+            start_deg: angle de début du secteur (degrés)
+            end_deg: angle de fin du secteur (degrés)
+            angle_min_deg: angle du premier rayon du scan (degrés)
+            fov_deg: champ de vision du scan (degrés, 360 = scan circulaire)
+        """
+        self.start_deg = start_deg
+        self.end_deg = end_deg if end_deg >= start_deg else end_deg + 360.0
+        self.angle_min_deg = angle_min_deg
+        self.fov_deg = fov_deg
+        self.circular = fov_deg >= 360.0
+        self._segments = {}
+
+    def segments(self, num_beams):
+        """Retourne les tranches d'indices du secteur pour un scan de num_beams rayons"""
+        cached = self._segments.get(num_beams)
+        if cached is not None:
+            return cached
+
+        if self.circular:
+            increment = 360.0 / num_beams
+        else:
+            increment = self.fov_deg / max(num_beams - 1, 1)
+        start = (self.start_deg - self.angle_min_deg) / increment
+        end = (self.end_deg - self.angle_min_deg) / increment
+        # Rayons d'indice ceil(start) à floor(end) exclu (tolérance sur les arrondis)
+        lo = int(np.ceil(start - 1e-9))
+        hi = int(np.floor(end + 1e-9))
+
+        if self.circular:
+            length = min(max(hi - lo, 0), num_beams)
+            lo %= num_beams
+            if lo + length <= num_beams:
+                segments = (slice(lo, lo + length),)
+            else:
+                segments = (slice(lo, num_beams), slice(0, lo + length - num_beams))
+        else:
+            lo = min(max(lo, 0), num_beams)
+            hi = min(max(hi, lo), num_beams)
+            segments = (slice(lo, hi),)
+
+        segments = tuple(s for s in segments if s.stop > s.start)
+        self._segments[num_beams] = segments
+        return segments
+
+    def indices(self, num_beams):
+        """Retourne les indices des rayons du secteur (copie, pour l'affichage ou le débogage)"""
+        parts = [np.arange(s.start, s.stop) for s in self.segments(num_beams)]
+        return np.concatenate(parts) if parts else np.array([], dtype=int)
+
+    def size(self, num_beams):
+        """Nombre de rayons dans le secteur"""
+        return sum(s.stop - s.start for s in self.segments(num_beams))
+
+    def views(self, ranges):
+        """Retourne les vues (sans copie) du scan couvertes par le secteur"""
+        return [ranges[s] for s in self.segments(len(ranges))]
+
+    def min(self, ranges, default=np.inf):
+        """Distance minimale dans le secteur"""
+        views = self.views(ranges)
+        if not views:
+            return default
+        return min(np.min(v) for v in views)
+
+    def mean(self, ranges, default=np.inf, below=None):
+        """Distance moyenne dans le secteur
+
+        Args:
+            default: valeur retournée si aucun rayon n'est retenu
+            below: si donné, seuls les rayons de distance < below sont moyennés
+        """
+        total = 0.0
+        count = 0
+        for v in self.views(ranges):
+            if below is None:
+                total += np.sum(v)
+                count += len(v)
+            else:
+                mask = v < below
+                total += np.sum(v, where=mask)
+                count += np.count_nonzero(mask)
+        if count == 0:
+            return default
+        return total / count
+
+    def percentile(self, ranges, q, default=np.inf):
+        """Percentile q (0-100) des distances du secteur"""
+        views = self.views(ranges)
+        if not views:
+            return default
+        values = views[0] if len(views) == 1 else np.concatenate(views)
+        return np.percentile(values, q)
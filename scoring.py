@@ -0,0 +1,70 @@
+import numpy as np
+
+# Fonctions de score disponibles, par nom
+SCORERS = {}
+
+
+def register_scorer(name):
+    """Enregistre une fonction de score sous un nom (décorateur)
+
+    Une fonction de score reçoit un dict de colonnes de métriques (tableaux
+    NumPy de même longueur : collision, tour_complete, temps_tour, distance,
+    total_time) et retourne le tableau des scores (plus grand = meilleur).
+    """
+    def decorator(function):
+        SCORERS[name] = function
+        return function
+    return decorator
+
+
+def get_scorer(name):
+    """Fonction de score enregistrée sous ce nom"""
+    if name not in SCORERS:
+        raise ValueError(f"Score inconnu: {name} (disponibles: {', '.join(sorted(SCORERS))})")
+    return SCORERS[name]
+
+
+def score_one(scorer, results):
+    """Score d'un seul résultat (dict de métriques)"""
+    columns = {name: np.asarray([value if value is not None else np.nan])
+               for name, value in results.items() if not isinstance(value, str)}
+    return float(scorer(columns)[0])
+
+
+@register_scorer('lap_time')
+def lap_time_score(columns):
+    """Score historique : tour complet classé par son temps, tour incomplet par la
+    distance parcourue, collision éliminatoire"""
+    collision = np.asarray(columns['collision'], dtype=bool)
+    complete = np.asarray(columns['tour_complete'], dtype=bool)
+    scores = np.where(complete,
+                      10000 - np.asarray(columns['temps_tour'], dtype=float) * 10,
+                      -1000 + np.asarray(columns['distance'], dtype=float))
+    return np.where(collision, -1000.0, scores)
+
+
+@register_scorer('progress')
+def progress_score(columns):
+    """Comme lap_time, mais une collision garde la distance parcourue avant le choc
+    (pénalité de 500) pour départager les essais qui n'ont jamais fini un tour"""
+    collision = np.asarray(columns['collision'], dtype=bool)
+    complete = np.asarray(columns['tour_complete'], dtype=bool)
+    distance = np.asarray(columns['distance'], dtype=float)
+    scores = np.where(complete,
+                      10000 - np.asarray(columns['temps_tour'], dtype=float) * 10,
+                      -1000 + distance)
+    return np.where(collision, -1500 + distance, scores)
+
+
+@register_scorer('mean_speed')
+def mean_speed_score(columns):
+    """Tour complet classé par sa vitesse moyenne (distance / temps), sinon par la
+    distance parcourue ; collision éliminatoire"""
+    collision = np.asarray(columns['collision'], dtype=bool)
+    complete = np.asarray(columns['tour_complete'], dtype=bool)
+    distance = np.asarray(columns['distance'], dtype=float)
+    lap_time = np.asarray(columns['temps_tour'], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = np.where(complete & (lap_time > 0), distance / lap_time, 0.0)
+    scores = np.where(complete, 10000 + 100 * speed, -1000 + distance)
+    return np.where(collision, -1000.0, scores)
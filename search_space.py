@@ -0,0 +1,129 @@
+import numpy as np
+
+
+class SearchSpace:
+    """Espace de recherche des paramètres d'un navigateur
+
+    Construit à partir de définitions {nom: {'min', 'max', 'step', 'log',
+    'integer'}} ('step', 'log' et 'integer' sont optionnels). Toutes les
+    conversions travaillent sur des populations entières : un tableau [N, d]
+    (ou [d] pour un seul jeu de paramètres), dans l'ordre des définitions.
+
+    - Une dimension logarithmique ('log': True) est échantillonnée et
+      normalisée en échelle log ; son pas, s'il est donné, est un facteur
+      multiplicatif (2 = valeurs doublées à chaque pas).
+    - Une dimension entière ('integer': True) est arrondie à l'entier le plus proche.
+    """
+
+    def __init__(self, definitions):
+        """
+        Args:
+            definitions: dict nom -> {'min', 'max'[, 'step', 'log', 'integer']}
+        """
+        self.definitions = definitions
+        self.names = list(definitions.keys())
+        self.lower = np.array([d['min'] for d in definitions.values()], dtype=float)
+        self.upper = np.array([d['max'] for d in definitions.values()], dtype=float)
+        self.steps = np.array([d.get('step', np.nan) for d in definitions.values()], dtype=float)
+        self.log = np.array([bool(d.get('log', False)) for d in definitions.values()])
+        self.integer = np.array([bool(d.get('integer', False)) for d in definitions.values()])
+        if np.any(self.log & (self.lower <= 0)):
+            raise ValueError("Une dimension logarithmique doit avoir un minimum strictement positif")
+
+        # Bornes dans l'espace de travail (log pour les dimensions logarithmiques)
+        self._low = np.where(self.log, np.log(np.where(self.log, self.lower, 1.0)), self.lower)
+        self._high = np.where(self.log, np.log(np.where(self.log, self.upper, 1.0)), self.upper)
+        span = self._high - self._low
+        self._scale = np.divide(1.0, span, out=np.zeros_like(span), where=span > 0)
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """Espace construit à partir de plages (min, max, pas) par paramètre"""
+        return cls({name: {'min': low, 'max': high, 'step': step}
+                    for name, (low, high, step) in ranges.items()})
+
+    def __len__(self):
+        return len(self.names)
+
+    def encode(self, params):
+        """Dict (ou liste de dicts) de paramètres -> tableau [d] (ou [N, d])"""
+        if isinstance(params, dict):
+            return np.array([params[name] for name in self.names], dtype=float)
+        return np.array([[p[name] for name in self.names] for p in params],
+                        dtype=float).reshape(len(params), len(self.names))
+
+    def decode(self, X):
+        """Tableau [d] (ou [N, d]) -> dict (ou liste de dicts) de paramètres"""
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            return {name: int(value) if integer else float(value)
+                    for name, value, integer in zip(self.names, X, self.integer)}
+        return [self.decode(x) for x in X]
+
+    def clip(self, X):
+        """Ramène des paramètres dans les bornes (et arrondit les dimensions entières)"""
+        X = np.clip(np.asarray(X, dtype=float), self.lower, self.upper)
+        return np.where(self.integer, np.round(X), X)
+
+    def quantize(self, X):
+        """Arrondit des paramètres à la grille des pas (puis les ramène dans les bornes)"""
+        X = np.asarray(X, dtype=float)
+        has_step = ~np.isnan(self.steps)
+        steps = np.where(has_step, self.steps, 1.0)
+        linear = self.lower + np.round((X - self.lower) / steps) * steps
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.log(np.where(self.log & has_step, steps, np.e))
+            exponent = np.round(np.log(np.maximum(X, 1e-300) / self.lower) / ratio)
+            geometric = self.lower * np.exp(exponent * ratio)
+        X = np.where(has_step, np.where(self.log, geometric, linear), X)
+        return self.clip(X)
+
+    def to_unit(self, X):
+        """Paramètres -> coordonnées normalisées dans [0, 1] (échelle log si demandé)"""
+        X = np.asarray(X, dtype=float)
+        work = np.where(self.log, np.log(np.maximum(X, 1e-300)), X)
+        return (work - self._low) * self._scale
+
+    def from_unit(self, U):
+        """Coordonnées normalisées dans [0, 1] -> paramètres (dans les bornes)"""
+        work = self._low + np.asarray(U, dtype=float) * (self._high - self._low)
+        return self.clip(np.where(self.log, np.exp(work), work))
+
+    def sample(self, n, rng=None):
+        """n jeux de paramètres tirés uniformément (log-uniformément en échelle log)
+
+        Returns:
+            tableau [n, d]
+        """
+        rng = rng if rng is not None else np.random
+        return self.from_unit(rng.random((n, len(self.names))))
+
+    def center(self):
+        """Milieu de l'espace (en échelle log pour les dimensions logarithmiques)"""
+        return self.from_unit(np.full(len(self.names), 0.5))
+
+    def grid_values(self):
+        """Valeurs de la grille de chaque paramètre (dict nom -> liste), selon son pas"""
+        grid = {}
+        for i, name in enumerate(self.names):
+            low, high, step = self.lower[i], self.upper[i], self.steps[i]
+            if np.isnan(step):
+                values = np.array([low]) if high == low else np.array([low, high])
+            elif self.log[i]:
+                count = int(np.floor(np.log(high / low) / np.log(step) + 1e-9)) + 1 if high > low else 1
+                values = np.minimum(low * step ** np.arange(count), high)
+            else:
+                # Jamais au-delà de la borne haute quand l'étendue n'est pas un multiple du pas
+                count = int(np.floor((high - low) / step + 1e-9)) + 1 if high > low else 1
+                values = np.minimum(low + step * np.arange(count), high)
+            if self.integer[i]:
+                values = np.unique(np.round(values)).astype(int)
+            grid[name] = values.tolist()
+        return grid
+
+    def total_combinations(self):
+        """Nombre de combinaisons de la grille"""
+        total = 1
+        for values in self.grid_values().values():
+            total *= len(values)
+        return total
@@ -0,0 +1,201 @@
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+# En-tête d'un anneau : numéro du dernier message publié, indicateur de fermeture
+HEAD, CLOSED = 0, 1
+
+
+class SharedRing:
+    """Anneau de messages de taille fixe en mémoire partagée (un seul producteur)
+
+    Chaque message est un ensemble de champs float64 de formes fixes, écrits
+    directement dans un des slots préalloués : rien n'est sérialisé. Le
+    producteur protège chaque slot par un compteur de séquence (seqlock) :
+    impair pendant l'écriture du message n, pair (2n) une fois le message
+    complet. Un lecteur copie le slot puis relit le compteur ; s'il a changé,
+    le message a été réécrit pendant la lecture et la lecture est recommencée.
+    """
+
+    def __init__(self, fields, slots=8, name=None):
+        """
+        Args:
+            fields: dict nom -> forme (tuple) des champs d'un message
+            slots: nombre de messages conservés
+            name: nom d'un segment existant à rattacher (None = en créer un)
+        """
+        self.fields = {field: tuple(shape) for field, shape in fields.items()}
+        self.slots = slots
+        sizes = [slots * int(np.prod(shape, dtype=int)) for shape in self.fields.values()]
+        nbytes = 8 * (2 + slots + sum(sizes))
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=nbytes)
+
+        self.header = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf)
+        self.sequences = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf, offset=16)
+        self.arrays = {}
+        offset = 16 + 8 * slots
+        for (field, shape), size in zip(self.fields.items(), sizes):
+            self.arrays[field] = np.ndarray((slots,) + shape, dtype=np.float64,
+                                            buffer=self.shm.buf, offset=offset)
+            offset += 8 * size
+        if self.owner:
+            self.header[:] = 0
+            self.sequences[:] = 0
+
+    @property
+    def spec(self):
+        """Description transmissible à un autre processus (voir attach)"""
+        return {'name': self.shm.name, 'fields': self.fields, 'slots': self.slots}
+
+    @classmethod
+    def attach(cls, spec):
+        """Rattache un anneau créé par un autre processus"""
+        return cls(spec['fields'], spec['slots'], name=spec['name'])
+
+    @property
+    def head(self):
+        """Numéro du dernier message publié (0 = aucun)"""
+        return int(self.header[HEAD])
+
+    @property
+    def closed(self):
+        return bool(self.header[CLOSED])
+
+    def publish(self, **values):
+        """Écrit un message dans le slot suivant
+
+        Returns:
+            numéro du message
+        """
+        seq = int(self.header[HEAD]) + 1
+        slot = (seq - 1) % self.slots
+        self.sequences[slot] = 2 * seq - 1
+        for field, value in values.items():
+            self.arrays[field][slot] = value
+        self.sequences[slot] = 2 * seq
+        self.header[HEAD] = seq
+        return seq
+
+    def read(self, seq):
+        """Copie du message seq, ou None s'il a déjà été écrasé (ou n'existe pas encore)"""
+        slot = (seq - 1) % self.slots
+        while True:
+            before = int(self.sequences[slot])
+            if before != 2 * seq:
+                if before == 2 * seq - 1:
+                    continue  # Écriture en cours
+                return None
+            message = {field: array[slot].copy() for field, array in self.arrays.items()}
+            if int(self.sequences[slot]) == before:
+                return message
+
+    def latest(self, after=0, timeout=None, poll_interval=1e-4):
+        """Dernier message publié après le message after
+
+        Attend au plus timeout secondes (None = indéfiniment) qu'il y en ait un.
+
+        Returns:
+            (numéro, message), ou None si l'attente expire ou si l'anneau est fermé
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            seq = self.head
+            if seq > after:
+                message = self.read(seq)
+                if message is not None:
+                    return seq, message
+                continue  # Écrasé pendant la lecture : relire le plus récent
+            if self.closed or (deadline is not None and time.monotonic() >= deadline):
+                return None
+            time.sleep(poll_interval)
+
+    def close(self):
+        """Signale la fin aux lecteurs"""
+        self.header[CLOSED] = 1
+
+    def release(self):
+        """Libère le segment (supprimé par le processus qui l'a créé)"""
+        self.header = self.sequences = None
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SimulationChannel:
+    """Canal en mémoire partagée entre un simulateur et un contrôleur
+
+    Le simulateur publie les observations (temps simulé, pose, scan et valeurs
+    supplémentaires), le contrôleur les actions calculées, chacune rattachée au
+    numéro de l'observation dont elle est issue. Les scans passent d'un
+    processus à l'autre sans sérialisation ni copie dans un tube.
+    """
+
+    def __init__(self, scan_shape, action_shape=(2,), extra_size=0, slots=8, spec=None):
+        """
+        Args:
+            scan_shape: forme d'un scan ((rayons,) pour f110, (rayons, 2) pour custom_sim)
+            action_shape: forme d'une action
+            extra_size: nombre de valeurs supplémentaires par observation
+            slots: nombre de messages conservés dans chaque anneau
+            spec: description d'un canal existant à rattacher (voir attach)
+        """
+        self.scan_shape = tuple(scan_shape)
+        self.action_shape = tuple(action_shape)
+        if spec is None:
+            self.observations = SharedRing({'time': (), 'pose': (3,), 'scan': self.scan_shape,
+                                            'extra': (extra_size,)}, slots)
+            self.actions = SharedRing({'time': (), 'observation': (),
+                                       'action': self.action_shape}, slots)
+        else:
+            self.observations = SharedRing.attach(spec['observations'])
+            self.actions = SharedRing.attach(spec['actions'])
+
+    @property
+    def spec(self):
+        """Description transmissible à un autre processus (voir attach)"""
+        return {'scan_shape': self.scan_shape, 'action_shape': self.action_shape,
+                'observations': self.observations.spec, 'actions': self.actions.spec}
+
+    @classmethod
+    def attach(cls, spec):
+        """Rattache le canal créé par un autre processus"""
+        return cls(spec['scan_shape'], spec['action_shape'], spec=spec)
+
+    def publish_observation(self, scan, pose, sim_time, extra=()):
+        """Publie une observation (côté simulateur)
+
+        Returns:
+            numéro de l'observation
+        """
+        return self.observations.publish(time=sim_time, pose=pose, scan=scan, extra=extra)
+
+    def latest_observation(self, after=0, timeout=None):
+        """Dernière observation publiée après after: (numéro, champs) ou None"""
+        return self.observations.latest(after, timeout)
+
+    def observation_time(self):
+        """Temps simulé de la dernière observation publiée (None si aucune)"""
+        seq = self.observations.head
+        if seq == 0:
+            return None
+        message = self.observations.read(seq)
+        return float(message['time']) if message is not None else None
+
+    def publish_action(self, action, observation, sim_time):
+        """Publie l'action calculée à partir de l'observation numéro observation (côté contrôleur)"""
+        return self.actions.publish(time=sim_time, observation=observation, action=action)
+
+    def latest_action(self, after=0, timeout=None):
+        """Dernière action publiée après after: (numéro, champs) ou None"""
+        return self.actions.latest(after, timeout)
+
+    def close(self):
+        """Signale la fin aux deux côtés"""
+        self.observations.close()
+        self.actions.close()
+
+    def release(self):
+        self.observations.release()
+        self.actions.release()
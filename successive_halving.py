@@ -0,0 +1,81 @@
+import math
+
+
+class SuccessiveHalving:
+    """Arrêt anticipé des mauvais jeux de paramètres par paliers de budget
+
+    Tous les candidats sont simulés avec un budget court ; seule la meilleure
+    fraction (keep_fraction) passe au palier suivant, avec un budget plus long.
+    Les candidats dont la simulation est terminée (tour complet, collision,
+    immobilité) ne sont pas relancés.
+
+    L'évaluation est confiée à une fonction qui reçoit un palier entier :
+        evaluate(jobs) -> liste de résultats
+    où jobs est une liste de (candidat, budget, résultat précédent ou None). Un
+    résultat est un dict contenant au moins :
+        'score': plus grand = meilleur (progression partielle pour un budget court)
+        'finished': True si la simulation est terminée avant la fin du budget
+        'sim_time': secondes simulées pendant cet appel
+    La fonction peut reprendre une simulation depuis l'état stocké dans le
+    résultat précédent (clé 'state') ou la relancer avec le nouveau budget. La
+    clé 'state' des candidats éliminés est supprimée pour libérer la mémoire.
+    """
+
+    def __init__(self, budgets=(10.0, 30.0, 60.0), keep_fraction=1 / 3):
+        """
+        Args:
+            budgets: budgets de temps simulé (s) croissants de chaque palier
+            keep_fraction: fraction des candidats promus au palier suivant
+        """
+        self.budgets = list(budgets)
+        self.keep_fraction = keep_fraction
+        self.rungs = []
+        self.total_sim_time = 0.0
+
+    def run(self, candidates, evaluate, on_eliminated=None):
+        """Évalue les candidats par paliers
+
+        Args:
+            candidates: liste de candidats (par exemple des dicts de paramètres)
+            evaluate: fonction d'évaluation d'un palier (voir la description de la classe)
+            on_eliminated: fonction optionnelle (candidat, résultat) appelée à l'élimination
+
+        Returns:
+            liste de (candidat, résultat) des candidats du dernier palier, du meilleur au moins bon
+        """
+        results = [None] * len(candidates)
+        survivors = list(range(len(candidates)))
+        self.rungs = []
+
+        for rung, budget in enumerate(self.budgets):
+            # Relancer uniquement les simulations encore en cours
+            running = [i for i in survivors if results[i] is None or not results[i]['finished']]
+            jobs = [(candidates[i], budget, results[i]) for i in running]
+            sim_time = 0.0
+            if jobs:
+                for i, result in zip(running, evaluate(jobs)):
+                    results[i] = result
+                    sim_time += result['sim_time']
+            self.total_sim_time += sim_time
+            self.rungs.append({'budget': budget, 'candidates': len(survivors),
+                               'evaluated': len(jobs), 'sim_time': sim_time})
+
+            survivors.sort(key=lambda i: results[i]['score'], reverse=True)
+            if rung < len(self.budgets) - 1:
+                keep = max(1, math.ceil(len(survivors) * self.keep_fraction))
+                for i in survivors[keep:]:
+                    results[i].pop('state', None)
+                    if on_eliminated is not None:
+                        on_eliminated(candidates[i], results[i])
+                survivors = survivors[:keep]
+
+        return [(candidates[i], results[i]) for i in survivors]
+
+    def report(self):
+        """Affiche le nombre de candidats et le temps simulé par palier"""
+        print("\n=== Successive halving ===")
+        for rung, stats in enumerate(self.rungs):
+            print(f"Palier {rung} ({stats['budget']:.0f}s): {stats['candidates']} candidats, "
+                  f"{stats['evaluated']} simulés, {stats['sim_time']:.0f}s simulées")
+        print(f"Total: {self.total_sim_time:.0f}s simulées")
+        print("==========================")
@@ -0,0 +1,156 @@
+import numpy as np
+
+
+class SurrogateIndex:
+    """Historique des tests sous forme de matrice normalisée avec index spatial
+
+    Chaque test est stocké comme une ligne de paramètres normalisés dans [0, 1]
+    (par la plage min/max de chaque paramètre) avec son score. Les voisins à
+    moins de `radius` sont cherchés dans un cKDTree ; les lignes ajoutées depuis
+    la dernière construction de l'arbre (la « queue ») sont parcourues de façon
+    vectorisée, et l'arbre n'est reconstruit que lorsque la queue dépasse
+    `rebuild_every` lignes.
+
+    Les paramètres de plage nulle (min == max) sont ignorés dans la distance.
+    """
+
+    def __init__(self, lower, upper, radius=0.2, rebuild_every=64):
+        """
+        Args:
+            lower: bornes minimales des paramètres
+            upper: bornes maximales des paramètres
+            radius: distance normalisée maximale d'un voisin
+            rebuild_every: taille de la queue au-delà de laquelle l'arbre est reconstruit
+        """
+        self.lower = np.asarray(lower, dtype=float)
+        span = np.asarray(upper, dtype=float) - self.lower
+        # Un paramètre fixe ne compte pas dans la distance
+        self.scale = np.divide(1.0, span, out=np.zeros_like(span), where=span > 0)
+        self.radius = radius
+        self.rebuild_every = rebuild_every
+
+        self._points = np.empty((64, len(self.lower)))
+        self._scores = np.empty(64)
+        self.size = 0
+
+        self._tree = None
+        self._tree_size = 0
+
+    @property
+    def points(self):
+        """Paramètres normalisés des tests (vue [n, d])"""
+        return self._points[:self.size]
+
+    @property
+    def scores(self):
+        """Scores des tests (vue [n])"""
+        return self._scores[:self.size]
+
+    def normalize(self, x):
+        """Normalise un ou plusieurs jeux de paramètres"""
+        return (np.asarray(x, dtype=float) - self.lower) * self.scale
+
+    def add(self, x, score):
+        """Ajoute un test à l'historique (l'arbre sera mis à jour à la prochaine requête)"""
+        if self.size == len(self._points):
+            self._points = np.concatenate((self._points, np.empty_like(self._points)))
+            self._scores = np.concatenate((self._scores, np.empty_like(self._scores)))
+        self._points[self.size] = self.normalize(x)
+        self._scores[self.size] = score
+        self.size += 1
+
+    def add_batch(self, X, scores):
+        """Ajoute plusieurs tests à la fois (rechargement d'un historique)"""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        needed = self.size + len(X)
+        if needed > len(self._points):
+            capacity = max(needed, 2 * len(self._points))
+            points = np.empty((capacity, len(self.lower)))
+            scores_buffer = np.empty(capacity)
+            points[:self.size] = self._points[:self.size]
+            scores_buffer[:self.size] = self._scores[:self.size]
+            self._points, self._scores = points, scores_buffer
+        self._points[self.size:needed] = self.normalize(X)
+        self._scores[self.size:needed] = scores
+        self.size = needed
+
+    def set_scores(self, scores):
+        """Remplace les scores de tous les tests (nouvelle fonction de score)"""
+        self._scores[:self.size] = scores
+
+    def copy(self):
+        """Copie indépendante de l'historique (pour un calcul dans un autre thread)"""
+        other = SurrogateIndex.__new__(SurrogateIndex)
+        other.__dict__.update(self.__dict__)
+        other._points = self._points.copy()
+        other._scores = self._scores.copy()
+        return other
+
+    def _update_tree(self):
+        """Reconstruit l'arbre si la queue est devenue trop longue"""
+        if self.size - self._tree_size > self.rebuild_every:
+            from scipy.spatial import cKDTree  # scipy chargé à la première reconstruction seulement
+            self._tree = cKDTree(self._points[:self.size].copy())
+            self._tree_size = self.size
+
+    def neighbours(self, X):
+        """Cherche les voisins de chaque candidat
+
+        Returns:
+            candidates, rows, distances: indices des candidats, indices des tests
+                voisins et distances normalisées, pour chaque paire à moins de radius
+        """
+        X = self.normalize(np.atleast_2d(X))
+        self._update_tree()
+        candidates, rows, distances = [], [], []
+
+        # Tests indexés par l'arbre
+        if self._tree is not None:
+            from scipy.spatial import cKDTree
+            pairs = cKDTree(X).sparse_distance_matrix(self._tree, self.radius,
+                                                      output_type='ndarray')
+            candidates.append(pairs['i'])
+            rows.append(pairs['j'])
+            distances.append(pairs['v'])
+
+        # Queue : tests ajoutés depuis la dernière construction de l'arbre
+        if self.size > self._tree_size:
+            tail = self._points[self._tree_size:self.size]
+            d = np.sqrt(((X[:, None, :] - tail[None, :, :]) ** 2).sum(axis=2))
+            i, j = np.nonzero(d <= self.radius)
+            candidates.append(i)
+            rows.append(j + self._tree_size)
+            distances.append(d[i, j])
+
+        if not candidates:
+            empty = np.array([], dtype=int)
+            return empty, empty, np.array([])
+        candidates = np.concatenate(candidates)
+        rows = np.concatenate(rows)
+        distances = np.concatenate(distances)
+        # Seulement les tests strictement plus proches que le rayon
+        keep = distances < self.radius
+        return candidates[keep], rows[keep], distances[keep]
+
+    def estimate(self, X, default):
+        """Estime le score de plusieurs candidats à la fois
+
+        Le score estimé est la moyenne des scores des tests voisins, pondérée par
+        1 / (1 + distance). Un candidat sans voisin reçoit `default`.
+
+        Args:
+            X: candidats [m, d] (paramètres non normalisés)
+            default: score retourné pour un candidat sans voisin
+
+        Returns:
+            scores estimés [m]
+        """
+        X = np.atleast_2d(X)
+        candidates, rows, distances = self.neighbours(X)
+        weights = 1.0 / (1.0 + distances)
+        total_weight = np.bincount(candidates, weights=weights, minlength=len(X))
+        total = np.bincount(candidates, weights=weights * self._scores[rows], minlength=len(X))
+        estimates = np.full(len(X), float(default))
+        found = total_weight > 0
+        estimates[found] = total[found] / total_weight[found]
+        return estimates
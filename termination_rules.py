@@ -0,0 +1,172 @@
+import math
+from collections import deque
+
+
+class TerminationRule:
+    """Règle d'arrêt anticipé d'une simulation, évaluée à chaque pas
+
+    Une règle reçoit la pose du véhicule à chaque pas (update) et retourne True
+    lorsque la simulation doit être interrompue. Le coût par pas est constant.
+    """
+
+    reason = 'abort'
+
+    def reset(self, x, y, theta):
+        """Réinitialise la règle au début d'une simulation (temps 0)"""
+
+    def update(self, t, x, y, theta, dt):
+        """Retourne True si la simulation doit être interrompue"""
+        return False
+
+
+class ImmobilityRule(TerminationRule):
+    """Véhicule immobile (déplacement < threshold) pendant `duration` secondes"""
+
+    reason = 'immobile'
+
+    def __init__(self, duration=5.0, threshold=0.01):
+        self.duration = duration
+        self.threshold = threshold
+
+    def reset(self, x, y, theta):
+        self.anchor = (x, y)
+        self.still_time = 0.0
+
+    def update(self, t, x, y, theta, dt):
+        if math.hypot(x - self.anchor[0], y - self.anchor[1]) < self.threshold:
+            self.still_time += dt
+        else:
+            self.still_time = 0.0
+            self.anchor = (x, y)
+        return self.still_time >= self.duration
+
+
+class NoProgressRule(TerminationRule):
+    """Déplacement net inférieur à min_progress sur une fenêtre de `window` secondes
+
+    Détecte un véhicule qui tourne sur place ou oscille sans avancer.
+    """
+
+    reason = 'no_progress'
+
+    def __init__(self, window=10.0, min_progress=0.5):
+        self.window = window
+        self.min_progress = min_progress
+
+    def reset(self, x, y, theta):
+        self.history = deque([(0.0, x, y)])
+
+    def update(self, t, x, y, theta, dt):
+        self.history.append((t, x, y))
+        # Garder le plus ancien point encore à au moins `window` secondes
+        while len(self.history) > 1 and t - self.history[1][0] >= self.window:
+            self.history.popleft()
+        t0, x0, y0 = self.history[0]
+        if t - t0 < self.window:
+            return False
+        return math.hypot(x - x0, y - y0) < self.min_progress
+
+
+class ReverseDrivingRule(TerminationRule):
+    """Marche arrière (vitesse le long du cap < -min_speed) pendant `duration` secondes"""
+
+    reason = 'reverse'
+
+    def __init__(self, duration=2.0, min_speed=0.05):
+        self.duration = duration
+        self.min_speed = min_speed
+
+    def reset(self, x, y, theta):
+        self.previous = (x, y)
+        self.reverse_time = 0.0
+
+    def update(self, t, x, y, theta, dt):
+        forward = (x - self.previous[0]) * math.cos(theta) + (y - self.previous[1]) * math.sin(theta)
+        self.previous = (x, y)
+        if dt > 0 and forward / dt < -self.min_speed:
+            self.reverse_time += dt
+        else:
+            self.reverse_time = 0.0
+        return self.reverse_time >= self.duration
+
+
+class LapTimeBoundRule(TerminationRule):
+    """Temps au tour projeté qui ne peut plus battre le meilleur temps
+
+    Le temps projeté est le temps écoulé multiplié par longueur du tour /
+    distance parcourue (vitesse moyenne constante). Sans longueur de tour, la
+    simulation est arrêtée dès que le meilleur temps (x margin) est dépassé.
+    """
+
+    reason = 'lap_time_bound'
+
+    def __init__(self, best_lap_time, track_length=None, margin=1.2, warmup=5.0):
+        """
+        Args:
+            best_lap_time: meilleur temps au tour connu (s)
+            track_length: longueur d'un tour (m), si connue
+            margin: tolérance multiplicative sur le meilleur temps
+            warmup: durée (s) avant d'utiliser la projection (phase d'accélération)
+        """
+        self.best_lap_time = best_lap_time
+        self.track_length = track_length
+        self.margin = margin
+        self.warmup = warmup
+
+    def reset(self, x, y, theta):
+        self.previous = (x, y)
+        self.distance = 0.0
+
+    def update(self, t, x, y, theta, dt):
+        self.distance += math.hypot(x - self.previous[0], y - self.previous[1])
+        self.previous = (x, y)
+        limit = self.best_lap_time * self.margin
+        if t > limit:
+            return True
+        if self.track_length is None or t < self.warmup or self.distance <= 0.0:
+            return False
+        return t * self.track_length / self.distance > limit
+
+
+class TerminationMonitor:
+    """Ensemble de règles d'arrêt évaluées à chaque pas d'une simulation
+
+    La première règle déclenchée donne la raison de l'arrêt (abort_reason).
+    """
+
+    def __init__(self, rules=None):
+        self.rules = list(rules) if rules is not None else [ImmobilityRule()]
+        self.abort_reason = None
+        self.abort_time = None
+        self.last_time = 0.0
+
+    def reset(self, x, y, theta):
+        """Début d'une simulation à la pose (x, y, theta), au temps 0"""
+        self.abort_reason = None
+        self.abort_time = None
+        self.last_time = 0.0
+        for rule in self.rules:
+            rule.reset(x, y, theta)
+
+    def update(self, t, x, y, theta):
+        """Met à jour les règles avec la pose au temps t
+
+        Returns:
+            raison de l'arrêt, ou None pour continuer
+        """
+        dt = t - self.last_time
+        self.last_time = t
+        for rule in self.rules:
+            if rule.update(t, x, y, theta, dt):
+                self.abort_reason = rule.reason
+                self.abort_time = t
+                return rule.reason
+        return None
+
+
+def default_rules(best_lap_time=None, track_length=None):
+    """Règles d'arrêt anticipé recommandées pour l'optimisation"""
+    rules = [ImmobilityRule(), NoProgressRule(), ReverseDrivingRule()]
+    if best_lap_time is not None:
+        rules.append(LapTimeBoundRule(best_lap_time, track_length))
+    return rules
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modules à la racine et dans custom_sim (la racine d'abord : les deux dossiers ont un main.py)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT_DIR, 'custom_sim'), ROOT_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+from distributed import (TrialQueue, Coordinator, run_worker, check_authkey, resolve_authkey,
+                         DEFAULT_AUTHKEY, AUTHKEY_ENV)
+
+
+def test_expired_lease_is_requeued():
+    queue = TrialQueue(lease_timeout=0.05)
+    worker, _ = queue.register('a')
+    for trial_id in range(3):
+        queue.put(trial_id, {'x': trial_id})
+    lease_id, trials = queue.lease(worker, 2)
+    assert [trial_id for trial_id, _ in trials] == [0, 1]
+
+    time.sleep(0.1)
+    other, _ = queue.register('b')
+    _, trials = queue.lease(other, 3)
+    # Les essais de la location expirée repassent devant les autres
+    assert [trial_id for trial_id, _ in trials] == [0, 1, 2]
+    assert queue.requeued == 2
+    assert queue.heartbeat(worker, lease_id) is False
+
+
+def test_heartbeat_extends_lease():
+    queue = TrialQueue(lease_timeout=0.1)
+    worker, _ = queue.register('a')
+    queue.put(0, {})
+    lease_id, _ = queue.lease(worker, 1)
+    for _ in range(3):
+        time.sleep(0.05)
+        assert queue.heartbeat(worker, lease_id)
+    assert queue.lease(worker, 1) == (None, [])
+    assert queue.requeued == 0
+
+
+def test_duplicate_results_are_ignored():
+    queue = TrialQueue(lease_timeout=0.05)
+    slow, _ = queue.register('lent')
+    fast, _ = queue.register('rapide')
+    queue.put(0, {})
+    slow_lease, _ = queue.lease(slow, 1)
+    time.sleep(0.1)
+    fast_lease, _ = queue.lease(fast, 1)
+
+    assert queue.complete(fast, fast_lease, [(0, 'rapide')]) == 1
+    assert queue.complete(slow, slow_lease, [(0, 'lent')]) == 0
+    assert queue.take_results(timeout=0) == [(0, 'rapide')]
+    assert queue.duplicates == 1
+
+
+def test_closed_queue_stops_workers():
+    queue = TrialQueue()
+    worker, _ = queue.register('a')
+    assert queue.lease(worker, 1) == (None, [])
+    queue.close()
+    assert queue.lease(worker, 1) is None
+
+
+def test_default_authkey_only_on_loopback(monkeypatch):
+    check_authkey(('127.0.0.1', 50000), DEFAULT_AUTHKEY)
+    check_authkey(('0.0.0.0', 50000), b'secret')
+    with pytest.raises(ValueError):
+        check_authkey(('0.0.0.0', 50000), DEFAULT_AUTHKEY)
+    with pytest.raises(ValueError):
+        Coordinator(('0.0.0.0', 0), DEFAULT_AUTHKEY)
+
+    monkeypatch.setenv(AUTHKEY_ENV, 'secret')
+    assert resolve_authkey() == b'secret'
+    assert resolve_authkey('autre') == b'autre'
+
+
+def test_coordinator_and_worker_round_trip():
+    coordinator = Coordinator(('127.0.0.1', 0), lease_timeout=5.0)
+    try:
+        for trial_id in range(5):
+            coordinator.submit(trial_id, {'x': trial_id})
+        coordinator.queue.close()
+        evaluated = []
+        worker = threading.Thread(target=lambda: evaluated.append(
+            run_worker(coordinator.address, lambda x: x * x, batch_size=2, poll_interval=0.01)))
+        worker.start()
+        worker.join(timeout=10.0)
+
+        results = []
+        while len(results) < 5:
+            results += coordinator.collect(timeout=1.0)
+        assert sorted(results) == [(i, i * i) for i in range(5)]
+        assert evaluated == [5]
+    finally:
+        coordinator.shutdown(linger=0.5)
+
+
+def test_coordinators_serve_their_own_queue():
+    first = Coordinator(('127.0.0.1', 0), lease_timeout=5.0)
+    second = Coordinator(('127.0.0.1', 0), lease_timeout=5.0)
+    try:
+        first.submit('a', {'x': 1})
+        second.submit('b', {'x': 2})
+        first.queue.close()
+        second.queue.close()
+        for coordinator in (first, second):
+            run_worker(coordinator.address, lambda x: x * 10, poll_interval=0.01)
+
+        assert first.collect(timeout=1.0) == [('a', 10)]
+        assert second.collect(timeout=1.0) == [('b', 20)]
+    finally:
+        first.shutdown(linger=0.5)
+        second.shutdown(linger=0.5)
@@ -0,0 +1,14 @@
+import numpy as np
+from evaluation_cache import EvaluationCache
+
+
+def test_numpy_scalars_keep_their_type(tmp_path):
+    cache = EvaluationCache(str(tmp_path / 'cache.db'))
+    try:
+        cache.put({'a': 0.5}, {'map': 'x'}, {'collision': np.bool_(True), 'steps': np.int64(12),
+                                             'distance': np.float32(1.5)})
+        value = cache.get({'a': 0.5}, {'map': 'x'})
+        assert value == {'collision': True, 'steps': 12, 'distance': 1.5}
+        assert type(value['collision']) is bool and type(value['steps']) is int
+    finally:
+        cache.close()
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from search_space import SearchSpace
+
+
+def test_grid_stays_within_bounds():
+    space = SearchSpace({'a': {'min': 0.0, 'max': 1.0, 'step': 0.4},
+                         'b': {'min': 1.0, 'max': 10.0, 'step': 3.0, 'log': True}})
+    grid = space.grid_values()
+    assert grid['a'] == pytest.approx([0.0, 0.4, 0.8])
+    assert grid['b'] == pytest.approx([1.0, 3.0, 9.0])
+
+
+def test_grid_includes_upper_bound_when_reachable():
+    space = SearchSpace.from_ranges({'stop_distance': (0.2, 0.8, 0.2), 'angle': (300, 330, 15),
+                                     'scale': (0.05, 0.2, 0.05)})
+    grid = space.grid_values()
+    for name, (low, high, step) in {'stop_distance': (0.2, 0.8, 0.2), 'angle': (300, 330, 15),
+                                    'scale': (0.05, 0.2, 0.05)}.items():
+        assert grid[name] == pytest.approx(np.arange(low, high + step / 2, step).tolist())
+        assert max(grid[name]) <= high
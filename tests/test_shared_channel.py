@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import numpy as np
+import pytest
+from shared_channel import SharedRing, SimulationChannel
+from async_controller import AsyncController
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing({'value': (3,), 'time': ()}, slots=4)
+    yield ring
+    ring.release()
+
+
+def test_publish_read_round_trip(ring):
+    seq = ring.publish(value=[1.0, 2.0, 3.0], time=0.5)
+    assert seq == 1 and ring.head == 1
+    message = ring.read(seq)
+    np.testing.assert_array_equal(message['value'], [1.0, 2.0, 3.0])
+    assert float(message['time']) == 0.5
+    # La lecture est une copie, indépendante des écritures suivantes
+    ring.publish(value=[4.0, 5.0, 6.0], time=1.0)
+    np.testing.assert_array_equal(message['value'], [1.0, 2.0, 3.0])
+
+
+def test_overwritten_slot_is_not_returned(ring):
+    for i in range(1, 7):
+        ring.publish(value=[i, i, i], time=i)
+    # 4 slots : les messages 1 et 2 ont été écrasés par 5 et 6
+    assert ring.read(1) is None
+    assert ring.read(2) is None
+    assert ring.read(7) is None  # pas encore publié
+    assert float(ring.read(3)['time']) == 3.0
+    seq, message = ring.latest()
+    assert seq == 6 and float(message['time']) == 6.0
+
+
+def test_latest_waits_and_stops_on_close(ring):
+    assert ring.latest(after=0, timeout=0.01) is None
+    ring.publish(value=[0, 0, 0], time=0.0)
+    assert ring.latest(after=1, timeout=0.01) is None
+    ring.close()
+    assert ring.latest(after=1) is None
+
+
+def _write_then_read(spec, done):
+    channel = SimulationChannel.attach(spec)
+    try:
+        seq, observation = channel.latest_observation(timeout=5.0)
+        channel.publish_action(observation['scan'][:2] * 2, seq, float(observation['time']))
+        done.wait(5.0)
+    finally:
+        channel.release()
+
+
+def test_cross_process_attach_and_release():
+    channel = SimulationChannel(scan_shape=(5,), extra_size=2)
+    names = [channel.observations.shm.name, channel.actions.shm.name]
+    done = multiprocessing.Event()
+    process = multiprocessing.Process(target=_write_then_read, args=(channel.spec, done))
+    process.start()
+    try:
+        channel.publish_observation(np.arange(5.0), (1.0, 2.0, 0.0), 0.25, extra=(3.0, 4.0))
+        latest = channel.latest_action(timeout=5.0)
+        assert latest is not None
+        _, action = latest
+        np.testing.assert_array_equal(action['action'], [0.0, 2.0])
+        assert int(action['observation']) == 1 and float(action['time']) == 0.25
+        assert channel.observation_time() == 0.25
+    finally:
+        done.set()
+        process.join(timeout=5.0)
+        channel.release()
+    assert process.exitcode == 0
+    # Le segment est supprimé par le processus qui l'a créé
+    for name in names:
+        assert not os.path.exists(os.path.join('/dev/shm', name))
+
+
+class DoublingController:
+    def plan(self, scan):
+        return np.array([scan[0], 2 * scan[0]])
+
+
+def test_async_controller_shared_mode():
+    channel = SimulationChannel(scan_shape=(3,))
+    controller = AsyncController(DoublingController, mode='shared', channel=channel)
+    try:
+        channel.publish_observation(np.full(3, 1.5), (0.0, 0.0, 0.0), 0.0)
+        controller.submit(None, 0.0)
+        command = None
+        for _ in range(500):
+            command = controller.get_command(0.0)
+            if command is not None:
+                break
+            multiprocessing.Event().wait(0.01)
+        # Commande calculée dans l'autre processus à partir de l'observation publiée
+        np.testing.assert_array_equal(command, [1.5, 3.0])
+        assert controller.stats()['computed'] == 1
+    finally:
+        controller.close()
+        channel.release()
+
+
+def test_async_controller_close_leaves_channel_open():
+    channel = SimulationChannel(scan_shape=(3,))
+    controller = AsyncController(DoublingController, mode='shared', channel=channel)
+    try:
+        controller.close()
+        # Le processus contrôleur s'arrête de lui-même, le canal reste à son propriétaire
+        assert controller._process.exitcode == 0
+        assert not channel.observations.closed and not channel.actions.closed
+    finally:
+        channel.release()
+
+
+def _publish_constant_messages(spec, count):
+    ring = SharedRing.attach(spec)
+    try:
+        for i in range(1, count + 1):
+            ring.publish(value=np.full(ring.fields['value'], float(i)), time=float(i))
+        ring.close()
+    finally:
+        ring.release()
+
+
+def test_reader_never_sees_torn_messages():
+    ring = SharedRing({'value': (65536,), 'time': ()}, slots=2)
+    process = multiprocessing.Process(target=_publish_constant_messages, args=(ring.spec, 2000))
+    process.start()
+    try:
+        reads = 0
+        while not ring.closed:
+            # Avec deux slots, le message précédent est celui que le producteur va écraser
+            seq = ring.head - 1
+            message = ring.read(seq) if seq >= 1 else None
+            if message is None:
+                continue
+            # Chaque message est écrit d'une seule valeur : un mélange trahirait une lecture déchirée
+            assert np.all(message['value'] == message['time'])
+            reads += 1
+        assert reads > 0
+    finally:
+        process.join(timeout=5.0)
+        ring.release()
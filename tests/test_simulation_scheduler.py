@@ -0,0 +1,33 @@
+import pytest
+from simulation_scheduler import MultiRateScheduler
+
+
+class CountingSimulator:
+    headless = True
+
+    def sense(self):
+        return [], False
+
+    def advance(self, linear, angular, dt):
+        pass
+
+    def render(self, scan):
+        pass
+
+
+@pytest.mark.parametrize('physics_rate, rate', [(100.0, 40.0), (100.0, 30.0), (100.0, 50.0), (200.0, 40.0)])
+def test_stage_rates_are_respected(physics_rate, rate):
+    scheduler = MultiRateScheduler(CountingSimulator(), physics_rate=physics_rate,
+                                   sensor_rate=rate, control_rate=rate)
+    scheduler.run(lambda scan: (0.0, 0.0), duration=10.0)
+    assert scheduler.stage_calls['dynamics'] == int(physics_rate * 10)
+    assert scheduler.stage_calls['sensing'] == pytest.approx(rate * 10, abs=1)
+    assert scheduler.stage_calls['control'] == pytest.approx(rate * 10, abs=1)
+    assert scheduler.effective_rates['sensing'] == pytest.approx(rate)
+
+
+def test_rate_above_physics_rate_is_capped():
+    scheduler = MultiRateScheduler(CountingSimulator(), physics_rate=100.0, sensor_rate=250.0)
+    scheduler.run(duration=1.0)
+    assert scheduler.stage_calls['sensing'] == 100
+    assert scheduler.effective_rates['sensing'] == pytest.approx(100.0)
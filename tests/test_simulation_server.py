@@ -0,0 +1,103 @@
+import asyncio
+import os
+import socket
+import threading
+import numpy as np
+import pytest
+from simulation_server import SimulationServer, SimulationClient, validate_step, remove_stale_socket
+
+
+class StraightLineSimulator:
+    """Simulateur minimal : avance en ligne droite, scan vide, pas de collision"""
+
+    start_x, start_y, start_theta = 0.0, 0.0, 0.0
+
+    def __init__(self):
+        self.fail = False
+
+    def step_batch(self, x, y, theta, linear, angular, dt, substeps):
+        if self.fail:
+            raise RuntimeError("panne du simulateur")
+        x = np.asarray(x) + np.asarray(linear, dtype=float) * np.asarray(dt, dtype=float)
+        n = len(x)
+        return x, np.asarray(y), np.asarray(theta), np.zeros((n, 4, 2)), np.zeros(n, dtype=bool)
+
+
+@pytest.fixture
+def server(tmp_path):
+    simulator = StraightLineSimulator()
+    server = SimulationServer(simulator, str(tmp_path / 'sim.sock'), batch_window=0.01)
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(server.serve())
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if (tmp_path / 'sim.sock').exists():
+            break
+        threading.Event().wait(0.01)
+    yield server
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(timeout=2.0)
+    loop.close()
+
+
+def test_validate_step():
+    assert validate_step({'linear': 1.0, 'angular': 0.0, 'dt': 0.1}) is None
+    assert validate_step({'linear': 'abc', 'angular': 0.0, 'dt': 0.1}) is not None
+    assert validate_step({'linear': 1.0, 'angular': float('nan'), 'dt': 0.1}) is not None
+    assert validate_step({'linear': 1.0, 'angular': 0.0, 'dt': 0.0}) is not None
+    assert validate_step({'linear': 1.0, 'angular': 0.0, 'dt': 0.1, 'substeps': -1}) is not None
+
+
+def test_bad_request_does_not_block_other_clients(server):
+    with SimulationClient(server.socket_path) as good, SimulationClient(server.socket_path) as bad:
+        reply = bad._request({'op': 'step', 'linear': 'abc', 'angular': 0.0, 'dt': 0.1})
+        assert 'error' in reply
+        with pytest.raises(ValueError):
+            bad.step('abc', 0.0, 0.1)
+
+        scan, collision = good.step(1.0, 0.0, 0.5)
+        assert good.car.x == pytest.approx(0.5)
+        assert not collision
+        # Le client fautif reste utilisable
+        bad.step(2.0, 0.0, 0.5)
+        assert bad.car.x == pytest.approx(1.0)
+
+
+def test_failed_batch_replies_with_error(server):
+    with SimulationClient(server.socket_path) as client:
+        server.simulator.fail = True
+        with pytest.raises(ValueError, match="panne"):
+            client.step(1.0, 0.0, 0.1)
+        server.simulator.fail = False
+        client.step(1.0, 0.0, 0.1)
+        assert client.car.x == pytest.approx(0.1)
+
+
+def test_only_stale_sockets_are_removed(server, tmp_path):
+    # Un serveur en écoute n'est pas remplacé
+    with pytest.raises(FileExistsError, match="écoute"):
+        remove_stale_socket(server.socket_path)
+    assert os.path.exists(server.socket_path)
+
+    # Un fichier ordinaire n'est pas supprimé
+    path = tmp_path / 'fichier'
+    path.write_text('données')
+    with pytest.raises(FileExistsError):
+        remove_stale_socket(str(path))
+    assert path.exists()
+
+    # Socket laissé par un serveur arrêté
+    stale = str(tmp_path / 'stale.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(stale)
+    listener.close()
+    remove_stale_socket(stale)
+    assert not os.path.exists(stale)
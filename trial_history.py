@@ -0,0 +1,188 @@
+import time
+import numpy as np
+
+# Types de colonnes : réel (None <-> nan), booléen, catégorie (texte ou None, stocké en code)
+FIELD_DTYPES = {'f': np.float64, 'b': np.bool_, 'c': np.uint8}
+
+
+class HistoryView:
+    """Séquence en lecture seule de dicts construits à la demande depuis une TrialHistory"""
+
+    def __init__(self, history, row):
+        self.history = history
+        self.row = row
+
+    def __len__(self):
+        return len(self.history)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self.history)))]
+        if index < 0:
+            index += len(self.history)
+        if not 0 <= index < len(self.history):
+            raise IndexError(index)
+        return self.row(index)
+
+    def __iter__(self):
+        for i in range(len(self.history)):
+            yield self.row(i)
+
+    def __bool__(self):
+        return len(self.history) > 0
+
+
+class TrialHistory:
+    """Historique des essais en colonnes, dans un tableau structuré NumPy
+
+    Chaque essai occupe une ligne de taille fixe (paramètres, métriques, score,
+    indicateurs et date) d'un tableau préalloué dont la capacité double quand il
+    est plein : l'ajout est en O(1) amorti et un million d'essais à 6
+    paramètres tient en une centaine de Mo. Les colonnes sont exposées sous
+    forme de vues (sans copie) pour les calculs vectorisés.
+    """
+
+    def __init__(self, param_names=None, fields=(), capacity=1024):
+        """
+        Args:
+            param_names: noms des paramètres (déduits du premier essai si None)
+            fields: liste de (nom, type) des métriques, type 'f' (réel, None
+                stocké en nan), 'b' (booléen) ou 'c' (catégorie : texte ou None)
+            capacity: capacité initiale (nombre d'essais)
+        """
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.size = 0
+        # Libellés des colonnes catégorielles (code 0 = None)
+        self.labels = {name: [None] for name, kind in self.fields if kind == 'c'}
+        self._codes = {name: {None: 0} for name in self.labels}
+        self.param_names = None
+        self._data = None
+        if param_names is not None:
+            self._allocate(param_names)
+
+        # Vues dict pour le code qui parcourt l'historique essai par essai
+        self.param_dicts = HistoryView(self, self.param_dict)
+        self.rows = HistoryView(self, self.row)
+
+    def _allocate(self, param_names):
+        self.param_names = list(param_names)
+        self.dtype = np.dtype(
+            [('params', np.float64, (len(self.param_names),))] +
+            [(name, FIELD_DTYPES[kind]) for name, kind in self.fields] +
+            [('timestamp', np.float64)])
+        self._data = np.zeros(self.capacity, dtype=self.dtype)
+
+    def _reserve(self, count):
+        """Agrandit le tableau pour contenir count essais de plus"""
+        needed = self.size + count
+        if needed <= len(self._data):
+            return
+        capacity = max(needed, 2 * len(self._data))
+        data = np.zeros(capacity, dtype=self.dtype)
+        data[:self.size] = self._data[:self.size]
+        self._data = data
+
+    def _encode(self, name, kind, value):
+        if kind == 'f':
+            return np.nan if value is None else value
+        if kind == 'c':
+            code = self._codes[name].get(value)
+            if code is None:
+                code = len(self.labels[name])
+                self.labels[name].append(value)
+                self._codes[name][value] = code
+            return code
+        return bool(value)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par le tableau (capacité comprise)"""
+        return self._data.nbytes if self._data is not None else 0
+
+    def append(self, params, values, timestamp=None):
+        """Ajoute un essai
+
+        Args:
+            params: dict nom -> valeur des paramètres
+            values: dict contenant (au moins) les métriques déclarées dans fields
+
+        Returns:
+            indice de l'essai
+        """
+        if self._data is None:
+            self._allocate(params.keys())
+        self._reserve(1)
+        row = self._data[self.size]
+        row['params'] = [params[name] for name in self.param_names]
+        for name, kind in self.fields:
+            row[name] = self._encode(name, kind, values.get(name))
+        row['timestamp'] = time.time() if timestamp is None else timestamp
+        self.size += 1
+        return self.size - 1
+
+    def extend(self, params, columns, timestamps=None):
+        """Ajoute un bloc d'essais à partir de colonnes
+
+        Args:
+            params: tableau [n, nb_paramètres]
+            columns: dict nom -> tableau [n] (catégories : séquence de textes ou None)
+            timestamps: tableau [n] de dates, ou None pour maintenant
+        """
+        params = np.atleast_2d(np.asarray(params, dtype=float))
+        count = len(params)
+        if count == 0:
+            return
+        self._reserve(count)
+        block = self._data[self.size:self.size + count]
+        block['params'] = params
+        for name, kind in self.fields:
+            values = columns[name]
+            if kind == 'c':
+                values = [self._encode(name, kind, value) for value in values]
+            elif kind == 'f':
+                values = np.array([np.nan if value is None else value for value in values], dtype=float) \
+                    if isinstance(values, (list, tuple)) else values
+            block[name] = values
+        block['timestamp'] = time.time() if timestamps is None else timestamps
+        self.size += count
+
+    @property
+    def params(self):
+        """Paramètres des essais (vue [n, nb_paramètres], sans copie)"""
+        if self._data is None:
+            return np.empty((0, 0))
+        return self._data['params'][:self.size]
+
+    def column(self, name):
+        """Colonne d'une métrique (vue [n], sans copie ; codes pour une catégorie)"""
+        if self._data is None:
+            return np.empty(0)
+        return self._data[name][:self.size]
+
+    def columns(self):
+        """Toutes les colonnes de métriques (dict nom -> vue [n])"""
+        return {name: self.column(name) for name, _ in self.fields}
+
+    def param_dict(self, index):
+        """Paramètres d'un essai (dict)"""
+        return dict(zip(self.param_names, map(float, self._data['params'][index])))
+
+    def row(self, index):
+        """Essai complet (dict des métriques, avec 'params' et 'timestamp')"""
+        record = self._data[index]
+        row = {}
+        for name, kind in self.fields:
+            value = record[name]
+            if kind == 'f':
+                row[name] = None if np.isnan(value) else float(value)
+            elif kind == 'c':
+                row[name] = self.labels[name][value]
+            else:
+                row[name] = bool(value)
+        row['params'] = self.param_dict(index)
+        row['timestamp'] = float(record['timestamp'])
+        return row
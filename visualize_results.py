@@ -5,22 +5,31 @@ import numpy as np
 from datetime import datetime
 import os
 import glob
+from results_store import ResultsStore, EXPORT_FILE
+from parameter_tester import RESULTS_DB, PARAMETER_NAMES, DEFAULT_CONFIG
 
 # Configuration du style
 plt.style.use('seaborn')
 sns.set_palette("husl")
 
 def load_results():
-    """Charge les résultats depuis le fichier CSV"""
+    """Charge les résultats depuis la base (exportée en CSV) ou le fichier CSV le plus récent"""
     try:
-        # Chercher le fichier CSV le plus récent
-        csv_files = glob.glob('parameter_test_results_*.csv')
-        if not csv_files:
-            print("Erreur: Aucun fichier de résultats trouvé.")
-            return None
-        
-        # Prendre le fichier le plus récent
-        latest_file = max(csv_files, key=os.path.getctime)
+        if os.path.exists(RESULTS_DB):
+            # Historique complet de la base, tous jours confondus
+            store = ResultsStore(RESULTS_DB, PARAMETER_NAMES, DEFAULT_CONFIG)
+            store.export_csv(EXPORT_FILE)
+            store.close()
+            latest_file = EXPORT_FILE
+        else:
+            # Chercher le fichier CSV le plus récent
+            csv_files = glob.glob('parameter_test_results_*.csv')
+            if not csv_files:
+                print("Erreur: Aucun fichier de résultats trouvé.")
+                return None
+            
+            # Prendre le fichier le plus récent
+            latest_file = max(csv_files, key=os.path.getctime)
         print(f"Chargement du fichier : {latest_file}")
         
         # Lire le fichier pour trouver où commencent les données